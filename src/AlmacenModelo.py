@@ -0,0 +1,753 @@
+# AlmacenModelo.py
+from collections.abc import Mapping
+
+import numpy as np
+
+from Nodo import Nodo
+from Barra import Barra
+
+
+def _ampliar(array, capacidad, relleno=0):
+    """Devuelve una copia de 'array' con 'capacidad' filas, rellenando las nuevas con 'relleno'."""
+    nuevo = np.full((capacidad,) + array.shape[1:], relleno, dtype=array.dtype)
+    nuevo[:len(array)] = array
+    return nuevo
+
+
+class AlmacenModelo:
+    # Tipos de cambio del modelo cuya última revisión se registra
+    TIPOS_CAMBIO = ('topologia', 'propiedades', 'restricciones', 'cargas', 'masas')
+
+    def __init__(self, capacidad=16):
+        """
+        Almacén compacto del modelo en arrays contiguos de NumPy (estructura de arrays).
+        Cada nodo y cada barra ocupa una fila; las filas crecen por duplicación de capacidad
+        (añadidos en O(1) amortizado) y los borrados solo desactivan la fila hasta la
+        siguiente compactación, por lo que el orden de las filas es siempre el de los IDs.
+        Nodos: coords (n, 3) y reacciones (n, 6) [rx, ry, rz, mx, my, mz]; este último solo
+        se reserva cuando se escribe alguna reacción.
+        Restricciones por nodo: restringido (n, 3) y desplazamiento prescrito (n, 3).
+        Barras: conectividad (m, 2) como filas de nodo, y E, A, I, q, rho (m,).
+        Los mapas ID → fila son arrays indexados por ID (-1 si el ID no existe). Se mantienen
+        además, actualizados en cada alta y baja, el índice de DOF de cada nodo y la
+        adyacencia nodo → barras (listas enlazadas de extremos de barra en arrays).
+        Args:
+            capacidad (int): Número inicial de filas reservadas para nodos y barras.
+        """
+        # --- Nodos ---
+        self.n_filas_nodos = 0
+        self.coords = np.zeros((capacidad, 3))
+        self.reacciones = None
+        self.id_nodo = np.zeros(capacidad, dtype=np.int64)
+        self.nodo_activo = np.zeros(capacidad, dtype=bool)
+        self.rev_nodo = np.zeros(capacidad, dtype=np.int64)
+        self.restringido = np.zeros((capacidad, 3), dtype=bool)
+        self.prescrito = np.zeros((capacidad, 3))
+        self._indice_dof = np.full(capacidad, -1, dtype=np.intp)
+        self._primer_extremo = np.full(capacidad, -1, dtype=np.intp)
+        self._fila_de_nodo = np.full(capacidad, -1, dtype=np.intp)
+        self._next_node_id = 0
+        self._n_nodos = 0
+
+        # --- Barras ---
+        self.n_filas_barras = 0
+        self.conectividad = np.zeros((capacidad, 2), dtype=np.intp)
+        self.E = np.zeros(capacidad)
+        self.A = np.zeros(capacidad)
+        self.I = np.zeros(capacidad)
+        self.q = np.zeros(capacidad)
+        self.rho = np.zeros(capacidad)
+        self.id_barra = np.zeros(capacidad, dtype=np.int64)
+        self.barra_activa = np.zeros(capacidad, dtype=bool)
+        self.rev_barra = np.zeros(capacidad, dtype=np.int64)
+        # Adyacencia: el extremo 'e' de la barra de fila 'b' se codifica como 2*b + e;
+        # _primer_extremo[fila_nodo] y _siguiente_extremo[b, e] forman la lista de cada nodo.
+        self._siguiente_extremo = np.full((capacidad, 2), -1, dtype=np.intp)
+        self._fila_de_barra = np.full(capacidad, -1, dtype=np.intp)
+        self._next_barra_id = 0
+        self._n_barras = 0
+
+        # --- Revisiones ---
+        self.revision = 0
+        self.rev_tipos = dict.fromkeys(self.TIPOS_CAMBIO, 0)
+
+        # --- Transacciones ---
+        # Dentro de una transacción, la adyacencia y los índices de DOF no se mantienen en
+        # cada alta o baja: se marcan como pendientes y se reconstruyen una sola vez al
+        # confirmar (o antes, si alguna consulta los necesita).
+        self._nivel_transaccion = 0
+        self._adyacencia_pendiente = False
+        self._indice_dof_pendiente = False
+        # Copias del estado al empezar cada transacción abierta (para deshacerla)
+        self._copias_transaccion = []
+
+    # ------------------------------------------------------------------
+    # Capacidad
+    # ------------------------------------------------------------------
+
+    def _reservar_nodos(self, n_nuevos):
+        necesaria = self.n_filas_nodos + n_nuevos
+        capacidad = len(self.id_nodo)
+        if necesaria > capacidad:
+            capacidad = max(2 * capacidad, necesaria)
+            self.coords = _ampliar(self.coords, capacidad)
+            if self.reacciones is not None:
+                self.reacciones = _ampliar(self.reacciones, capacidad)
+            self.id_nodo = _ampliar(self.id_nodo, capacidad)
+            self.nodo_activo = _ampliar(self.nodo_activo, capacidad, False)
+            self.rev_nodo = _ampliar(self.rev_nodo, capacidad)
+            self.restringido = _ampliar(self.restringido, capacidad, False)
+            self.prescrito = _ampliar(self.prescrito, capacidad)
+            self._indice_dof = _ampliar(self._indice_dof, capacidad, -1)
+            self._primer_extremo = _ampliar(self._primer_extremo, capacidad, -1)
+        if self._next_node_id + n_nuevos > len(self._fila_de_nodo):
+            capacidad_ids = max(2 * len(self._fila_de_nodo), self._next_node_id + n_nuevos)
+            self._fila_de_nodo = _ampliar(self._fila_de_nodo, capacidad_ids, -1)
+
+    def _reservar_barras(self, n_nuevas):
+        necesaria = self.n_filas_barras + n_nuevas
+        capacidad = len(self.id_barra)
+        if necesaria > capacidad:
+            capacidad = max(2 * capacidad, necesaria)
+            self.conectividad = _ampliar(self.conectividad, capacidad)
+            self.E = _ampliar(self.E, capacidad)
+            self.A = _ampliar(self.A, capacidad)
+            self.I = _ampliar(self.I, capacidad)
+            self.q = _ampliar(self.q, capacidad)
+            self.rho = _ampliar(self.rho, capacidad)
+            self.id_barra = _ampliar(self.id_barra, capacidad)
+            self.barra_activa = _ampliar(self.barra_activa, capacidad, False)
+            self.rev_barra = _ampliar(self.rev_barra, capacidad)
+            self._siguiente_extremo = _ampliar(self._siguiente_extremo, capacidad, -1)
+        if self._next_barra_id + n_nuevas > len(self._fila_de_barra):
+            capacidad_ids = max(2 * len(self._fila_de_barra), self._next_barra_id + n_nuevas)
+            self._fila_de_barra = _ampliar(self._fila_de_barra, capacidad_ids, -1)
+
+    # ------------------------------------------------------------------
+    # Transacciones
+    # ------------------------------------------------------------------
+
+    def iniciar_transaccion(self, deshacer=True):
+        """
+        Empieza (o anida) una transacción: se difiere el mantenimiento de los índices. Con
+        deshacer=True se copia el estado actual (una copia de cada array), que
+        deshacer_transaccion puede restaurar.
+        """
+        copia = None
+        if deshacer:
+            copia = {clave: valor.copy() if isinstance(valor, (np.ndarray, dict)) else valor
+                     for clave, valor in vars(self).items()
+                     if clave not in ('_nivel_transaccion', '_copias_transaccion')}
+        self._copias_transaccion.append(copia)
+        self._nivel_transaccion += 1
+
+    def deshacer_transaccion(self):
+        """
+        Restaura el estado del comienzo de la transacción más interna. La revisión no
+        retrocede: avanza y se marca como cambio de todos los tipos, para que ningún
+        resultado cacheado durante la transacción se tome por vigente.
+        Raises:
+            RuntimeError: Si la transacción se inició sin copia (deshacer=False).
+        """
+        copia = self._copias_transaccion[-1]
+        if copia is None:
+            raise RuntimeError("Error: La transacción se inició sin copia y no se puede deshacer.")
+        revision = self.revision
+        vars(self).update({clave: valor.copy() if isinstance(valor, (np.ndarray, dict)) else valor
+                           for clave, valor in copia.items()})
+        self.revision = revision + 1
+        self.rev_tipos = dict.fromkeys(self.TIPOS_CAMBIO, self.revision)
+
+    def confirmar_transaccion(self):
+        """Cierra la transacción; al cerrar la más externa se reconstruyen los índices."""
+        self._copias_transaccion.pop()
+        self._nivel_transaccion -= 1
+        if self._nivel_transaccion == 0:
+            self._asegurar_indice_dof()
+            self._asegurar_adyacencia()
+            self._compactar_si_conviene()
+
+    def _asegurar_adyacencia(self):
+        if self._adyacencia_pendiente:
+            self._adyacencia_pendiente = False
+            self.reconstruir_adyacencia()
+
+    def _asegurar_indice_dof(self):
+        if self._indice_dof_pendiente:
+            self._indice_dof_pendiente = False
+            activos = self.nodo_activo[:self.n_filas_nodos]
+            self._indice_dof[:self.n_filas_nodos] = np.where(activos, np.cumsum(activos) - 1, -1)
+
+    # ------------------------------------------------------------------
+    # Revisiones
+    # ------------------------------------------------------------------
+
+    def registrar_cambio(self, tipo, filas_nodos=None, filas_barras=None):
+        """Avanza la revisión y la anota en el tipo de cambio y en las filas indicadas."""
+        self.revision += 1
+        self.rev_tipos[tipo] = self.revision
+        if filas_nodos is not None:
+            self.rev_nodo[filas_nodos] = self.revision
+        if filas_barras is not None:
+            self.rev_barra[filas_barras] = self.revision
+
+    def filas_barras_modificadas(self, desde_revision):
+        """Filas de barras activas modificadas después de 'desde_revision'."""
+        n = self.n_filas_barras
+        return np.flatnonzero(self.barra_activa[:n] & (self.rev_barra[:n] > desde_revision))
+
+    def filas_nodos_modificados(self, desde_revision):
+        """Filas de nodos activos modificados después de 'desde_revision'."""
+        n = self.n_filas_nodos
+        return np.flatnonzero(self.nodo_activo[:n] & (self.rev_nodo[:n] > desde_revision))
+
+    # ------------------------------------------------------------------
+    # Nodos
+    # ------------------------------------------------------------------
+
+    def añadir_nodos(self, coords):
+        """
+        Añade nodos al final del almacén.
+        Args:
+            coords (np.ndarray): Coordenadas (k, 3).
+        Returns:
+            np.ndarray: IDs asignados (k,).
+        """
+        coords = np.asarray(coords, dtype=float).reshape(-1, 3)
+        k = len(coords)
+        self._reservar_nodos(k)
+        filas = np.arange(self.n_filas_nodos, self.n_filas_nodos + k)
+        ids = np.arange(self._next_node_id, self._next_node_id + k)
+
+        self.coords[filas] = coords
+        if self.reacciones is not None:
+            self.reacciones[filas] = 0.0
+        self.id_nodo[filas] = ids
+        self.nodo_activo[filas] = True
+        self.restringido[filas] = False
+        self.prescrito[filas] = 0.0
+        self._primer_extremo[filas] = -1
+        self._indice_dof[filas] = self._n_nodos + np.arange(k)
+        self._fila_de_nodo[ids] = filas
+        self.n_filas_nodos += k
+        self._next_node_id += k
+        self._n_nodos += k
+        self.registrar_cambio('topologia', filas_nodos=filas)
+        return ids
+
+    def añadir_nodo(self, x, y, z=0.0):
+        """Añade un nodo y devuelve su ID."""
+        return int(self.añadir_nodos([[x, y, z]])[0])
+
+    def existe_nodo(self, id_nodo):
+        return 0 <= id_nodo < self._next_node_id and self._fila_de_nodo[id_nodo] >= 0
+
+    def fila_nodo(self, id_nodo):
+        """
+        Devuelve la fila del nodo.
+        Raises:
+            KeyError: Si el ID del nodo no existe.
+        """
+        if not self.existe_nodo(id_nodo):
+            raise KeyError(id_nodo)
+        return int(self._fila_de_nodo[id_nodo])
+
+    def filas_de_nodos(self, ids):
+        """Versión vectorizada de fila_nodo, sin excepción: -1 para IDs que no existen."""
+        return self._filas_de_ids(self._fila_de_nodo, self._next_node_id, ids)
+
+    @staticmethod
+    def _filas_de_ids(fila_de_id, siguiente_id, ids):
+        ids = np.asarray(ids, dtype=np.intp)
+        filas = np.full(ids.shape, -1, dtype=np.intp)
+        en_rango = (ids >= 0) & (ids < siguiente_id)
+        filas[en_rango] = fila_de_id[ids[en_rango]]
+        return filas
+
+    def filas_nodos_activos(self):
+        return np.flatnonzero(self.nodo_activo[:self.n_filas_nodos])
+
+    def ids_nodos(self):
+        """IDs de los nodos existentes, en orden creciente."""
+        return self.id_nodo[self.filas_nodos_activos()]
+
+    def n_nodos(self):
+        return self._n_nodos
+
+    def indice_dof_de_fila(self):
+        """
+        Índice de cada fila de nodo en el vector de DOFs (posición entre los nodos activos,
+        en orden de ID); -1 para filas inactivas. Se mantiene al añadir y borrar nodos.
+        """
+        self._asegurar_indice_dof()
+        return self._indice_dof[:self.n_filas_nodos]
+
+    def indice_dof(self, id_nodo):
+        """Índice del nodo en el vector de DOFs (sus DOFs son 3*i, 3*i+1, 3*i+2), en O(1)."""
+        self._asegurar_indice_dof()
+        return int(self._indice_dof[self.fila_nodo(id_nodo)])
+
+    def restringir(self, id_nodo, dofs, valores=None, restringir=True):
+        """
+        Restringe (o libera) DOFs de un nodo.
+        Args:
+            id_nodo (int): ID del nodo.
+            dofs (list): DOFs locales del nodo (0: x, 1: y, 2: giro).
+            valores (list, optional): Desplazamientos prescritos de esos DOFs.
+            restringir (bool): False para liberar los DOFs (y anular su valor prescrito).
+        """
+        fila = self.fila_nodo(id_nodo)
+        self.restringido[fila, dofs] = restringir
+        self.prescrito[fila, dofs] = 0.0 if valores is None or not restringir else valores
+        self.registrar_cambio('restricciones', filas_nodos=[fila])
+
+    def restringir_filas(self, filas, mascara, valores=None):
+        """
+        Restringe a la vez DOFs de varios nodos (versión vectorizada de restringir).
+        Args:
+            filas (np.ndarray): Filas de los nodos (k,).
+            mascara (np.ndarray): DOFs a restringir de cada nodo (k, 3).
+            valores (np.ndarray, optional): Desplazamientos prescritos (k, 3) de los DOFs
+                de la máscara; el resto de valores no cambia.
+        """
+        self.restringido[filas] |= mascara
+        if valores is not None:
+            self.prescrito[filas] = np.where(mascara, valores, self.prescrito[filas])
+        self.registrar_cambio('restricciones', filas_nodos=filas)
+
+    def dofs_restringidos(self):
+        """Máscara (n_dof,) de DOFs restringidos en el orden global de DOFs."""
+        return self.restringido[self.filas_nodos_activos()].ravel()
+
+    def desplazamientos_prescritos(self):
+        """Vector (n_dof,) de desplazamientos prescritos (cero en los DOFs sin valor impuesto)."""
+        return self.prescrito[self.filas_nodos_activos()].ravel()
+
+    def reservar_reacciones(self):
+        """Devuelve el array de reacciones (n, 6), reservándolo (a cero) si aún no existe."""
+        if self.reacciones is None:
+            self.reacciones = np.zeros((len(self.id_nodo), 6))
+        return self.reacciones
+
+    def mover_nodo(self, id_nodo, eje, valor):
+        """Cambia una coordenada de un nodo; la rigidez de sus barras queda modificada."""
+        fila = self.fila_nodo(id_nodo)
+        self.coords[fila, eje] = valor
+        self.registrar_cambio('propiedades', filas_nodos=[fila], filas_barras=self.filas_barras_de_nodo(fila))
+
+    def borrar_nodo(self, id_nodo):
+        """Desactiva la fila del nodo (sus barras deben haberse borrado antes)."""
+        fila = self.fila_nodo(id_nodo)
+        self.nodo_activo[fila] = False
+        self._fila_de_nodo[id_nodo] = -1
+        # Los nodos posteriores bajan una posición en el vector de DOFs
+        self._indice_dof[fila] = -1
+        if self._nivel_transaccion:
+            self._indice_dof_pendiente = True
+        else:
+            posteriores = self._indice_dof[fila + 1:self.n_filas_nodos]
+            posteriores[posteriores >= 0] -= 1
+        self._n_nodos -= 1
+        self.registrar_cambio('topologia')
+        self._compactar_si_conviene()
+
+    # ------------------------------------------------------------------
+    # Barras
+    # ------------------------------------------------------------------
+
+    def añadir_barras(self, filas_nodos, E, A, I, q=0.0, rho=0.0):
+        """
+        Añade barras al final del almacén.
+        Args:
+            filas_nodos (np.ndarray): Filas de nodo inicial y final (k, 2).
+            E, A, I, q, rho (float | np.ndarray): Propiedades, escalares o arrays (k,).
+        Returns:
+            np.ndarray: IDs asignados (k,).
+        """
+        filas_nodos = np.asarray(filas_nodos, dtype=np.intp).reshape(-1, 2)
+        k = len(filas_nodos)
+        self._reservar_barras(k)
+        filas = np.arange(self.n_filas_barras, self.n_filas_barras + k)
+        ids = np.arange(self._next_barra_id, self._next_barra_id + k)
+
+        self.conectividad[filas] = filas_nodos
+        self.E[filas] = E
+        self.A[filas] = A
+        self.I[filas] = I
+        self.q[filas] = q
+        self.rho[filas] = rho
+        self.id_barra[filas] = ids
+        self.barra_activa[filas] = True
+        self._fila_de_barra[ids] = filas
+        self.n_filas_barras += k
+        self._next_barra_id += k
+        self._n_barras += k
+        if self._nivel_transaccion or self._adyacencia_pendiente:
+            self._adyacencia_pendiente = True
+        elif k > 64:
+            self.reconstruir_adyacencia()
+        else:
+            for fila in filas:
+                self._enlazar_extremo(fila, 0)
+                self._enlazar_extremo(fila, 1)
+        self.registrar_cambio('topologia', filas_barras=filas)
+        return ids
+
+    def añadir_barra(self, id_nodo1, id_nodo2, E, A, I, rho=0.0):
+        """Añade una barra entre dos nodos existentes y devuelve su ID."""
+        filas_nodos = [[self.fila_nodo(id_nodo1), self.fila_nodo(id_nodo2)]]
+        return int(self.añadir_barras(filas_nodos, E, A, I, rho=rho)[0])
+
+    def existe_barra(self, id_barra):
+        return 0 <= id_barra < self._next_barra_id and self._fila_de_barra[id_barra] >= 0
+
+    def fila_barra(self, id_barra):
+        """
+        Devuelve la fila de la barra.
+        Raises:
+            KeyError: Si el ID de la barra no existe.
+        """
+        if not self.existe_barra(id_barra):
+            raise KeyError(id_barra)
+        return int(self._fila_de_barra[id_barra])
+
+    def filas_barras_activas(self):
+        return np.flatnonzero(self.barra_activa[:self.n_filas_barras])
+
+    def ids_barras(self):
+        """IDs de las barras existentes, en orden creciente."""
+        return self.id_barra[self.filas_barras_activas()]
+
+    def n_barras(self):
+        return self._n_barras
+
+    def filas_de_barras(self, ids):
+        """Versión vectorizada de fila_barra, sin excepción: -1 para IDs que no existen."""
+        return self._filas_de_ids(self._fila_de_barra, self._next_barra_id, ids)
+
+    def _enlazar_extremo(self, fila_barra, extremo):
+        fila_nodo = self.conectividad[fila_barra, extremo]
+        self._siguiente_extremo[fila_barra, extremo] = self._primer_extremo[fila_nodo]
+        self._primer_extremo[fila_nodo] = 2 * fila_barra + extremo
+
+    def _desenlazar_extremo(self, fila_barra, extremo):
+        fila_nodo = self.conectividad[fila_barra, extremo]
+        buscado = 2 * fila_barra + extremo
+        siguiente = self._siguiente_extremo.ravel()
+        if self._primer_extremo[fila_nodo] == buscado:
+            self._primer_extremo[fila_nodo] = siguiente[buscado]
+        else:
+            actual = self._primer_extremo[fila_nodo]
+            while siguiente[actual] != buscado:
+                actual = siguiente[actual]
+            siguiente[actual] = siguiente[buscado]
+        siguiente[buscado] = -1
+
+    def reconstruir_adyacencia(self):
+        """Reconstruye de forma vectorizada las listas nodo → barras a partir de la conectividad."""
+        self._primer_extremo[:] = -1
+        self._siguiente_extremo[:] = -1
+        extremos = 2 * self.filas_barras_activas()[:, None] + np.array([0, 1])
+        extremos = extremos.ravel()
+        if len(extremos) == 0:
+            return
+        nodos = self.conectividad.ravel()[extremos]
+        orden = np.argsort(nodos, kind='stable')
+        extremos, nodos = extremos[orden], nodos[orden]
+        mismo_nodo = nodos[1:] == nodos[:-1]
+        siguiente = self._siguiente_extremo.ravel()
+        siguiente[extremos[:-1][mismo_nodo]] = extremos[1:][mismo_nodo]
+        inicio = np.concatenate([[True], ~mismo_nodo])
+        self._primer_extremo[nodos[inicio]] = extremos[inicio]
+
+    def filas_barras_de_nodo(self, fila_nodo):
+        """Filas de las barras activas que llegan a la fila de nodo dada (en O(grado))."""
+        self._asegurar_adyacencia()
+        filas = []
+        siguiente = self._siguiente_extremo.ravel()
+        extremo = self._primer_extremo[fila_nodo]
+        while extremo >= 0:
+            filas.append(extremo // 2)
+            extremo = siguiente[extremo]
+        return np.array(sorted(filas), dtype=np.intp)
+
+    def modificar_barra(self, id_barra, **valores):
+        """
+        Cambia propiedades de una barra (E, A, I, q y/o rho). Las cargas (q) se registran
+        como cambio de 'cargas', la densidad (rho) como cambio de 'masas' (no afecta a la
+        rigidez) y el resto como cambio de 'propiedades'.
+        """
+        self.modificar_barras([self.fila_barra(id_barra)], **valores)
+
+    def modificar_barras(self, filas, **valores):
+        """Versión vectorizada de modificar_barra sobre las filas de barra dadas."""
+        for campo, valor in valores.items():
+            getattr(self, campo)[filas] = valor
+        if 'q' in valores:
+            self.registrar_cambio('cargas', filas_barras=filas)
+        if 'rho' in valores:
+            self.registrar_cambio('masas', filas_barras=filas)
+        if valores.keys() - {'q', 'rho'}:
+            self.registrar_cambio('propiedades', filas_barras=filas)
+
+    def conectar_barra(self, id_barra, extremo, id_nodo):
+        """Cambia el nodo inicial (extremo 0) o final (extremo 1) de una barra."""
+        fila = self.fila_barra(id_barra)
+        fila_nodo = self.fila_nodo(id_nodo)
+        if self._adyacencia_pendiente:
+            self.conectividad[fila, extremo] = fila_nodo
+        else:
+            self._desenlazar_extremo(fila, extremo)
+            self.conectividad[fila, extremo] = fila_nodo
+            self._enlazar_extremo(fila, extremo)
+        self.registrar_cambio('topologia', filas_barras=[fila])
+
+    def borrar_barra(self, id_barra):
+        """Desactiva la fila de la barra."""
+        fila = self.fila_barra(id_barra)
+        if not self._adyacencia_pendiente:
+            self._desenlazar_extremo(fila, 0)
+            self._desenlazar_extremo(fila, 1)
+        self.barra_activa[fila] = False
+        self._fila_de_barra[id_barra] = -1
+        self._n_barras -= 1
+        self.registrar_cambio('topologia')
+        self._compactar_si_conviene()
+
+    # ------------------------------------------------------------------
+    # Compactación
+    # ------------------------------------------------------------------
+
+    def _compactar_si_conviene(self):
+        if self._nivel_transaccion:
+            return
+        inactivos = (self.n_filas_nodos - self.n_nodos()) + (self.n_filas_barras - self.n_barras())
+        if inactivos > 64 and 2 * inactivos > self.n_filas_nodos + self.n_filas_barras:
+            self.compactar()
+
+    def compactar(self):
+        """
+        Elimina las filas inactivas conservando el orden. Las filas cambian, pero los IDs
+        y el orden de DOFs no; la conectividad se renumera a las nuevas filas de nodo.
+        """
+        self._indice_dof_pendiente = False
+        self._adyacencia_pendiente = False  # se reconstruye al final
+        filas_n = self.filas_nodos_activos()
+        nueva_fila_nodo = np.full(self.n_filas_nodos, -1, dtype=np.intp)
+        nueva_fila_nodo[filas_n] = np.arange(len(filas_n))
+        for nombre in ('coords', 'reacciones', 'id_nodo', 'nodo_activo', 'rev_nodo', 'restringido', 'prescrito'):
+            array = getattr(self, nombre)
+            if array is None:
+                continue
+            array[:len(filas_n)] = array[filas_n]
+        self.nodo_activo[len(filas_n):] = False
+        self.n_filas_nodos = len(filas_n)
+        self._fila_de_nodo[self.id_nodo[:self.n_filas_nodos]] = np.arange(self.n_filas_nodos)
+        self._indice_dof[:] = -1
+        self._indice_dof[:self.n_filas_nodos] = np.arange(self.n_filas_nodos)
+
+        filas_b = self.filas_barras_activas()
+        for nombre in ('conectividad', 'E', 'A', 'I', 'q', 'rho', 'id_barra', 'barra_activa', 'rev_barra'):
+            array = getattr(self, nombre)
+            array[:len(filas_b)] = array[filas_b]
+        self.barra_activa[len(filas_b):] = False
+        self.n_filas_barras = len(filas_b)
+        self.conectividad[:self.n_filas_barras] = nueva_fila_nodo[self.conectividad[:self.n_filas_barras]]
+        self._fila_de_barra[self.id_barra[:self.n_filas_barras]] = np.arange(self.n_filas_barras)
+
+        self.reconstruir_adyacencia()
+
+    def siguientes_ids(self):
+        """Próximos IDs de nodo y de barra que se asignarán (los IDs no se reutilizan)."""
+        return int(self._next_node_id), int(self._next_barra_id)
+
+    def restaurar(self, ids_nodos, coords, restringido, prescrito, ids_barras, nodos_barras, E, A, I, q,
+                  siguiente_id_nodo=None, siguiente_id_barra=None, reacciones=None, rho=None):
+        """
+        Carga de golpe un modelo completo en un almacén vacío conservando sus IDs (que
+        pueden tener huecos por borrados), p. ej. al leerlo de un archivo.
+        Args:
+            ids_nodos (np.ndarray): IDs de los nodos, crecientes (n,).
+            coords, restringido, prescrito (np.ndarray): Datos de los nodos (n, 3).
+            ids_barras (np.ndarray): IDs de las barras, crecientes (m,).
+            nodos_barras (np.ndarray): IDs de nodo inicial y final de cada barra (m, 2).
+            E, A, I, q (np.ndarray): Propiedades y cargas de las barras (m,).
+            siguiente_id_nodo, siguiente_id_barra (int, optional): Próximos IDs a asignar.
+            reacciones (np.ndarray, optional): Reacciones de los nodos (n, 6).
+            rho (np.ndarray, optional): Densidades de las barras (m,); por defecto, 0.
+        Raises:
+            ValueError: Si el almacén no está vacío o los IDs no son crecientes.
+        """
+        if self.n_filas_nodos or self.n_filas_barras:
+            raise ValueError("Solo se puede restaurar un modelo en un almacén vacío.")
+        ids_nodos = np.asarray(ids_nodos, dtype=np.int64)
+        ids_barras = np.asarray(ids_barras, dtype=np.int64)
+        if np.any(np.diff(ids_nodos) <= 0) or np.any(np.diff(ids_barras) <= 0):
+            raise ValueError("Los IDs de nodos y barras deben ser estrictamente crecientes.")
+        n, m = len(ids_nodos), len(ids_barras)
+
+        self._next_node_id = int(siguiente_id_nodo if siguiente_id_nodo is not None
+                                 else (ids_nodos[-1] + 1 if n else 0))
+        self._reservar_nodos(n)
+        self._fila_de_nodo = np.full(max(len(self._fila_de_nodo), self._next_node_id), -1, dtype=np.intp)
+        self.coords[:n] = coords
+        self.id_nodo[:n] = ids_nodos
+        self.nodo_activo[:n] = True
+        self.restringido[:n] = restringido
+        self.prescrito[:n] = prescrito
+        self._indice_dof[:n] = np.arange(n)
+        self._fila_de_nodo[ids_nodos] = np.arange(n)
+        self.n_filas_nodos = self._n_nodos = n
+        if reacciones is not None:
+            self.reservar_reacciones()[:n] = reacciones
+
+        self._next_barra_id = int(siguiente_id_barra if siguiente_id_barra is not None
+                                  else (ids_barras[-1] + 1 if m else 0))
+        self._reservar_barras(m)
+        self._fila_de_barra = np.full(max(len(self._fila_de_barra), self._next_barra_id), -1, dtype=np.intp)
+        self.conectividad[:m] = self._fila_de_nodo[np.asarray(nodos_barras, dtype=np.intp)]
+        self.E[:m], self.A[:m], self.I[:m], self.q[:m] = E, A, I, q
+        self.rho[:m] = 0.0 if rho is None else rho
+        self.id_barra[:m] = ids_barras
+        self.barra_activa[:m] = True
+        self._fila_de_barra[ids_barras] = np.arange(m)
+        self.n_filas_barras = self._n_barras = m
+
+        self.reconstruir_adyacencia()
+        self.registrar_cambio('topologia', filas_nodos=np.arange(n), filas_barras=np.arange(m))
+
+    def bytes_ocupados(self):
+        """Memoria total ocupada por los arrays del almacén (en bytes)."""
+        return sum(v.nbytes for v in vars(self).values() if isinstance(v, np.ndarray))
+
+
+# ----------------------------------------------------------------------
+# Vistas: mantienen la API de objetos Nodo/Barra y de diccionarios sobre los arrays
+# ----------------------------------------------------------------------
+
+def _coordenada(eje):
+    def leer(self):
+        return float(self._almacen.coords[self._almacen.fila_nodo(self.id), eje])
+
+    def escribir(self, valor):
+        self._almacen.mover_nodo(self.id, eje, valor)
+    return property(leer, escribir)
+
+
+def _reaccion(k):
+    def leer(self):
+        fila = self._almacen.fila_nodo(self.id)
+        reacciones = self._almacen.reacciones
+        return 0.0 if reacciones is None else float(reacciones[fila, k])
+
+    def escribir(self, valor):
+        self._almacen.reservar_reacciones()[self._almacen.fila_nodo(self.id), k] = valor
+    return property(leer, escribir)
+
+
+def _propiedad_barra(campo):
+    def leer(self):
+        return float(getattr(self._almacen, campo)[self._almacen.fila_barra(self.id)])
+
+    def escribir(self, valor):
+        self._almacen.modificar_barra(self.id, **{campo: valor})
+    return property(leer, escribir)
+
+
+def _extremo_barra(extremo):
+    def leer(self):
+        almacen = self._almacen
+        fila_nodo = almacen.conectividad[almacen.fila_barra(self.id), extremo]
+        return VistaNodo(almacen, int(almacen.id_nodo[fila_nodo]))
+
+    def escribir(self, nodo):
+        self._almacen.conectar_barra(self.id, extremo, nodo.id)
+    return property(leer, escribir)
+
+
+class VistaNodo(Nodo):
+    """Nodo cuyos datos viven en un AlmacenModelo; leer o escribir sus atributos accede a los arrays."""
+
+    def __init__(self, almacen, id_nodo):
+        self._almacen = almacen
+        self.id = id_nodo
+
+    x = _coordenada(0)
+    y = _coordenada(1)
+    z = _coordenada(2)
+    rx = _reaccion(0)
+    ry = _reaccion(1)
+    rz = _reaccion(2)
+    mx = _reaccion(3)
+    my = _reaccion(4)
+    mz = _reaccion(5)
+
+    def __eq__(self, otro):
+        return isinstance(otro, VistaNodo) and otro._almacen is self._almacen and otro.id == self.id
+
+    def __hash__(self):
+        return hash((id(self._almacen), self.id))
+
+
+class VistaBarra(Barra):
+    """Barra cuyos datos viven en un AlmacenModelo; leer o escribir sus atributos accede a los arrays."""
+
+    def __init__(self, almacen, id_barra):
+        self._almacen = almacen
+        self.id = id_barra
+
+    nodo1 = _extremo_barra(0)
+    nodo2 = _extremo_barra(1)
+    E = _propiedad_barra('E')
+    A = _propiedad_barra('A')
+    I = _propiedad_barra('I')
+    q = _propiedad_barra('q')
+    rho = _propiedad_barra('rho')
+
+    def __eq__(self, otra):
+        return isinstance(otra, VistaBarra) and otra._almacen is self._almacen and otra.id == self.id
+
+    def __hash__(self):
+        return hash((id(self._almacen), self.id))
+
+
+class VistaNodos(Mapping):
+    """Diccionario de solo lectura {id_nodo: Nodo} sobre un AlmacenModelo."""
+
+    def __init__(self, almacen):
+        self._almacen = almacen
+
+    def __getitem__(self, id_nodo):
+        if not isinstance(id_nodo, (int, np.integer)) or not self._almacen.existe_nodo(id_nodo):
+            raise KeyError(id_nodo)
+        return VistaNodo(self._almacen, int(id_nodo))
+
+    def __contains__(self, id_nodo):
+        return isinstance(id_nodo, (int, np.integer)) and self._almacen.existe_nodo(id_nodo)
+
+    def __iter__(self):
+        return iter(self._almacen.ids_nodos().tolist())
+
+    def __len__(self):
+        return self._almacen.n_nodos()
+
+
+class VistaBarras(Mapping):
+    """Diccionario de solo lectura {id_barra: Barra} sobre un AlmacenModelo."""
+
+    def __init__(self, almacen):
+        self._almacen = almacen
+
+    def __getitem__(self, id_barra):
+        if not isinstance(id_barra, (int, np.integer)) or not self._almacen.existe_barra(id_barra):
+            raise KeyError(id_barra)
+        return VistaBarra(self._almacen, int(id_barra))
+
+    def __contains__(self, id_barra):
+        return isinstance(id_barra, (int, np.integer)) and self._almacen.existe_barra(id_barra)
+
+    def __iter__(self):
+        return iter(self._almacen.ids_barras().tolist())
+
+    def __len__(self):
+        return self._almacen.n_barras()
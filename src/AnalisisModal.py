@@ -0,0 +1,78 @@
+# AnalisisModal.py
+import numpy as np
+
+# Por debajo de este número de DOFs libres se resuelve el problema denso completo
+MAX_DOFS_DENSO = 200
+
+
+def modos_propios(portico, n_modos=10, concentrada=False, sigma=0.0):
+    """
+    Calcula los primeros modos de vibración del pórtico, K φ = ω² M φ, sobre los DOFs
+    libres. Solo se extraen los n_modos más próximos a 'sigma' con un solver de
+    autovalores disperso en modo shift-invert (scipy.sparse.linalg.eigsh): con sigma = 0
+    el operador inverso es la factorización de K_ff ya cacheada por el Portico, de modo
+    que no se factoriza nada nuevo. Los modelos pequeños se resuelven en denso.
+    Requiere SciPy y una densidad (rho) no nula en las barras.
+    Args:
+        portico (Portico): Pórtico con apoyos suficientes.
+        n_modos (int): Número de modos a extraer.
+        concentrada (bool): Usar la matriz de masa concentrada en lugar de la consistente.
+        sigma (float): Desplazamiento espectral (ω²) alrededor del que se buscan los modos.
+    Returns:
+        dict: 'omega' (rad/s), 'frecuencias' (Hz) y 'periodos' (s) de forma (k,), 'modos'
+            (n_dof, k) normalizados respecto a la masa (cero en los DOFs restringidos),
+            'factores_participacion' (k, 2) en X e Y y 'masa_efectiva' (k, 2) como fracción
+            de la masa total movilizable en cada dirección.
+    Raises:
+        ValueError: Si no hay masa en los DOFs libres.
+        np.linalg.LinAlgError: Si K_ff es singular.
+    """
+    from scipy.sparse.linalg import eigsh, LinearOperator
+
+    factorizacion = portico.factorizar("csr")
+    libres, _ = portico.particionar_dofs()
+    K = portico.matriz_rigidez_global("csr")
+    M = portico.matriz_masa_global("csr", concentrada)
+    K_ff = K[libres][:, libres]
+    M_ff = M[libres][:, libres]
+    if M_ff.nnz == 0 or not np.any(M_ff.diagonal() > 0):
+        raise ValueError("Error: El modelo no tiene masa en los DOFs libres (asigne rho a las barras).")
+
+    n = len(libres)
+    k = min(n_modos, n - 1) if n > MAX_DOFS_DENSO else min(n_modos, n)
+    if n <= MAX_DOFS_DENSO:
+        from scipy.linalg import eigh
+        # Con masa singular (concentrada) se resuelve el problema inverso M φ = (1/ω²) K φ
+        mu, phi = eigh(M_ff.toarray(), K_ff.toarray())
+        validos = mu > mu.max() * 1e-12
+        orden = np.argsort(np.abs(1.0 / mu[validos] - sigma))[:k]
+        omega2, phi = 1.0 / mu[validos][orden], phi[:, validos][:, orden]
+    elif sigma == 0.0:
+        inversa = LinearOperator((n, n), matvec=factorizacion.resolver, dtype=float)
+        omega2, phi = eigsh(K_ff, k, M=M_ff, sigma=0.0, which='LM', OPinv=inversa)
+    else:
+        omega2, phi = eigsh(K_ff.tocsc(), k, M=M_ff.tocsc(), sigma=sigma, which='LM')
+
+    orden = np.argsort(omega2)
+    omega2, phi = omega2[orden], phi[:, orden]
+    # Normalización respecto a la masa: φᵀ M φ = 1
+    phi = phi / np.sqrt(np.einsum('ik,ik->k', phi, M_ff @ phi))
+
+    n_dof = K.shape[0]
+    modos = np.zeros((n_dof, len(omega2)))
+    modos[libres] = phi
+
+    # Factores de participación en X e Y: Γ = φᵀ M r, con r el vector de arrastre
+    r = np.zeros((n_dof, 2))
+    r[0::3, 0] = 1.0
+    r[1::3, 1] = 1.0
+    r_f = r[libres]
+    Mr = M_ff @ r_f
+    gamma = phi.T @ Mr
+    masa_total = np.einsum('ij,ij->j', r_f, Mr)
+    masa_efectiva = gamma**2 / np.where(masa_total > 0, masa_total, 1.0)
+
+    omega = np.sqrt(np.maximum(omega2, 0.0))
+    return {'omega': omega, 'frecuencias': omega / (2 * np.pi),
+            'periodos': np.divide(2 * np.pi, omega, out=np.full_like(omega, np.inf), where=omega > 0),
+            'modos': modos, 'factores_participacion': gamma, 'masa_efectiva': masa_efectiva}
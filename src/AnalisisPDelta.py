@@ -0,0 +1,124 @@
+# AnalisisPDelta.py
+import time
+import numpy as np
+
+from Factorizacion import FactorizacionRigidez
+
+
+def _axiles(portico, datos, u):
+    """Axil de cada barra (positivo a tracción) para los desplazamientos u."""
+    _, N, _, _ = portico.calculadora_barra.esfuerzos_internos_lote(
+        u, datos['dofs'], datos['E'], datos['A'], datos['I'], datos['L'], datos['c'], datos['s'],
+        np.zeros(len(datos['L'])), estaciones=[0.0])
+    return N[:, 0]
+
+
+def _tangente(portico, K, kg):
+    """Rigidez tangente K + Kg, con Kg ensamblada sobre el patrón CSR de K (se suman sus K.data)."""
+    from scipy.sparse import csr_matrix
+
+    Kg = portico.ensamblar_barras(kg, "csr")
+    return csr_matrix((K.data + Kg.data, K.indices, K.indptr), shape=K.shape)
+
+
+def _autovalores_negativos(K_ff):
+    """
+    Número de autovalores negativos de una matriz simétrica dispersa, por la ley de
+    inercia de Sylvester: signos de los pivotes de una LU de SuperLU sin pivotaje fuera de
+    la diagonal y con el mismo orden en filas y columnas (equivalente a LDLᵀ).
+    Raises:
+        np.linalg.LinAlgError: Si la matriz es singular o exige pivotar fuera de la diagonal.
+    """
+    from scipy.sparse.linalg import splu
+
+    try:
+        lu = splu(K_ff.tocsc(), permc_spec="MMD_AT_PLUS_A", diag_pivot_thresh=0.0,
+                  options={"SymmetricMode": True})
+    except RuntimeError as e:
+        raise np.linalg.LinAlgError(str(e)) from e
+    if not np.array_equal(lu.perm_r, lu.perm_c):
+        raise np.linalg.LinAlgError("No se puede obtener la inercia: la LU ha pivotado fuera de la diagonal.")
+    return int(np.count_nonzero(lu.U.diagonal() < 0))
+
+
+def analisis_p_delta(portico, F=None, incluir_cargas_barras=True, tolerancia=1e-8, max_iteraciones=50,
+                     newton_modificado=True, umbral_estancamiento=0.5):
+    """
+    Análisis en segundo orden (P-Delta): resuelve (K + Kg(N(u))) u = f iterando sobre el
+    axil de las barras, con Kg la rigidez geométrica de CalculadoraPorticoBarra.
+    - Newton modificado (por defecto): el punto de partida es la solución lineal con la
+      factorización de K_ff cacheada por el Portico, que se conserva mientras el residuo
+      baje al menos en la proporción 'umbral_estancamiento' por iteración; si la
+      convergencia se estanca, se refactoriza la tangente K + Kg con el axil actual.
+    - Newton completo (newton_modificado=False): se refactoriza la tangente en cada iteración.
+    La tangente se ensambla sobre el patrón CSR de K (misma estructura de no nulos) y el
+    residuo se evalúa barra a barra sin ensamblar Kg.
+    Por encima de la carga crítica la iteración puede converger a un equilibrio inestable;
+    por eso, al converger, se factoriza una vez la tangente final y se comprueba que es
+    definida positiva (sin autovalores negativos).
+    Args:
+        portico (Portico): Pórtico con apoyos suficientes.
+        F (np.ndarray, optional): Fuerzas nodales globales (n_dof,).
+        incluir_cargas_barras (bool): Sumar las fuerzas equivalentes de las cargas de barra.
+        tolerancia (float): Tolerancia relativa del residuo respecto a las fuerzas.
+        max_iteraciones (int): Número máximo de iteraciones.
+        newton_modificado (bool): Conservar la factorización mientras converja.
+        umbral_estancamiento (float): Cociente de residuos a partir del que se refactoriza.
+    Returns:
+        dict: 'u' (n_dof,), 'N' axil de cada barra, 'convergido', 'iteraciones',
+            'factorizaciones' (refactorizaciones de la tangente), 'residuos' y 'tiempos'
+            (segundos de cada iteración).
+    Raises:
+        np.linalg.LinAlgError: Si la tangente es singular o, al converger, no es definida
+            positiva (carga crítica alcanzada o superada).
+    """
+    u = portico.resolver_casos(F, incluir_cargas_barras, formato="csr")[:, 0]
+    factorizacion = portico.factorizar("csr")
+    libres, _ = portico.particionar_dofs()
+    d = portico.datos_barras()
+    K = portico.matriz_rigidez_global("csr")
+    n_dof = K.shape[0]
+
+    f = np.zeros(n_dof) if F is None else np.asarray(F, dtype=float).copy()
+    if incluir_cargas_barras:
+        f = f + portico.vector_fuerzas_equivalentes()
+    referencia = max(np.linalg.norm(f[libres]), np.finfo(float).tiny)
+
+    residuos, tiempos = [], []
+    factorizaciones = 0
+    convergido = False
+    residuo_previo = np.inf
+    for iteracion in range(max_iteraciones):
+        inicio = time.perf_counter()
+        N = _axiles(portico, d, u)
+        kg = portico.calculadora_barra.rigidez_geometrica_lote(N, d['L'], d['c'], d['s'])
+        # Residuo f - (K + Kg) u, con Kg u calculado barra a barra
+        Kg_u = np.bincount(d['dofs'].ravel(), weights=np.einsum('bij,bj->bi', kg, u[d['dofs']]).ravel(),
+                           minlength=n_dof)
+        r = (f - K @ u - Kg_u)[libres]
+        norma = np.linalg.norm(r) / referencia
+        residuos.append(norma)
+        if norma <= tolerancia:
+            convergido = True
+            tiempos.append(time.perf_counter() - inicio)
+            break
+
+        if not newton_modificado or norma > umbral_estancamiento * residuo_previo:
+            K_T = _tangente(portico, K, kg)
+            factorizacion = FactorizacionRigidez(K_T[libres][:, libres])
+            factorizaciones += 1
+        residuo_previo = norma
+
+        u[libres] += factorizacion.resolver(r)
+        tiempos.append(time.perf_counter() - inicio)
+
+    if convergido:
+        K_T = _tangente(portico, K, kg)
+        negativos = _autovalores_negativos(K_T[libres][:, libres])
+        if negativos:
+            raise np.linalg.LinAlgError(
+                f"Error: La carga supera la carga crítica de pandeo ({negativos} modos inestables): "
+                "la rigidez tangente K + Kg no es definida positiva.")
+
+    return {'u': u, 'N': _axiles(portico, d, u), 'convergido': convergido, 'iteraciones': len(residuos),
+            'factorizaciones': factorizaciones, 'residuos': np.array(residuos), 'tiempos': np.array(tiempos)}
@@ -0,0 +1,230 @@
+# AnalisisTemporal.py
+import os
+import numpy as np
+
+from AnalisisModal import modos_propios
+from Factorizacion import FactorizacionRigidez
+
+
+def coeficientes_rayleigh(amortiguamiento, omega_i, omega_j):
+    """
+    Coeficientes (a0, a1) del amortiguamiento de Rayleigh C = a0 M + a1 K con la misma
+    fracción del crítico en las pulsaciones omega_i y omega_j (rad/s).
+    """
+    a0 = 2 * amortiguamiento * omega_i * omega_j / (omega_i + omega_j)
+    a1 = 2 * amortiguamiento / (omega_i + omega_j)
+    return a0, a1
+
+
+def _parametros_newmark(alfa, beta, gamma):
+    """β y γ por defecto: aceleración media (α = 0) o los de HHT-α con disipación óptima."""
+    if not -1.0 / 3.0 <= alfa <= 0.0:
+        raise ValueError("Error: El parámetro alfa de HHT debe estar entre -1/3 y 0.")
+    if gamma is None:
+        gamma = 0.5 - alfa
+    if beta is None:
+        beta = (1.0 - alfa)**2 / 4.0
+    return beta, gamma
+
+
+def _coeficientes_paso(dt, alfa, beta, gamma):
+    """Coeficientes de las fórmulas de Newmark en función del incremento Δu del paso."""
+    return {
+        'a_du': 1.0 / (beta * dt**2), 'a_v': 1.0 / (beta * dt), 'a_a': 1.0 / (2 * beta) - 1.0,
+        'v_du': gamma / (beta * dt), 'v_v': 1.0 - gamma / beta, 'v_a': dt * (1.0 - gamma / (2 * beta)),
+        # Término de amortiguamiento de la ecuación de HHT que depende del estado anterior
+        'c_v': (1 + alfa) * (1.0 - gamma / beta) - alfa, 'c_a': (1 + alfa) * dt * (1.0 - gamma / (2 * beta)),
+    }
+
+
+def _salidas(ruta, n_pasos, n_registro, n_barras):
+    """Arrays de resultados (en memoria o .npy reservados en disco con open_memmap)."""
+    formas = {'t': (n_pasos,), 'u': (n_pasos, n_registro)}
+    if n_barras:
+        formas.update({tipo: (n_pasos, n_barras, 2) for tipo in ('N', 'V', 'M')})
+    if ruta is None:
+        return {nombre: np.zeros(forma) for nombre, forma in formas.items()}
+    os.makedirs(ruta, exist_ok=True)
+    return {nombre: np.lib.format.open_memmap(os.path.join(ruta, f"{nombre}.npy"), mode="w+",
+                                              dtype=np.float64, shape=forma)
+            for nombre, forma in formas.items()}
+
+
+def _registro(portico, nodos, barras, n_dof):
+    """
+    DOFs cuyos desplazamientos se registran y datos de las barras cuyos esfuerzos se
+    registran. Devuelve (dofs_registro, datos, dofs_necesarios, pos_registro,
+    dofs_barras_locales): los DOFs necesarios son la unión de los registrados y los de las
+    barras, y las posiciones se refieren a ese conjunto.
+    """
+    dof_map = portico.gestor_modelo.get_dof_map()
+    if nodos is None:
+        dofs_registro = np.arange(n_dof)
+    else:
+        faltan = [n for n in nodos if n not in dof_map]
+        if faltan:
+            raise KeyError(f"Error: Los nodos con ID {faltan[:10]} no existen.")
+        dofs_registro = (3 * np.array([dof_map[n] for n in nodos], dtype=np.intp)[:, None] + np.arange(3)).ravel()
+    datos = None
+    if barras is not None:
+        datos = portico.datos_barras(barras)
+    dofs_barras = np.zeros(0, dtype=np.intp) if datos is None else datos['dofs'].ravel()
+    dofs_necesarios, inversa = np.unique(np.concatenate([dofs_registro, dofs_barras]), return_inverse=True)
+    dofs_barras_locales = None if datos is None else inversa[len(dofs_registro):].reshape(-1, 6)
+    return dofs_registro, datos, dofs_necesarios, inversa[:len(dofs_registro)], dofs_barras_locales
+
+
+def _pasos_directa(K_ff, M_ff, f_unidad, ag, k, alfa, a0, a1):
+    """
+    Integración directa sobre los DOFs libres: genera u_f en cada paso. La rigidez
+    efectiva se factoriza una sola vez; C = a0 M + a1 K se aplica con un producto por K y
+    otro por M.
+    """
+    from scipy.sparse.linalg import spsolve
+
+    K_ef = (1 + alfa) * (1 + a1 * k['v_du']) * K_ff + (k['a_du'] + (1 + alfa) * a0 * k['v_du']) * M_ff
+    factorizacion = FactorizacionRigidez(K_ef.tocsr())
+    a = spsolve(M_ff.tocsc(), f_unidad * ag[0]) if ag[0] != 0 else np.zeros(K_ff.shape[0])
+    u = np.zeros_like(a)
+    v = np.zeros_like(a)
+    yield u
+    for paso in range(1, len(ag)):
+        F = ((1 + alfa) * ag[paso] - alfa * ag[paso - 1]) * f_unidad
+        w = k['c_v'] * v + k['c_a'] * a
+        du = factorizacion.resolver(F - K_ff @ (u + a1 * w) + M_ff @ (k['a_v'] * v + k['a_a'] * a - a0 * w))
+        a, v = k['a_du'] * du - k['a_v'] * v - k['a_a'] * a, k['v_du'] * du + k['v_v'] * v + k['v_a'] * a
+        u = u + du
+        yield u
+
+
+def _pasos_modal(phi, omega, f_unidad, ag, k, alfa, a0, a1):
+    """
+    Integración modal: genera las coordenadas modales q en cada paso. Las ecuaciones
+    desacopladas (masa unidad) q̈ + 2ξω q̇ + ω² q = Γ·ag se integran todas a la vez, con
+    la fracción de amortiguamiento ξ que da Rayleigh en cada modo.
+    """
+    xi = a0 / (2 * omega) + a1 * omega / 2
+    rigidez, amortiguador = omega**2, 2 * xi * omega
+    f_ef = phi.T @ f_unidad
+    K_ef = (1 + alfa) * (rigidez + k['v_du'] * amortiguador) + k['a_du']
+    a = f_ef * ag[0]
+    u = np.zeros_like(a)
+    v = np.zeros_like(a)
+    yield u
+    for paso in range(1, len(ag)):
+        F = ((1 + alfa) * ag[paso] - alfa * ag[paso - 1]) * f_ef
+        w = k['c_v'] * v + k['c_a'] * a
+        du = (F - rigidez * u + k['a_v'] * v + k['a_a'] * a - amortiguador * w) / K_ef
+        a, v = k['a_du'] * du - k['a_v'] * v - k['a_a'] * a, k['v_du'] * du + k['v_v'] * v + k['v_a'] * a
+        u = u + du
+        yield u
+
+
+def historia_temporal(portico, aceleraciones, dt, direccion=(1.0, 0.0), amortiguamiento=0.05,
+                      omegas_rayleigh=None, alfa=0.0, beta=None, gamma=None, modal=False, n_modos=20,
+                      concentrada=False, nodos=None, barras=None, ruta=None, bloque=1000):
+    """
+    Respuesta lineal del pórtico a una aceleración del terreno ag(t), en desplazamientos
+    relativos a la base: M ü + C u̇ + K u = -M r ag(t), con amortiguamiento de Rayleigh.
+    - Directa: Newmark-β o HHT-α (alfa < 0) sobre los DOFs libres. La rigidez efectiva
+      (1+α)K + (1+α)γ/(β dt) C + M/(β dt²) se factoriza una sola vez y cada paso cuesta
+      dos productos dispersos y una resolución.
+    - Modal (modal=True): se integran a la vez, con el mismo esquema, las ecuaciones
+      desacopladas de los n_modos primeros modos (ver AnalisisModal.modos_propios), con la
+      fracción de amortiguamiento que da Rayleigh en cada modo.
+    Los resultados registrados se escriben por bloques de pasos; con 'ruta' van a ficheros
+    .npy en disco, de modo que la memoria no crece con la duración del registro.
+    Se parte del reposo; con masa concentrada (singular) debe ser ag(0) = 0.
+    Args:
+        portico (Portico): Pórtico con apoyos y densidad (rho) en las barras.
+        aceleraciones (np.ndarray): Aceleración del terreno en cada paso (n_pasos,) [m/s²].
+        dt (float): Paso de tiempo [s].
+        direccion (tuple): Componentes globales (x, y) de la dirección del sismo.
+        amortiguamiento (float): Fracción del amortiguamiento crítico.
+        omegas_rayleigh (tuple, optional): Pulsaciones (rad/s) con ese amortiguamiento; por
+            defecto, las de los dos primeros modos.
+        alfa (float): Parámetro de HHT, entre -1/3 y 0 (0 = Newmark).
+        beta, gamma (float, optional): Parámetros de Newmark; por defecto, los de HHT-α
+            (aceleración media si alfa = 0).
+        modal (bool): Integrar por superposición modal en lugar de directamente.
+        n_modos (int): Modos de la superposición modal.
+        concentrada (bool): Usar la matriz de masa concentrada.
+        nodos (list, optional): IDs de los nodos cuyos desplazamientos se registran (sus 3
+            DOFs); por defecto, todos.
+        barras (list, optional): IDs de las barras cuyos esfuerzos N, V, M en los extremos
+            se registran.
+        ruta (str, optional): Carpeta donde escribir t.npy, u.npy y N/V/M.npy.
+        bloque (int): Número de pasos por bloque de escritura.
+    Returns:
+        dict: 't' (n_pasos,), 'dofs' registrados, 'u' (n_pasos, n_dofs_registrados), 'N',
+            'V', 'M' (n_pasos, n_barras, 2) si se piden barras (np.memmap si hay 'ruta'),
+            y 'rayleigh' con (a0, a1).
+    Raises:
+        KeyError: Si algún nodo o barra no existe.
+        ValueError: Si los parámetros no son válidos o el modelo no tiene masa.
+    """
+    ag = np.asarray(aceleraciones, dtype=float)
+    beta, gamma = _parametros_newmark(alfa, beta, gamma)
+    k = _coeficientes_paso(dt, alfa, beta, gamma)
+
+    K = portico.matriz_rigidez_global("csr")
+    M = portico.matriz_masa_global("csr", concentrada)
+    n_dof = K.shape[0]
+    libres, _ = portico.particionar_dofs(n_dof)
+    K_ff = K[libres][:, libres]
+    M_ff = M[libres][:, libres]
+
+    # Vector de arrastre y fuerza efectiva por unidad de aceleración del terreno
+    r = np.zeros(n_dof)
+    r[0::3], r[1::3] = direccion
+    f_unidad = -(M_ff @ r[libres])
+
+    modos = None
+    if modal or omegas_rayleigh is None:
+        modos = modos_propios(portico, max(n_modos if modal else 2, 2), concentrada)
+    if omegas_rayleigh is None:
+        omegas_rayleigh = modos['omega'][:2]
+    a0, a1 = coeficientes_rayleigh(amortiguamiento, *omegas_rayleigh)
+
+    dofs_registro, datos, dofs_necesarios, pos_registro, dofs_barras_locales = _registro(
+        portico, nodos, barras, n_dof)
+    salida = _salidas(ruta, len(ag), len(dofs_registro), 0 if datos is None else len(datos['L']))
+    salida['t'][:] = dt * np.arange(len(ag))
+
+    def volcar(inicio, U_bloque):
+        """Escribe los resultados de un bloque de pasos; U_bloque (n_necesarios, pasos)."""
+        fin = inicio + U_bloque.shape[1]
+        salida['u'][inicio:fin] = U_bloque[pos_registro].T
+        if datos is not None:
+            _, N, V, Mf = portico.calculadora_barra.esfuerzos_internos_lote(
+                U_bloque, dofs_barras_locales, datos['E'], datos['A'], datos['I'], datos['L'],
+                datos['c'], datos['s'], np.zeros(len(datos['L'])), estaciones=[0.0, 1.0])
+            salida['N'][inicio:fin], salida['V'][inicio:fin], salida['M'][inicio:fin] = N, V, Mf
+
+    # Posición de cada DOF necesario en el vector de DOFs libres (-1 si está restringido)
+    pos_libre = np.full(n_dof, -1, dtype=np.intp)
+    pos_libre[libres] = np.arange(len(libres))
+    pos_libre = pos_libre[dofs_necesarios]
+    es_libre = pos_libre >= 0
+
+    if modal:
+        phi = modos['modos'][libres]
+        pasos = _pasos_modal(phi, modos['omega'], f_unidad, ag, k, alfa, a0, a1)
+        proyeccion = phi[pos_libre[es_libre]]
+    else:
+        pasos = _pasos_directa(K_ff, M_ff, f_unidad, ag, k, alfa, a0, a1)
+
+    U_bloque = np.zeros((len(dofs_necesarios), min(bloque, len(ag))))
+    inicio = 0
+    for paso, u in enumerate(pasos):
+        columna = paso - inicio
+        U_bloque[es_libre, columna] = proyeccion @ u if modal else u[pos_libre[es_libre]]
+        if columna + 1 == U_bloque.shape[1] or paso + 1 == len(ag):
+            volcar(inicio, U_bloque[:, :columna + 1])
+            inicio = paso + 1
+
+    for array in salida.values():
+        if isinstance(array, np.memmap):
+            array.flush()
+    salida.update({'dofs': dofs_registro, 'rayleigh': (a0, a1)})
+    return salida
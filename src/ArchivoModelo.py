@@ -0,0 +1,184 @@
+# ArchivoModelo.py
+# Formato de archivo de modelos y resultados: un único fichero binario con
+#   - 8 bytes mágicos b"PORTICO\x01" y la longitud (uint64, little-endian) de la cabecera,
+#   - una cabecera JSON con el tipo de contenido, metadatos y, por array, su dtype, forma,
+#     orden ('C' o 'F') y desplazamiento,
+#   - los datos de cada array sin comprimir, alineados a 64 bytes.
+# Al ser datos crudos en posiciones conocidas, los arrays pueden abrirse con np.memmap sin
+# leerlos: solo se cargan de disco las partes que se consultan.
+import json
+
+import numpy as np
+
+from GestorDeModelo import GestorDeModelo
+
+MAGICO = b"PORTICO\x01"
+ALINEACION = 64
+# Tamaño de los bloques en que se escriben los arrays grandes (acota la memoria temporal)
+BLOQUE_ESCRITURA = 1 << 24
+
+
+def _alinear(n):
+    return -(-n // ALINEACION) * ALINEACION
+
+
+def _escribir(ruta, tipo, arrays, meta=None, por_columnas=()):
+    """
+    Escribe un fichero del formato con los arrays dados.
+    Args:
+        ruta (str | os.PathLike): Fichero de salida.
+        tipo (str): 'modelo' o 'resultados'.
+        arrays (dict): {nombre: array}.
+        meta (dict, optional): Metadatos serializables en JSON.
+        por_columnas (iterable): Nombres de arrays 2D que se guardan por columnas (orden
+            'F'), de modo que cada columna (p. ej. un caso de carga) queda contigua.
+    """
+    entradas, desplazamiento = {}, 0
+    for nombre, array in arrays.items():
+        array = np.asanyarray(array)
+        orden = "F" if nombre in por_columnas and array.ndim == 2 else "C"
+        entradas[nombre] = {"dtype": array.dtype.str, "forma": list(array.shape), "orden": orden,
+                            "desplazamiento": desplazamiento}
+        desplazamiento = _alinear(desplazamiento + array.nbytes)
+
+    cabecera = json.dumps({"tipo": tipo, "meta": meta or {}, "arrays": entradas}).encode("utf-8")
+    inicio_datos = _alinear(len(MAGICO) + 8 + len(cabecera))
+    with open(ruta, "wb") as f:
+        f.write(MAGICO)
+        f.write(np.uint64(len(cabecera)).tobytes())
+        f.write(cabecera)
+        for nombre, array in arrays.items():
+            array = np.asanyarray(array)
+            f.seek(inicio_datos + entradas[nombre]["desplazamiento"])
+            if array.ndim == 0:
+                array.tofile(f)
+            elif entradas[nombre]["orden"] == "F":
+                columnas = max(1, BLOQUE_ESCRITURA // max(1, array.shape[0] * array.itemsize))
+                for j in range(0, array.shape[1], columnas):
+                    array[:, j:j + columnas].T.tofile(f)
+            else:
+                filas = max(1, BLOQUE_ESCRITURA // max(1, array[:1].nbytes))
+                for i in range(0, len(array), filas):
+                    array[i:i + filas].tofile(f)
+        f.truncate(inicio_datos + desplazamiento)
+
+
+def leer_archivo(ruta, mmap=True):
+    """
+    Lee un fichero del formato.
+    Args:
+        ruta (str | os.PathLike): Fichero a leer.
+        mmap (bool): Si es True, los arrays se abren como np.memmap de solo lectura (no se
+            leen hasta que se accede a ellos); si es False, se cargan en memoria.
+    Returns:
+        tuple: (tipo, meta, arrays) con arrays un diccionario {nombre: array}.
+    Raises:
+        ValueError: Si el fichero no tiene el formato esperado.
+    """
+    with open(ruta, "rb") as f:
+        if f.read(len(MAGICO)) != MAGICO:
+            raise ValueError(f"{ruta} no es un archivo de modelo o resultados de pórtico.")
+        longitud = int(np.frombuffer(f.read(8), dtype="<u8")[0])
+        cabecera = json.loads(f.read(longitud).decode("utf-8"))
+        inicio_datos = _alinear(len(MAGICO) + 8 + longitud)
+
+        arrays = {}
+        for nombre, e in cabecera["arrays"].items():
+            dtype, forma, orden = np.dtype(e["dtype"]), tuple(e["forma"]), e["orden"]
+            desplazamiento = inicio_datos + e["desplazamiento"]
+            cuenta = int(np.prod(forma, dtype=np.int64))
+            if mmap and cuenta > 0:
+                arrays[nombre] = np.memmap(ruta, dtype=dtype, mode="r", offset=desplazamiento,
+                                           shape=forma, order=orden)
+            else:
+                f.seek(desplazamiento)
+                arrays[nombre] = np.fromfile(f, dtype=dtype, count=cuenta).reshape(forma, order=orden)
+    return cabecera["tipo"], cabecera["meta"], arrays
+
+
+def guardar_modelo(gestor_modelo, ruta):
+    """
+    Guarda el modelo completo: nodos (coordenadas, restricciones, desplazamientos
+    prescritos y reacciones si las hay) y barras (conectividad, propiedades y cargas),
+    conservando los IDs.
+    Args:
+        gestor_modelo (GestorDeModelo): Modelo a guardar.
+        ruta (str | os.PathLike): Fichero de salida.
+    """
+    almacen = gestor_modelo.almacen
+    filas_n = almacen.filas_nodos_activos()
+    filas_b = almacen.filas_barras_activas()
+    arrays = {
+        "nodos_id": almacen.id_nodo[filas_n],
+        "nodos_coords": almacen.coords[filas_n],
+        "nodos_restringido": almacen.restringido[filas_n],
+        "nodos_prescrito": almacen.prescrito[filas_n],
+        "barras_id": almacen.id_barra[filas_b],
+        "barras_nodos": almacen.id_nodo[almacen.conectividad[filas_b]],
+        "barras_E": almacen.E[filas_b],
+        "barras_A": almacen.A[filas_b],
+        "barras_I": almacen.I[filas_b],
+        "barras_q": almacen.q[filas_b],
+        "barras_rho": almacen.rho[filas_b],
+    }
+    if almacen.reacciones is not None:
+        arrays["nodos_reacciones"] = almacen.reacciones[filas_n]
+    siguiente_id_nodo, siguiente_id_barra = almacen.siguientes_ids()
+    meta = {"siguiente_id_nodo": siguiente_id_nodo, "siguiente_id_barra": siguiente_id_barra}
+    _escribir(ruta, "modelo", arrays, meta)
+
+
+def cargar_modelo(ruta, gestor_modelo=None):
+    """
+    Carga un modelo guardado con guardar_modelo.
+    Args:
+        ruta (str | os.PathLike): Fichero a leer.
+        gestor_modelo (GestorDeModelo, optional): Gestor vacío en el que cargarlo (p. ej. el
+            de un Portico); por defecto se crea uno nuevo.
+    Returns:
+        GestorDeModelo: El gestor con el modelo cargado.
+    Raises:
+        ValueError: Si el fichero no contiene un modelo o el gestor no está vacío.
+    """
+    tipo, meta, a = leer_archivo(ruta, mmap=False)
+    if tipo != "modelo":
+        raise ValueError(f"{ruta} no contiene un modelo sino '{tipo}'.")
+    gestor_modelo = gestor_modelo if gestor_modelo is not None else GestorDeModelo()
+    gestor_modelo.almacen.restaurar(
+        a["nodos_id"], a["nodos_coords"], a["nodos_restringido"], a["nodos_prescrito"],
+        a["barras_id"], a["barras_nodos"], a["barras_E"], a["barras_A"], a["barras_I"], a["barras_q"],
+        meta.get("siguiente_id_nodo"), meta.get("siguiente_id_barra"), a.get("nodos_reacciones"),
+        a.get("barras_rho"))
+    return gestor_modelo
+
+
+def guardar_resultados(ruta, resultados, meta=None):
+    """
+    Guarda resultados de análisis. Los arrays 2D se guardan por columnas, de modo que cada
+    caso de carga de U (n_dof, n_casos) o de las reacciones queda contiguo en disco; los
+    esfuerzos por casos (n_casos, n_barras, npts) ya lo están en orden 'C'.
+    Args:
+        ruta (str | os.PathLike): Fichero de salida.
+        resultados (dict): {nombre: array}, p. ej. 'U', 'reacciones', 'x', 'N', 'V', 'M',
+            'ids_nodos', 'ids_barras'. Los arrays pueden ser np.memmap u otros arrays
+            grandes: se escriben por bloques sin copiarlos enteros.
+        meta (dict, optional): Metadatos serializables en JSON (p. ej. nombres de los casos).
+    """
+    resultados = {nombre: np.asanyarray(valor) for nombre, valor in resultados.items()}
+    _escribir(ruta, "resultados", resultados, meta,
+              por_columnas=[nombre for nombre, valor in resultados.items() if valor.ndim == 2])
+
+
+def cargar_resultados(ruta, mmap=True):
+    """
+    Abre un fichero de resultados. Con mmap=True la apertura es inmediata sea cual sea el
+    tamaño, y solo se leen de disco las partes de los arrays que se consultan.
+    Returns:
+        tuple: (resultados, meta), con resultados un diccionario {nombre: array}.
+    Raises:
+        ValueError: Si el fichero no contiene resultados.
+    """
+    tipo, meta, arrays = leer_archivo(ruta, mmap=mmap)
+    if tipo != "resultados":
+        raise ValueError(f"{ruta} no contiene resultados sino '{tipo}'.")
+    return arrays, meta
@@ -12,6 +12,9 @@ class Barra:
         self.A = A # Area de la barra
         self.I = I # momento de inercia
         self.q = 0 # carga distribuida vertical uniforme (en N/m)
+        self.rho = 0.0 # densidad del material (kg/m³), para la matriz de masa
+
+        self.id = None # lo asigna el GestorDeModelo al añadir la barra
         
     def obtener_L(self):
         """Calcula la longitud de la barra."""
@@ -118,6 +118,237 @@ class CalculadoraPorticoBarra:
         return T6.T @ feq_local
 
 
+    # ------------------------------------------------------------------
+    # Variantes por lotes: operan sobre arrays de propiedades de todas las barras
+    # ------------------------------------------------------------------
+
+    def _longitud_segura(self, L):
+        """
+        Devuelve (L_seguro, activa) donde las barras de longitud nula se sustituyen por 1
+        para evitar divisiones por cero; 'activa' vale 0 en esas barras para anular su aporte.
+        """
+        L = np.asarray(L, dtype=float)
+        activa = L > 0
+        return np.where(activa, L, 1.0), activa.astype(float)
+
+    def rigidez_global_lote(self, E, A, I, L, c, s):
+        """
+        Devuelve las matrices de rigidez globales (6x6) de un conjunto de barras.
+        Equivale a llamar a rigidez_local_global para cada barra, pero evalúa la forma
+        cerrada de T6.T @ klocal @ T6 por broadcasting, sin bucles en Python.
+        Args:
+            E, A, I, L, c, s (np.ndarray): Arrays (n_barras,) con módulo de Young, área,
+                inercia, longitud, coseno y seno de cada barra.
+        Returns:
+            np.ndarray: Pila de matrices de rigidez globales (n_barras, 6, 6).
+        """
+        E, A, I, c, s = (np.asarray(v, dtype=float) for v in (E, A, I, c, s))
+        L, activa = self._longitud_segura(L)
+
+        k1 = E * A / L * activa             # axial
+        k2 = 12 * E * I / L**3 * activa     # cortante
+        k3 = 6 * E * I / L**2 * activa      # acoplamiento cortante-giro
+        k4 = 4 * E * I / L * activa         # giro (mismo nudo)
+        k5 = 2 * E * I / L * activa         # giro (nudo opuesto)
+
+        kxx = c**2 * k1 + s**2 * k2
+        kyy = s**2 * k1 + c**2 * k2
+        kxy = c * s * (k1 - k2)
+        kxr = -s * k3
+        kyr = c * k3
+
+        K = np.empty((len(L), 6, 6))
+        K[:, 0] = np.stack([ kxx,  kxy,  kxr, -kxx, -kxy,  kxr], axis=-1)
+        K[:, 1] = np.stack([ kxy,  kyy,  kyr, -kxy, -kyy,  kyr], axis=-1)
+        K[:, 2] = np.stack([ kxr,  kyr,   k4, -kxr, -kyr,   k5], axis=-1)
+        K[:, 3] = np.stack([-kxx, -kxy, -kxr,  kxx,  kxy, -kxr], axis=-1)
+        K[:, 4] = np.stack([-kxy, -kyy, -kyr,  kxy,  kyy, -kyr], axis=-1)
+        K[:, 5] = np.stack([ kxr,  kyr,   k5, -kxr, -kyr,   k4], axis=-1)
+        return K
+
+    def masa_global_lote(self, rho, A, L, c, s, concentrada=False):
+        """
+        Devuelve las matrices de masa globales (6x6) de un conjunto de barras, de masa
+        m = rho·A·L repartida uniformemente.
+        - Consistente: funciones de forma lineales (axial) y de Hermite (flexión),
+          transformada como T6.T @ mlocal @ T6.
+        - Concentrada: m/2 en cada traslación de cada nudo y sin inercia de giro, invariante
+          frente al giro de la barra.
+        Args:
+            rho, A, L, c, s (np.ndarray): Arrays (n_barras,) con densidad, área, longitud,
+                coseno y seno de cada barra.
+            concentrada (bool): Matriz de masa concentrada en lugar de consistente.
+        Returns:
+            np.ndarray: Pila de matrices de masa globales (n_barras, 6, 6).
+        """
+        rho, A, L, c, s = (np.asarray(v, dtype=float) for v in (rho, A, L, c, s))
+        m = rho * A * L
+        M = np.zeros((len(m), 6, 6))
+        if concentrada:
+            M[:, [0, 1, 3, 4], [0, 1, 3, 4]] = m[:, None] / 2
+            return M
+
+        # Matriz local: axial en (0, 3) y flexión en (1, 2, 4, 5)
+        axial = np.array([[2.0, 1.0], [1.0, 2.0]]) / 6
+        M[:, [[0], [3]], [0, 3]] = m[:, None, None] * axial
+        L_ = L[:, None, None]
+        flexion = np.array([[156, 22, 54, -13], [22, 4, 13, -3], [54, 13, 156, -22], [-13, -3, -22, 4]]) / 420
+        # Potencias de L de cada término (giros multiplicados por L)
+        potencia = np.array([[0, 1, 0, 1], [1, 2, 1, 2], [0, 1, 0, 1], [1, 2, 1, 2]])
+        M[:, [[1], [2], [4], [5]], [1, 2, 4, 5]] = m[:, None, None] * flexion * L_**potencia
+
+        return self._a_globales_lote(M, c, s)
+
+    def rigidez_geometrica_lote(self, N, L, c, s):
+        """
+        Devuelve las matrices de rigidez geométrica globales (6x6) de un conjunto de barras
+        (matriz consistente de viga-columna, con funciones de forma de Hermite), para el
+        análisis en segundo orden (P-Delta). Con axil de compresión (N < 0) reducen la
+        rigidez lateral.
+        Args:
+            N (np.ndarray): Axil de cada barra, positivo a tracción (n_barras,).
+            L, c, s (np.ndarray): Longitud, coseno y seno de cada barra (n_barras,).
+        Returns:
+            np.ndarray: Pila de matrices de rigidez geométrica globales (n_barras, 6, 6).
+        """
+        N, c, s = (np.asarray(v, dtype=float) for v in (N, c, s))
+        L, activa = self._longitud_segura(L)
+        L_ = L[:, None, None]
+        base = np.array([[36, 3, -36, 3], [3, 4, -3, -1], [-36, -3, 36, -3], [3, -1, -3, 4]]) / 30
+        potencia = np.array([[-1, 0, -1, 0], [0, 1, 0, 1], [-1, 0, -1, 0], [0, 1, 0, 1]])
+        kg = np.zeros((len(L), 6, 6))
+        kg[:, [[1], [2], [4], [5]], [1, 2, 4, 5]] = (N * activa)[:, None, None] * base * L_**potencia
+        return self._a_globales_lote(kg, c, s)
+
+    def _a_globales_lote(self, m_local, c, s):
+        """Transforma matrices de barra locales a globales: T6.T @ m @ T6 por barra."""
+        T = np.zeros((len(m_local), 6, 6))
+        for k in (0, 3):
+            T[:, k, k] = T[:, k + 1, k + 1] = c
+            T[:, k, k + 1] = s
+            T[:, k + 1, k] = -s
+            T[:, k + 2, k + 2] = 1.0
+        return np.einsum('bji,bjk,bkl->bil', T, m_local, T)
+
+    def fuerzas_equivalentes_locales_lote(self, q, L):
+        """
+        Fuerzas nodales equivalentes por carga uniforme (coordenadas LOCALES) para un
+        conjunto de barras. Mismo convenio que fuerzas_equivalentes_locales.
+        Args:
+            q (np.ndarray): Cargas uniformes (n_barras,).
+            L (np.ndarray): Longitudes (n_barras,).
+        Returns:
+            np.ndarray: Pila de vectores (n_barras, 6).
+        """
+        q = np.asarray(q, dtype=float)
+        L = np.asarray(L, dtype=float)
+        cero = np.zeros_like(q * L)
+        return np.stack([
+            cero,  q * L / 2,  q * L**2 / 12,
+            cero,  q * L / 2, -q * L**2 / 12
+        ], axis=-1)
+
+    def fuerzas_equivalentes_globales_lote(self, q, L, c, s):
+        """
+        Fuerzas nodales equivalentes por carga uniforme en coordenadas GLOBALES para un
+        conjunto de barras (equivale a T6.T @ feq_local por barra).
+        Args:
+            q, L, c, s (np.ndarray): Arrays (n_barras,) con carga, longitud, coseno y seno.
+        Returns:
+            np.ndarray: Pila de vectores (n_barras, 6).
+        """
+        c = np.asarray(c, dtype=float)
+        s = np.asarray(s, dtype=float)
+        feq = self.fuerzas_equivalentes_locales_lote(q, L)
+        return np.stack([
+            -s * feq[..., 1], c * feq[..., 1], feq[..., 2],
+            -s * feq[..., 4], c * feq[..., 4], feq[..., 5]
+        ], axis=-1)
+
+    def desplazamientos_locales_lote(self, u_barras, c, s):
+        """
+        Transforma desplazamientos de extremo de barra de coordenadas globales a locales
+        (equivale a T6 @ u por barra).
+        Args:
+            u_barras (np.ndarray): Desplazamientos globales (..., n_barras, 6).
+            c, s (np.ndarray): Coseno y seno de cada barra (n_barras,).
+        Returns:
+            np.ndarray: Desplazamientos locales con la misma forma que u_barras.
+        """
+        c = np.asarray(c, dtype=float)
+        s = np.asarray(s, dtype=float)
+        u = np.asarray(u_barras, dtype=float)
+        return np.stack([
+             c * u[..., 0] + s * u[..., 1], -s * u[..., 0] + c * u[..., 1], u[..., 2],
+             c * u[..., 3] + s * u[..., 4], -s * u[..., 3] + c * u[..., 4], u[..., 5]
+        ], axis=-1)
+
+    def esfuerzos_internos_lote(self, u_global, dofs, E, A, I, L, c, s, q, npts=50, solo_extremos=False,
+                                estaciones=None):
+        """
+        Calcula N(x), V(x) y M(x) de todas las barras en una sola pasada vectorizada, con
+        las mismas expresiones que esfuerzos_internos (N = EA/L · (u_x2 - u_x1), constante).
+        Admite una matriz de desplazamientos con un caso de carga por columna.
+        Args:
+            u_global (np.ndarray): Desplazamientos globales (n_dof,) o (n_dof, n_casos).
+            dofs (np.ndarray): Índices de DOF globales de cada barra (n_barras, 6).
+            E, A, I, L, c, s (np.ndarray): Propiedades y geometría de cada barra (n_barras,).
+            q (np.ndarray): Carga uniforme de cada barra (n_barras,), o (n_casos, n_barras)
+                si cada caso tiene sus propias cargas.
+            npts (int): Número de puntos equiespaciados por barra.
+            solo_extremos (bool): Si es True, evalúa solo en x = 0, en el extremo relativo de
+                M(x) dentro de la barra (o en L/2 si no lo hay) y en x = L.
+            estaciones (np.ndarray, optional): Posiciones relativas x/L (entre 0 y 1) en las
+                que evaluar, en lugar de npts puntos equiespaciados.
+        Returns:
+            tuple: (x, N, V, M). Con un solo caso, arrays (n_barras, npts); con varios,
+                (n_casos, n_barras, npts). Con solo_extremos, npts = 3 y x depende del caso.
+        """
+        u_global = np.asarray(u_global, dtype=float)
+        varios_casos = u_global.ndim == 2
+        u_barras = u_global[dofs]                        # (n_barras, 6[, n_casos])
+        if varios_casos:
+            u_barras = np.moveaxis(u_barras, -1, 0)      # (n_casos, n_barras, 6)
+        u = self.desplazamientos_locales_lote(u_barras, c, s)
+
+        E, A, I, q = (np.asarray(v, dtype=float) for v in (E, A, I, q))
+        L, activa = self._longitud_segura(L)
+        EA_L = E * A / L * activa
+        EI = E * I * activa
+        q = q * activa
+
+        # Términos constantes a lo largo de la barra, con un eje final para las estaciones
+        N = (EA_L * (u[..., 3] - u[..., 0]))[..., None]
+        k_uy = (u[..., 1] - u[..., 4])[..., None]
+        r1 = u[..., 2][..., None]
+        r2 = u[..., 5][..., None]
+        q_ = np.broadcast_to(q, u.shape[:-1])[..., None]
+        L_ = L[:, None]
+        EI_ = EI[:, None]
+
+        if solo_extremos:
+            # dM/dx = q (L/2 - x) - 6EI/L² (r1 - r2) = 0
+            con_carga = q_ != 0
+            x_ext = L_ / 2 - np.divide(6 * EI_ / L_**2 * (r1 - r2), q_, out=np.zeros_like(q_), where=con_carga)
+            x_ext = np.where(con_carga, np.clip(x_ext, 0, L_), L_ / 2)
+            x = np.concatenate(np.broadcast_arrays(np.zeros_like(x_ext), x_ext, np.broadcast_to(L_, x_ext.shape)),
+                               axis=-1)
+        else:
+            x = L_ * (np.linspace(0, 1, npts) if estaciones is None else np.asarray(estaciones, dtype=float))
+
+        V = q_ * (L_ / 2 - x) \
+            + (12 * EI_ / L_**3) * k_uy \
+            + (6 * EI_ / L_**2) * (r1 + r2)
+        M = q_ * x * (L_ - x) / 2 \
+            + (6 * EI_ / L_**2) * k_uy \
+            + (2 * EI_ / L_) * r1 * (2 - 3 * x / L_) \
+            + (2 * EI_ / L_) * r2 * (3 * x / L_ - 1)
+        N = np.broadcast_to(N, V.shape).copy()
+
+        # Barras de longitud nula: todo a cero, como en esfuerzos_internos
+        x = np.broadcast_to(x * activa[:, None], V.shape).copy()
+        return x, N, V, M
+
     def esfuerzos_internos(self, barra, u_global, idn1, idn2, npts=50):
         """Calcula V(x) y M(x) en la barra a lo largo de su longitud"""
         L = barra.obtener_L()
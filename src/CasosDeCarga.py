@@ -0,0 +1,192 @@
+# CasosDeCarga.py
+import numpy as np
+
+
+class CasosDeCarga:
+    def __init__(self, portico, npts=11, formato="densa"):
+        """
+        Casos de carga básicos y combinaciones por superposición sobre un Portico.
+        Solo se resuelven los casos básicos (una factorización y una resolución con varios
+        términos independientes); desplazamientos, esfuerzos y reacciones de cualquier
+        combinación son combinaciones lineales de los de los casos básicos, de modo que
+        evaluar miles de combinaciones cuesta un producto de matrices.
+        Los desplazamientos prescritos del modelo forman parte de cada caso básico y, por
+        tanto, quedan multiplicados por los coeficientes de la combinación.
+        Args:
+            portico (Portico): Pórtico sobre el que se resuelven los casos.
+            npts (int): Número de estaciones por barra de los esfuerzos internos.
+            formato (str): 'densa' o 'csr', como en Portico.resolver_casos.
+        """
+        self.portico = portico
+        self.npts = npts
+        self.formato = formato
+        self.casos = {}  # {nombre: (fuerzas_nodales, cargas_barras, cargas_del_modelo)}
+        self.combinaciones = {}  # {nombre: {nombre_caso: coeficiente}}
+        self._resultados = None
+
+    def añadir_caso(self, nombre, fuerzas_nodales=None, cargas_barras=None, cargas_del_modelo=False):
+        """
+        Define un caso de carga básico.
+        Args:
+            nombre (str): Nombre del caso (p. ej. 'G', 'Q', 'W').
+            fuerzas_nodales (dict | np.ndarray, optional): {id_nodo: (fx, fy, mz)} o vector
+                global de fuerzas nodales (n_dof,).
+            cargas_barras (dict, optional): {id_barra: q} con la carga uniforme (en y local)
+                de las barras cargadas en este caso.
+            cargas_del_modelo (bool): Sumar las cargas uniformes asignadas a las barras del
+                modelo (Barra.asignar_carga_uniforme).
+        Raises:
+            ValueError: Si ya existe un caso con ese nombre.
+        """
+        if nombre in self.casos:
+            raise ValueError(f"Error: El caso de carga '{nombre}' ya existe.")
+        self.casos[nombre] = (fuerzas_nodales, dict(cargas_barras or {}), cargas_del_modelo)
+        self._resultados = None
+
+    def añadir_combinacion(self, nombre, coeficientes):
+        """
+        Define una combinación lineal de casos básicos, p. ej. {'G': 1.35, 'Q': 1.5}.
+        Raises:
+            KeyError: Si algún caso no existe.
+        """
+        faltan = [caso for caso in coeficientes if caso not in self.casos]
+        if faltan:
+            raise KeyError(f"Error: Los casos de carga {faltan} no existen.")
+        self.combinaciones[nombre] = dict(coeficientes)
+
+    def añadir_combinaciones(self, nombres, coeficientes):
+        """
+        Define varias combinaciones a la vez a partir de una matriz de coeficientes.
+        Args:
+            nombres (list): Nombres de las combinaciones (n_comb,).
+            coeficientes (np.ndarray): Coeficientes (n_comb, n_casos), con las columnas en el
+                orden en que se añadieron los casos.
+        Raises:
+            ValueError: Si la forma de la matriz no es válida.
+        """
+        coeficientes = np.asarray(coeficientes, dtype=float)
+        if coeficientes.shape != (len(nombres), len(self.casos)):
+            raise ValueError("La matriz de coeficientes debe ser (n_combinaciones, n_casos).")
+        casos = list(self.casos)
+        for nombre, fila in zip(nombres, coeficientes):
+            self.combinaciones[nombre] = dict(zip(casos, fila.tolist()))
+
+    def matriz_combinaciones(self, combinaciones=None):
+        """Coeficientes (n_comb, n_casos) de las combinaciones pedidas (por defecto, todas)."""
+        nombres = list(self.combinaciones) if combinaciones is None else list(combinaciones)
+        casos = {caso: j for j, caso in enumerate(self.casos)}
+        C = np.zeros((len(nombres), len(casos)))
+        for i, nombre in enumerate(nombres):
+            for caso, coeficiente in self.combinaciones[nombre].items():
+                C[i, casos[caso]] = coeficiente
+        return C
+
+    def _cargas(self):
+        """Fuerzas nodales (n_dof, n_casos) y cargas de barra (n_casos, n_barras) de los casos."""
+        portico = self.portico
+        gestor = portico.gestor_modelo
+        q_modelo = portico.datos_barras()['q']
+        dof_map = gestor.get_dof_map()
+        n_dof = 3 * len(dof_map)
+
+        F = np.zeros((n_dof, len(self.casos)))
+        Q = np.zeros((len(self.casos), len(q_modelo)))
+        for j, (fuerzas, cargas_barras, cargas_del_modelo) in enumerate(self.casos.values()):
+            if isinstance(fuerzas, dict):
+                for id_nodo, valores in fuerzas.items():
+                    if id_nodo not in dof_map:
+                        raise KeyError(f"Error: El nodo con ID {id_nodo} no existe.")
+                    F[3 * dof_map[id_nodo]:3 * dof_map[id_nodo] + 3, j] += valores
+            elif fuerzas is not None:
+                F[:, j] = fuerzas
+            if cargas_barras:
+                ids = np.fromiter(cargas_barras, dtype=np.int64, count=len(cargas_barras))
+                np.add.at(Q[j], portico.filas_barras(ids),
+                          np.fromiter(cargas_barras.values(), dtype=float, count=len(ids)))
+            if cargas_del_modelo:
+                Q[j] += q_modelo
+        return F, Q
+
+    def resolver(self):
+        """
+        Resuelve todos los casos básicos con una única factorización y guarda sus
+        desplazamientos, esfuerzos internos y reacciones.
+        Returns:
+            dict: 'U' (n_dof, n_casos), 'x', 'N', 'V', 'M' (n_casos, n_barras, npts) y
+                'reacciones' (dict de Portico.reacciones con arrays (k, n_casos)).
+        """
+        portico = self.portico
+        d = portico.datos_barras()
+        F, Q = self._cargas()
+
+        # Fuerzas equivalentes de las cargas de barra de cada caso, dispersadas en una pasada
+        feq = portico.calculadora_barra.fuerzas_equivalentes_globales_lote(Q, d['L'], d['c'], d['s'])
+        F_total = F.copy()
+        np.add.at(F_total, d['dofs'].ravel(), feq.transpose(1, 2, 0).reshape(-1, len(self.casos)))
+
+        U = portico.resolver_casos(F_total, incluir_cargas_barras=False, formato=self.formato)
+        x, N, V, M = portico.calculadora_barra.esfuerzos_internos_lote(
+            U, d['dofs'], d['E'], d['A'], d['I'], d['L'], d['c'], d['s'], Q, npts=self.npts)
+        reacciones = portico.reacciones(U, F_total, incluir_cargas_barras=False, guardar=False)
+        self._resultados = {'revision': portico.gestor_modelo.get_revision(), 'U': U,
+                            'x': x, 'N': N, 'V': V, 'M': M, 'reacciones': reacciones}
+        return self._resultados
+
+    def resultados_casos(self):
+        """Resultados de los casos básicos; se recalculan si el modelo ha cambiado."""
+        r = self._resultados
+        if r is None or r['revision'] != self.portico.gestor_modelo.get_revision():
+            r = self.resolver()
+        return r
+
+    def combinar(self, combinaciones=None):
+        """
+        Resultados de las combinaciones por superposición de los casos básicos.
+        Args:
+            combinaciones (list, optional): Nombres de las combinaciones; por defecto, todas.
+        Returns:
+            dict: 'U' (n_dof, n_comb), 'N', 'V', 'M' (n_comb, n_barras, npts), 'x'
+                (n_barras, npts) y 'reacciones' con 'rx', 'ry', 'mz' (k, n_comb).
+        """
+        r = self.resultados_casos()
+        C = self.matriz_combinaciones(combinaciones)
+        combinado = {'U': r['U'] @ C.T, 'x': r['x'][0]}
+        for tipo in ("N", "V", "M"):
+            combinado[tipo] = np.tensordot(C, r[tipo], axes=1)
+        reacciones = r['reacciones']
+        combinado['reacciones'] = {'nodos': reacciones['nodos']}
+        for clave in ("rx", "ry", "mz"):
+            combinado['reacciones'][clave] = reacciones[clave] @ C.T
+        return combinado
+
+    def envolventes(self, combinaciones=None, tipos=("N", "V", "M"), bloque=256):
+        """
+        Envolventes máxima y mínima de los esfuerzos en cada estación de cada barra sobre
+        un conjunto de combinaciones. Las combinaciones se evalúan por bloques (un producto
+        de matrices por bloque), de modo que la memoria no crece con su número.
+        Args:
+            combinaciones (list, optional): Nombres de las combinaciones; por defecto, todas.
+            tipos (tuple): Esfuerzos a envolver ('N', 'V', 'M').
+            bloque (int): Número de combinaciones evaluadas a la vez.
+        Returns:
+            dict: 'x' (n_barras, npts) y, por tipo, un dict con 'max' y 'min' (n_barras, npts)
+                y 'comb_max' y 'comb_min' con el índice de la combinación que los produce.
+        """
+        r = self.resultados_casos()
+        C = self.matriz_combinaciones(combinaciones)
+        forma = r['N'].shape[1:]
+        envolventes = {'x': r['x'][0]}
+        for tipo in tipos:
+            X = r[tipo].reshape(len(self.casos), -1)
+            e = {'max': np.full(X.shape[1], -np.inf), 'min': np.full(X.shape[1], np.inf),
+                 'comb_max': np.zeros(X.shape[1], dtype=np.intp), 'comb_min': np.zeros(X.shape[1], dtype=np.intp)}
+            for inicio in range(0, len(C), bloque):
+                valores = C[inicio:inicio + bloque] @ X
+                for extremo, arg, mejor in (('max', np.argmax, np.greater), ('min', np.argmin, np.less)):
+                    k = arg(valores, axis=0)
+                    v = np.take_along_axis(valores, k[None], axis=0)[0]
+                    mejora = mejor(v, e[extremo])
+                    e[extremo][mejora] = v[mejora]
+                    e['comb_' + extremo][mejora] = inicio + k[mejora]
+            envolventes[tipo] = {clave: valores.reshape(forma) for clave, valores in e.items()}
+        return envolventes
@@ -0,0 +1,86 @@
+# ExportacionEsfuerzos.py
+import os
+import numpy as np
+
+COLUMNAS = ("caso", "barra", "x", "N", "V", "M")
+
+
+def _filas_bloque(bloque):
+    """
+    Convierte un bloque de Portico.esfuerzos_por_bloques en una tabla (filas, 6) con las
+    columnas de COLUMNAS, ordenada por barra, caso y estación.
+    """
+    x, N, V, M = (np.asarray(bloque[k]) for k in ("x", "N", "V", "M"))
+    if N.ndim == 2:
+        x, N, V, M = x[None], N[None], V[None], M[None]
+    n_casos, n_barras, n_estaciones = N.shape
+    forma = (n_barras, n_casos, n_estaciones)
+    caso = np.broadcast_to(np.arange(n_casos)[None, :, None], forma)
+    barra = np.broadcast_to(np.asarray(bloque['ids_barras'])[:, None, None], forma)
+    # (casos, barras, estaciones) → (barras, casos, estaciones)
+    valores = [np.broadcast_to(a, N.shape).transpose(1, 0, 2) for a in (x, N, V, M)]
+    return np.column_stack([a.reshape(-1) for a in [caso, barra] + valores])
+
+
+def exportar_csv(portico, U, ruta, fmt="%.6e", **opciones):
+    """
+    Escribe los esfuerzos internos N, V y M en un CSV con una fila por barra, caso y
+    estación (columnas caso, barra, x, N, V, M). Los resultados se calculan y escriben
+    por bloques de barras, de modo que la memoria no crece con el tamaño del modelo.
+    Args:
+        portico (Portico): Modelo analizado.
+        U (np.ndarray): Desplazamientos (n_dof,) o (n_dof, n_casos); puede ser un np.memmap.
+        ruta (str): Fichero de salida.
+        fmt (str): Formato de los valores de x, N, V y M.
+        **opciones: barras, npts, estaciones o memoria_bloque de Portico.esfuerzos_por_bloques.
+    Returns:
+        int: Número de filas escritas.
+    """
+    formato = ",".join(["%d", "%d"] + [fmt] * 4)
+    n_filas = 0
+    with open(ruta, "w", newline="") as f:
+        f.write(",".join(COLUMNAS) + "\n")
+        for bloque in portico.esfuerzos_por_bloques(U, **opciones):
+            tabla = _filas_bloque(bloque)
+            np.savetxt(f, tabla, fmt=formato)
+            n_filas += len(tabla)
+    return n_filas
+
+
+def exportar_columnas(portico, U, directorio, **opciones):
+    """
+    Escribe los esfuerzos internos en formato columnar: un fichero .npy por columna
+    (caso, barra, x, N, V, M), con las filas en el mismo orden que exportar_csv. Los
+    ficheros se reservan de antemano y cada bloque se escribe en su tramo mediante
+    np.lib.format.open_memmap, de modo que se pueden leer después con np.load(...,
+    mmap_mode='r') sin cargarlos enteros.
+    Args:
+        portico (Portico): Modelo analizado.
+        U (np.ndarray): Desplazamientos (n_dof,) o (n_dof, n_casos); puede ser un np.memmap.
+        directorio (str): Carpeta de salida (se crea si no existe).
+        **opciones: barras, npts, estaciones o memoria_bloque de Portico.esfuerzos_por_bloques.
+    Returns:
+        dict: Ruta de cada columna.
+    """
+    barras = opciones.get('barras')
+    n_barras = len(portico.gestor_modelo.get_barras()) if barras is None else len(np.atleast_1d(barras))
+    n_casos = U.shape[1] if U.ndim == 2 else 1
+    estaciones = opciones.get('estaciones')
+    n_estaciones = opciones.get('npts', 11) if estaciones is None else len(estaciones)
+    n_filas = n_barras * n_casos * n_estaciones
+
+    os.makedirs(directorio, exist_ok=True)
+    rutas = {c: os.path.join(directorio, f"{c}.npy") for c in COLUMNAS}
+    tipos = {"caso": np.int32, "barra": np.int64}
+    salida = {c: np.lib.format.open_memmap(rutas[c], mode="w+", dtype=tipos.get(c, np.float64),
+                                           shape=(n_filas,)) for c in COLUMNAS}
+    inicio = 0
+    for bloque in portico.esfuerzos_por_bloques(U, **opciones):
+        tabla = _filas_bloque(bloque)
+        fin = inicio + len(tabla)
+        for j, c in enumerate(COLUMNAS):
+            salida[c][inicio:fin] = tabla[:, j]
+        inicio = fin
+    for columna in salida.values():
+        columna.flush()
+    return rutas
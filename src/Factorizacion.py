@@ -0,0 +1,164 @@
+# Factorizacion.py
+import numpy as np
+
+
+class FactorizacionRigidez:
+    # Rango máximo de las modificaciones acumuladas por Woodbury antes de aconsejar refactorizar
+    LIMITE_RANGO = 120
+
+    def __init__(self, K_ff, permutacion=None):
+        """
+        Factoriza una vez la matriz de rigidez reducida (DOFs libres) para poder resolver
+        después cualquier número de términos independientes sin refactorizar.
+        - Matriz densa: Cholesky (scipy.linalg.cho_factor si SciPy está disponible,
+          np.linalg.cholesky en caso contrario). SciPy se importa aquí, al factorizar, y
+          no al importar el módulo. Con una permutación que deje la matriz en banda
+          estrecha se usa Cholesky en banda (scipy.linalg.cholesky_banded).
+        - Matriz dispersa: LU dispersa de SuperLU (scipy.sparse.linalg.splu). Con una
+          permutación dada, SuperLU la respeta en lugar de aplicar su propio orden.
+        La permutación es interna: resolver() recibe y devuelve vectores en el orden original.
+        Args:
+            K_ff (np.ndarray | scipy.sparse matrix): Matriz reducida simétrica definida positiva.
+            permutacion (np.ndarray, optional): Orden nuevo → índice original de las filas de
+                K_ff (p. ej. de Cuthill-McKee inversa) aplicado antes de factorizar.
+        Raises:
+            np.linalg.LinAlgError: Si la matriz es singular o no es definida positiva.
+        """
+        self.n = K_ff.shape[0]
+        self.permutacion = None if permutacion is None else np.asarray(permutacion, dtype=np.intp)
+        if self.permutacion is not None:
+            p = self.permutacion
+            K_ff = K_ff[np.ix_(p, p)] if isinstance(K_ff, np.ndarray) else K_ff[p][:, p]
+        self.ancho_banda = None
+
+        if self.n == 0:
+            self.tipo = "vacia"
+            self._factor = None
+        elif isinstance(K_ff, np.ndarray):
+            try:
+                from scipy.linalg import cho_factor
+            except ImportError:
+                self.tipo = "cholesky_numpy"
+                self._factor = np.linalg.cholesky(K_ff)
+            else:
+                filas, columnas = np.nonzero(K_ff)
+                self.ancho_banda = int(np.max(np.abs(filas - columnas))) if len(filas) else 0
+                if self.permutacion is not None and 2 * (self.ancho_banda + 1) < self.n:
+                    from scipy.linalg import cholesky_banded
+                    self.tipo = "cholesky_banda"
+                    ab = np.zeros((self.ancho_banda + 1, self.n))
+                    for k in range(self.ancho_banda + 1):
+                        ab[k, :self.n - k] = np.diagonal(K_ff, -k)
+                    self._factor = cholesky_banded(ab, lower=True, check_finite=False)
+                else:
+                    self.tipo = "cholesky"
+                    self._factor = cho_factor(K_ff, lower=True, check_finite=False)
+        else:
+            from scipy.sparse.linalg import splu
+            self.tipo = "lu_dispersa"
+            orden = "COLAMD" if self.permutacion is None else "NATURAL"
+            try:
+                self._factor = splu(K_ff.tocsc(), permc_spec=orden)
+            except RuntimeError as e:  # SuperLU indica así una matriz singular
+                raise np.linalg.LinAlgError(str(e)) from e
+
+        # Modificaciones de bajo rango acumuladas: K_ff actual = K_ff0 + E C Eᵀ, con E las
+        # columnas de la identidad en los índices '_idx'. '_Z' = K_ff0⁻¹ E y '_S' = I + C Eᵀ Z.
+        self._idx = np.zeros(0, dtype=np.intp)
+        self._C = np.zeros((0, 0))
+        self._Z = np.zeros((self.n, 0))
+        self._S = np.zeros((0, 0))
+
+    def actualizar(self, indices, delta):
+        """
+        Incorpora una modificación de bajo rango de K_ff sin refactorizar, mediante la
+        identidad de Woodbury. Cada bloque suma delta[k] en las filas y columnas indices[k].
+        Args:
+            indices (np.ndarray): Índices en K_ff de cada bloque (n_bloques, m); -1 marca
+                posiciones que no pertenecen a K_ff (DOFs restringidos), que se ignoran.
+            delta (np.ndarray): Incrementos de rigidez de cada bloque (n_bloques, m, m).
+        Returns:
+            bool: False si el rango acumulado supera LIMITE_RANGO; la factorización queda
+                entonces sin modificar y conviene refactorizar desde la matriz completa.
+        """
+        idx_nuevos, C_nuevos = [], []
+        for ind, d in zip(np.asarray(indices), np.asarray(delta, dtype=float)):
+            libre = ind >= 0
+            if libre.any():
+                idx_nuevos.append(ind[libre])
+                C_nuevos.append(d[np.ix_(libre, libre)])
+        if not idx_nuevos:
+            return True
+
+        r_previo = len(self._idx)
+        r_total = r_previo + sum(len(ind) for ind in idx_nuevos)
+        if r_total > self.LIMITE_RANGO:
+            return False
+
+        idx = np.concatenate(idx_nuevos)
+        E = np.zeros((self.n, len(idx)))
+        E[idx, np.arange(len(idx))] = 1.0
+
+        C = np.zeros((r_total, r_total))
+        C[:r_previo, :r_previo] = self._C
+        inicio = r_previo
+        for bloque in C_nuevos:
+            fin = inicio + bloque.shape[0]
+            C[inicio:fin, inicio:fin] = bloque
+            inicio = fin
+
+        self._idx = np.concatenate([self._idx, idx])
+        self._Z = np.hstack([self._Z, self._resolver_base(E)])
+        self._C = C
+        self._S = np.eye(r_total) + C @ self._Z[self._idx]
+        return True
+
+    def rango_actualizaciones(self):
+        """Devuelve el rango acumulado de las modificaciones aplicadas con actualizar()."""
+        return len(self._idx)
+
+    def resolver(self, B):
+        """
+        Resuelve K_ff X = B con la factorización almacenada (incluidas las modificaciones
+        de bajo rango aplicadas con actualizar()).
+        Args:
+            B (np.ndarray): Término independiente (n,) o matriz de casos (n, n_casos).
+        Returns:
+            np.ndarray: Solución con la misma forma que B.
+        """
+        B = np.asarray(B, dtype=float)
+        if self.n == 0:
+            return np.zeros_like(B)
+
+        X = self._resolver_base(B)
+        if len(self._idx):
+            # Woodbury: (K0 + E C Eᵀ)⁻¹ b = y - Z (I + C Eᵀ Z)⁻¹ C Eᵀ y, con y = K0⁻¹ b
+            X = X - self._Z @ np.linalg.solve(self._S, self._C @ X[self._idx])
+        return X
+
+    def _resolver_base(self, B):
+        """Resuelve con la factorización original, sin las modificaciones de bajo rango."""
+        p = self.permutacion
+        if p is not None:
+            B = B[p]
+
+        if self.tipo == "cholesky":
+            from scipy.linalg import cho_solve
+            X = cho_solve(self._factor, B, check_finite=False)
+        elif self.tipo == "cholesky_banda":
+            from scipy.linalg import cho_solve_banded
+            X = cho_solve_banded((self._factor, True), B, check_finite=False)
+        elif self.tipo == "cholesky_numpy":
+            y = np.linalg.solve(self._factor, B)
+            X = np.linalg.solve(self._factor.T, y)
+        else:
+            X = self._factor.solve(B)
+
+        if p is not None:
+            X_original = np.empty_like(X)
+            X_original[p] = X
+            X = X_original
+        return X
+
+    def __repr__(self):
+        return f"FactorizacionRigidez(tipo={self.tipo}, n={self.n})"
@@ -0,0 +1,117 @@
+# GeneradorModelos.py
+import numpy as np
+
+
+def portico_regular(gestor_modelo, n_vanos, n_plantas, luz=5.0, altura=3.0, E=210e9, A=0.01, I=1e-4, q=0.0):
+    """
+    Genera un pórtico plano regular de varios vanos y plantas, empotrado en la base.
+    Args:
+        gestor_modelo (GestorDeModelo): Modelo en el que se crean nodos, barras y apoyos.
+        n_vanos (int): Número de vanos (columnas de pilares - 1).
+        n_plantas (int): Número de plantas.
+        luz (float): Luz de cada vano [m].
+        altura (float): Altura de cada planta [m].
+        E, A, I (float): Propiedades de todas las barras.
+        q (float): Carga uniforme en las vigas (en y local, negativa hacia abajo).
+    Returns:
+        dict: 'nodos' (n_plantas+1, n_vanos+1) con los IDs de nodo por planta y eje,
+            'pilares' y 'vigas' con los IDs de las barras.
+    """
+    x, y = np.meshgrid(np.arange(n_vanos + 1) * luz, np.arange(n_plantas + 1) * altura)
+    with gestor_modelo.transaccion():
+        nodos = gestor_modelo.crear_nodos(np.column_stack([x.ravel(), y.ravel()])).reshape(x.shape)
+        pilares = gestor_modelo.añadir_barras(np.column_stack([nodos[:-1].ravel(), nodos[1:].ravel()]), E, A, I)
+        vigas = gestor_modelo.añadir_barras(np.column_stack([nodos[1:, :-1].ravel(), nodos[1:, 1:].ravel()]),
+                                            E, A, I, q)
+        gestor_modelo.restringir_nodos(nodos[0], (True, True, True))
+    return {'nodos': nodos, 'pilares': pilares, 'vigas': vigas}
+
+
+def celosia(gestor_modelo, n_paneles, luz_panel=2.0, canto=2.0, E=210e9, A=0.005, I=1e-5, q=0.0):
+    """
+    Genera una celosía tipo Pratt (cordones, montantes y diagonales) apoyada en sus dos
+    extremos inferiores: articulación a la izquierda y apoyo deslizante a la derecha.
+    Las barras son de pórtico (nudos rígidos).
+    Args:
+        gestor_modelo (GestorDeModelo): Modelo en el que se crean nodos, barras y apoyos.
+        n_paneles (int): Número de paneles.
+        luz_panel (float): Longitud de cada panel [m].
+        canto (float): Distancia entre cordones [m].
+        E, A, I (float): Propiedades de todas las barras.
+        q (float): Carga uniforme en el cordón superior.
+    Returns:
+        dict: 'inferior' y 'superior' con los IDs de nodo de cada cordón, y 'cordones',
+            'montantes' y 'diagonales' con los IDs de las barras.
+    """
+    x = np.arange(n_paneles + 1) * luz_panel
+    with gestor_modelo.transaccion():
+        inferior = gestor_modelo.crear_nodos(np.column_stack([x, np.zeros_like(x)]))
+        superior = gestor_modelo.crear_nodos(np.column_stack([x, np.full_like(x, canto)]))
+
+        cordones = np.concatenate([
+            gestor_modelo.añadir_barras(np.column_stack([inferior[:-1], inferior[1:]]), E, A, I),
+            gestor_modelo.añadir_barras(np.column_stack([superior[:-1], superior[1:]]), E, A, I, q)])
+        montantes = gestor_modelo.añadir_barras(np.column_stack([inferior, superior]), E, A, I)
+        # Diagonales hacia el centro de la celosía
+        mitad = n_paneles // 2
+        diagonales = gestor_modelo.añadir_barras(np.concatenate([
+            np.column_stack([superior[:mitad], inferior[1:mitad + 1]]),
+            np.column_stack([inferior[mitad:-1], superior[mitad + 1:]])]), E, A, I)
+
+        gestor_modelo.restringir_nodos(inferior[[0, -1]], [(True, True, False), (False, True, False)])
+    return {'inferior': inferior, 'superior': superior, 'cordones': cordones,
+            'montantes': montantes, 'diagonales': diagonales}
+
+
+def portico_aleatorio(gestor_modelo, n_nodos, grado_medio=3.0, tamaño=100.0, semilla=None,
+                      E=210e9, A=0.01, I=1e-4, q=0.0, vecinos=8):
+    """
+    Genera un pórtico de topología aleatoria: nodos uniformes en un cuadrado unidos por un
+    árbol de barras cortas (conexo) más barras adicionales entre vecinos próximos, sin
+    barras duplicadas. Se empotran los nodos de la franja inferior (y < 5 % del lado, o el
+    más bajo si no hay ninguno), lo que basta para que el pórtico sea estable.
+    Args:
+        gestor_modelo (GestorDeModelo): Modelo en el que se crean nodos, barras y apoyos.
+        n_nodos (int): Número de nodos.
+        grado_medio (float): Número medio de barras por nodo (>= 2 para pasar del árbol).
+        tamaño (float): Lado del cuadrado [m].
+        semilla (int, optional): Semilla del generador aleatorio (reproducibilidad).
+        E, A, I (float): Propiedades de todas las barras.
+        q (float): Carga uniforme en todas las barras.
+        vecinos (int): Número de nodos, en orden de abscisa, entre los que se buscan los
+            extremos de cada barra.
+    Returns:
+        dict: 'nodos' con los IDs de nodo y 'barras' con los IDs de barra.
+    """
+    rng = np.random.default_rng(semilla)
+    xy = rng.uniform(0.0, tamaño, size=(n_nodos, 2))
+    xy = xy[np.argsort(xy[:, 0])]
+
+    # Árbol: cada nodo se une al más próximo de los 'vecinos' anteriores en abscisa
+    k = np.arange(1, n_nodos)
+    ventana = k[:, None] - np.arange(1, vecinos + 1)
+    ventana = np.where(ventana >= 0, ventana, k[:, None] - 1)
+    distancias = np.linalg.norm(xy[ventana] - xy[k, None], axis=-1)
+    padres = ventana[np.arange(len(k)), np.argmin(distancias, axis=1)]
+    pares = {(int(p), int(h)) for p, h in zip(padres, k)}
+
+    # Barras adicionales entre vecinos próximos en abscisa
+    n_barras = max(int(grado_medio * n_nodos / 2), len(pares))
+    n_extra = n_barras - len(pares)
+    if n_extra and n_nodos > 1:
+        a = rng.integers(0, n_nodos - 1, size=2 * n_extra)
+        b = np.minimum(a + rng.integers(1, vecinos + 1, size=2 * n_extra), n_nodos - 1)
+        for par in zip(a.tolist(), b.tolist()):
+            if len(pares) >= n_barras:
+                break
+            pares.add(par)
+
+    apoyos = np.flatnonzero(xy[:, 1] < 0.05 * tamaño)
+    if len(apoyos) == 0:
+        apoyos = [np.argmin(xy[:, 1])]
+
+    with gestor_modelo.transaccion():
+        ids = gestor_modelo.crear_nodos(xy)
+        barras = gestor_modelo.añadir_barras(ids[np.array(sorted(pares)).reshape(-1, 2)], E, A, I, q)
+        gestor_modelo.restringir_nodos(ids[apoyos], (True, True, True))
+    return {'nodos': ids, 'barras': barras}
@@ -1,23 +1,81 @@
 # gestor_modelo.py
-from Nodo import Nodo
-from Barra import Barra
+import contextlib
+import logging
+
+from AlmacenModelo import AlmacenModelo, VistaNodos, VistaBarras
 import numpy as np # Necesario para numpy.array si se usa en alguna parte (ej. en restricciones más complejas)
 
+# Mensajes de edición del modelo (nivel INFO). Sin configurar logging no se muestran y
+# apenas cuestan nada; para verlos: logging.basicConfig(level=logging.INFO).
+log = logging.getLogger("porticos.modelo")
+
+
 class GestorDeModelo:
     def __init__(self):
-        self.nodos = {}   # Diccionario: id_nodo → Nodo
-        self.barras = {}  # Diccionario: id_barra → Barra
-        self.restricciones = set()  # Conjunto de DOFs restringidos (índices globales)
+        # Los datos de nodos y barras viven en arrays contiguos (AlmacenModelo);
+        # 'nodos' y 'barras' son vistas de diccionario {id: Nodo/Barra} sobre esos arrays.
+        self.almacen = AlmacenModelo()
+        self.nodos = VistaNodos(self.almacen)    # Diccionario: id_nodo → Nodo
+        self.barras = VistaBarras(self.almacen)  # Diccionario: id_barra → Barra
+        # Las restricciones se guardan por nodo en el almacén (no como DOFs globales), de modo
+        # que no quedan desfasadas al borrar nodos; 'restricciones' las expresa como DOFs.
+        self._dof_map = None  # (revisión de topología, {id_nodo: índice}) cacheado
+
+    @property
+    def restricciones(self):
+        """Conjunto de DOFs restringidos (índices globales), calculado a partir de los nodos."""
+        return set(np.flatnonzero(self.almacen.dofs_restringidos()).tolist())
+
+    @property
+    def desplazamientos_prescritos(self):
+        """Diccionario {DOF restringido: desplazamiento impuesto} de los valores no nulos."""
+        u = self.almacen.desplazamientos_prescritos()
+        return {int(dof): float(u[dof]) for dof in np.flatnonzero(u)}
+
+    # Contador de revisiones: aumenta con cada cambio del modelo. Cada nodo y barra
+    # guarda la revisión de su último cambio, y cada tipo de cambio ('topologia',
+    # 'propiedades', 'restricciones', 'cargas', 'masas') la última revisión en que ocurrió,
+    # para que los resultados cacheados sepan qué ha quedado obsoleto.
+    # Los contadores se guardan en el almacén, que registra también los cambios hechos
+    # directamente sobre los objetos Nodo/Barra (p. ej. Barra.asignar_carga_uniforme).
 
-        self._next_node_id = 0
-        self._next_barra_id = 0
+    @property
+    def revision(self):
+        return self.almacen.revision
+
+    def _registrar_cambio(self, tipo, nodos=(), barras=()):
+        """Avanza la revisión y marca como modificados los nodos y barras indicados."""
+        self.almacen.registrar_cambio(tipo,
+                                      filas_nodos=self.almacen.filas_de_nodos(list(nodos)),
+                                      filas_barras=[self.almacen.fila_barra(idb) for idb in barras])
+
+    def get_revision(self):
+        """Devuelve la revisión actual del modelo (monótonamente creciente)."""
+        return self.almacen.revision
+
+    def revision_de(self, tipo):
+        """
+        Devuelve la última revisión en la que hubo un cambio del tipo indicado.
+        Args:
+            tipo (str): 'topologia', 'propiedades', 'restricciones', 'cargas' o 'masas'.
+        """
+        return self.almacen.rev_tipos[tipo]
+
+    def revision_rigidez(self):
+        """Última revisión que afecta a la matriz de rigidez o a su partición (todo salvo cargas)."""
+        rev_tipos = self.almacen.rev_tipos
+        return max(rev_tipos['topologia'], rev_tipos['propiedades'], rev_tipos['restricciones'])
+
+    def nodos_modificados(self, desde_revision):
+        """Devuelve el conjunto de IDs de nodos existentes modificados después de 'desde_revision'."""
+        return set(self.almacen.id_nodo[self.almacen.filas_nodos_modificados(desde_revision)].tolist())
+
+    def barras_modificadas(self, desde_revision):
+        """Devuelve el conjunto de IDs de barras existentes modificadas después de 'desde_revision'."""
+        return set(self.almacen.id_barra[self.almacen.filas_barras_modificadas(desde_revision)].tolist())
 
     def crear_nodo(self, x, y, z=0.0):
-        id_nodo = self._next_node_id
-        nodo = Nodo(id_nodo, x, y, z) # Pasar el ID al constructor del Nodo
-        self.nodos[id_nodo] = nodo
-        self._next_node_id += 1
-        return id_nodo
+        return self.almacen.añadir_nodo(x, y, z)
 
     def borrar_nodo(self, id_nodo):
         """
@@ -31,27 +89,18 @@ class GestorDeModelo:
         if id_nodo not in self.nodos:
             raise KeyError(f"Error: El nodo con ID {id_nodo} no existe.")
         
-        # Identificar y borrar las barras conectadas a este nodo
-        barras_a_borrar_ids = [
-            id_b for id_b, barra in self.barras.items()
-            if barra.nodo1 == self.nodos[id_nodo] or barra.nodo2 == self.nodos[id_nodo]
-        ]
-        for id_b in barras_a_borrar_ids:
-            del self.barras[id_b]
-        
-        # Eliminar restricciones asociadas a este nodo
-        # Necesitamos saber el índice del nodo en el orden global para eliminar DOFs
-        sorted_node_ids = sorted(self.nodos.keys())
-        if id_nodo in sorted_node_ids: # Asegurarse de que el nodo todavía está en la lista ordenada antes de borrarlo
-            node_index = sorted_node_ids.index(id_nodo)
-            dofs_to_remove = {3*node_index, 3*node_index + 1, 3*node_index + 2}
-            self.restricciones = self.restricciones - dofs_to_remove
+        # Identificar y borrar las barras conectadas a este nodo (índice de adyacencia)
+        filas_barras = self.almacen.filas_barras_de_nodo(self.almacen.fila_nodo(id_nodo))
+        for id_b in self.almacen.id_barra[filas_barras].tolist():
+            self.almacen.borrar_barra(id_b)
 
-        del self.nodos[id_nodo]
-        print(f"Nodo {id_nodo} y sus barras asociadas han sido borrados.")
+        # Las restricciones del nodo desaparecen con él; las de los demás nodos están
+        # guardadas por nodo y siguen siendo válidas.
+        self.almacen.borrar_nodo(id_nodo)
+        log.info("Nodo %s y sus barras asociadas han sido borrados.", id_nodo)
 
 
-    def añadir_barra(self, id_nodo1, id_nodo2, E=210e9, A=0.01, I=1e-6):
+    def añadir_barra(self, id_nodo1, id_nodo2, E=210e9, A=0.01, I=1e-6, rho=0.0):
         """
         Crea una barra entre dos nodos existentes y la añade al modelo.
         Args:
@@ -60,6 +109,7 @@ class GestorDeModelo:
             E (float): Módulo de elasticidad del material.
             A (float): Área de la sección transversal de la barra.
             I (float): Momento de inercia de la sección transversal de la barra.
+            rho (float): Densidad del material (kg/m³); solo interviene en la matriz de masa.
         Returns:
             int: El ID único de la barra creada.
         Raises:
@@ -73,14 +123,7 @@ class GestorDeModelo:
         if id_nodo1 == id_nodo2:
             raise ValueError("Error: No se puede crear una barra entre el mismo nodo.")
 
-        nodo1_obj = self.nodos[id_nodo1]
-        nodo2_obj = self.nodos[id_nodo2]
-        
-        barra = Barra(nodo1_obj, nodo2_obj, E, A, I)
-        id_barra = self._next_barra_id
-        self.barras[id_barra] = barra
-        self._next_barra_id += 1
-        return id_barra
+        return self.almacen.añadir_barra(id_nodo1, id_nodo2, E, A, I, rho)
 
     def borrar_barra(self, id_barra):
         """
@@ -92,10 +135,11 @@ class GestorDeModelo:
         """
         if id_barra not in self.barras:
             raise KeyError(f"Error: La barra con ID {id_barra} no existe.")
-        del self.barras[id_barra]
-        print(f"Barra {id_barra} ha sido borrada.")
+        self.almacen.borrar_barra(id_barra)
+        log.info("Barra %s ha sido borrada.", id_barra)
 
-    def editar_barra(self, id_barra, nuevo_id_nodo1=None, nuevo_id_nodo2=None, E=None, A=None, I=None):
+    def editar_barra(self, id_barra, nuevo_id_nodo1=None, nuevo_id_nodo2=None, E=None, A=None, I=None,
+                     rho=None):
         """
         Edita una barra existente cambiando sus nodos o propiedades.
         Args:
@@ -105,6 +149,7 @@ class GestorDeModelo:
             E (float, optional): Nuevo módulo de elasticidad. No cambia si es None.
             A (float, optional): Nueva área de la sección. No cambia si es None.
             I (float, optional): Nuevo momento de inercia. No cambia si es None.
+            rho (float, optional): Nueva densidad. No cambia si es None.
         Raises:
             KeyError: Si la barra o alguno de los nuevos nodos no existen.
             ValueError: Si los nuevos nodos son idénticos.
@@ -112,34 +157,29 @@ class GestorDeModelo:
         if id_barra not in self.barras:
             raise KeyError(f"Error: La barra con ID {id_barra} no existe.")
         
-        barra = self.barras[id_barra]
+        if nuevo_id_nodo1 is not None and nuevo_id_nodo1 not in self.nodos:
+            raise KeyError(f"Error: El nuevo nodo inicial con ID {nuevo_id_nodo1} no existe.")
+        if nuevo_id_nodo2 is not None and nuevo_id_nodo2 not in self.nodos:
+            raise KeyError(f"Error: El nuevo nodo final con ID {nuevo_id_nodo2} no existe.")
+        if nuevo_id_nodo1 is not None and nuevo_id_nodo2 is not None and nuevo_id_nodo1 == nuevo_id_nodo2:
+            raise ValueError("Error: Los nuevos nodos de la barra no pueden ser idénticos.")
 
         if nuevo_id_nodo1 is not None:
-            if nuevo_id_nodo1 not in self.nodos:
-                raise KeyError(f"Error: El nuevo nodo inicial con ID {nuevo_id_nodo1} no existe.")
-            barra.nodo1 = self.nodos[nuevo_id_nodo1]
-
+            self.almacen.conectar_barra(id_barra, 0, nuevo_id_nodo1)
         if nuevo_id_nodo2 is not None:
-            if nuevo_id_nodo2 not in self.nodos:
-                raise KeyError(f"Error: El nuevo nodo final con ID {nuevo_id_nodo2} no existe.")
-            barra.nodo2 = self.nodos[nuevo_id_nodo2]
-
-        if nuevo_id_nodo1 is not None and nuevo_id_nodo2 is not None and nuevo_id_nodo1 == nuevo_id_nodo2:
-            raise ValueError("Error: Los nuevos nodos de la barra no pueden ser idénticos.")
+            self.almacen.conectar_barra(id_barra, 1, nuevo_id_nodo2)
 
-        if E is not None:
-            barra.E = E
-        if A is not None:
-            barra.A = A
-        if I is not None:
-            barra.I = I
-        print(f"Barra {id_barra} ha sido editada.")
+        propiedades = {campo: valor for campo, valor in (('E', E), ('A', A), ('I', I), ('rho', rho))
+                       if valor is not None}
+        if propiedades:
+            self.almacen.modificar_barra(id_barra, **propiedades)
+        log.info("Barra %s ha sido editada.", id_barra)
 
 
     def restringir_nodo(self, id_nodo, restringir_x=False, restringir_y=False, restringir_rot=False):
         """
         Añade restricciones a los grados de libertad de un nodo.
-        Los DOFs se añaden al conjunto 'restricciones' como índices globales.
+        Las restricciones se guardan por nodo; 'restricciones' las expresa como DOFs globales.
         Args:
             id_nodo (int): ID del nodo a restringir.
             restringir_x (bool): True para restringir desplazamiento en X.
@@ -151,22 +191,9 @@ class GestorDeModelo:
         if id_nodo not in self.nodos:
             raise KeyError(f"Error: El nodo con ID {id_nodo} no existe.")
 
-        # Es crucial que el orden de los nodos sea consistente para mapear IDs a índices de DOF.
-        # sorted(self.nodos.keys()) asegura un orden fijo basado en los IDs numéricos.
-        sorted_node_ids = sorted(self.nodos.keys())
-        if id_nodo not in sorted_node_ids: # Puede pasar si el nodo fue borrado pero el ID no se actualizó
-            raise ValueError(f"Error interno: El nodo {id_nodo} no está en la lista de nodos ordenados.")
-            
-        node_index_in_dofs = sorted_node_ids.index(id_nodo)
-        
-        base_dof = node_index_in_dofs * 3 # DOF inicial para este nodo (ux, uy, rz)
-        if restringir_x:
-            self.restricciones.add(base_dof)
-        if restringir_y:
-            self.restricciones.add(base_dof + 1)
-        if restringir_rot:
-            self.restricciones.add(base_dof + 2)
-        print(f"Restricciones aplicadas al nodo {id_nodo}.")
+        dofs = [k for k, activo in enumerate((restringir_x, restringir_y, restringir_rot)) if activo]
+        self.almacen.restringir(id_nodo, dofs)
+        log.info("Restricciones aplicadas al nodo %s.", id_nodo)
 
     def eliminar_restriccion_nodo(self, id_nodo, liberar_x=False, liberar_y=False, liberar_rot=False):
         """
@@ -182,21 +209,174 @@ class GestorDeModelo:
         if id_nodo not in self.nodos:
             raise KeyError(f"Error: El nodo con ID {id_nodo} no existe.")
 
-        sorted_node_ids = sorted(self.nodos.keys())
-        if id_nodo not in sorted_node_ids:
-            raise ValueError(f"Error interno: El nodo {id_nodo} no está en la lista de nodos ordenados.")
-            
-        node_index_in_dofs = sorted_node_ids.index(id_nodo)
-        
-        base_dof = node_index_in_dofs * 3
-        if liberar_x and (base_dof in self.restricciones):
-            self.restricciones.remove(base_dof)
-        if liberar_y and (base_dof + 1 in self.restricciones):
-            self.restricciones.remove(base_dof + 1)
-        if liberar_rot and (base_dof + 2 in self.restricciones):
-            self.restricciones.remove(base_dof + 2)
-        print(f"Restricciones liberadas en el nodo {id_nodo}.")
+        dofs = [k for k, activo in enumerate((liberar_x, liberar_y, liberar_rot)) if activo]
+        self.almacen.restringir(id_nodo, dofs, restringir=False)
+        log.info("Restricciones liberadas en el nodo %s.", id_nodo)
+
+
+    def prescribir_desplazamiento(self, id_nodo, ux=None, uy=None, rz=None):
+        """
+        Impone desplazamientos conocidos (p. ej. asientos de apoyo) en los DOFs de un nodo.
+        Cada DOF con valor distinto de None queda además restringido.
+        Args:
+            id_nodo (int): ID del nodo.
+            ux (float, optional): Desplazamiento impuesto en X.
+            uy (float, optional): Desplazamiento impuesto en Y.
+            rz (float, optional): Giro impuesto en Z.
+        Raises:
+            KeyError: Si el ID del nodo no existe.
+        """
+        if id_nodo not in self.nodos:
+            raise KeyError(f"Error: El nodo con ID {id_nodo} no existe.")
 
+        prescritos = [(k, float(valor)) for k, valor in enumerate((ux, uy, rz)) if valor is not None]
+        self.almacen.restringir(id_nodo, [k for k, _ in prescritos], [valor for _, valor in prescritos])
+        log.info("Desplazamientos prescritos aplicados al nodo %s.", id_nodo)
+
+    # ------------------------------------------------------------------
+    # Construcción por lotes: una sola validación vectorizada por llamada. Si la validación
+    # falla no se modifica nada; si pasa, todo el lote se inserta con un único cambio de revisión.
+    # ------------------------------------------------------------------
+
+    @contextlib.contextmanager
+    def transaccion(self, deshacer=True):
+        """
+        Contexto para ediciones masivas: dentro de él no se mantienen la adyacencia
+        nodo → barras ni los índices de DOF en cada alta o baja, sino que se reconstruyen
+        una sola vez al salir (o antes si alguna consulta los necesita). Las transacciones
+        pueden anidarse. Si se produce un error dentro, el modelo vuelve al estado del
+        comienzo de la transacción y el error se propaga.
+        Ejemplo:
+            with gestor.transaccion():
+                ids = gestor.crear_nodos(coords)
+                gestor.añadir_barras(ids[pares])
+        Args:
+            deshacer (bool): Copiar el almacén al empezar para poder deshacer los cambios si
+                hay un error; con False no se copia nada, pero los cambios hechos antes del
+                error se conservan.
+        """
+        self.almacen.iniciar_transaccion(deshacer)
+        try:
+            yield self
+        except BaseException:
+            if deshacer:
+                self.almacen.deshacer_transaccion()
+                log.info("Transacción deshecha por un error.")
+            raise
+        finally:
+            self.almacen.confirmar_transaccion()
+
+    def _filas_de_nodos_existentes(self, ids_nodos):
+        """Filas del almacén de los IDs dados, comprobando que todos existan."""
+        ids_nodos = np.asarray(ids_nodos, dtype=np.int64)
+        filas = self.almacen.filas_de_nodos(ids_nodos)
+        if (filas < 0).any():
+            faltan = np.unique(ids_nodos[filas < 0])
+            raise KeyError(f"Error: Los nodos con ID {faltan[:10].tolist()} no existen.")
+        return filas
+
+    def crear_nodos(self, coords):
+        """
+        Crea varios nodos a la vez.
+        Args:
+            coords (np.ndarray): Coordenadas (k, 2) o (k, 3).
+        Returns:
+            np.ndarray: IDs de los nodos creados (k,).
+        Raises:
+            ValueError: Si las coordenadas no tienen 2 o 3 columnas o no son finitas.
+        """
+        coords = np.asarray(coords, dtype=float)
+        if coords.ndim != 2 or coords.shape[1] not in (2, 3):
+            raise ValueError("Error: Las coordenadas deben ser un array (k, 2) o (k, 3).")
+        if not np.isfinite(coords).all():
+            raise ValueError("Error: Las coordenadas de los nodos deben ser finitas.")
+        if coords.shape[1] == 2:
+            coords = np.column_stack([coords, np.zeros(len(coords))])
+        return self.almacen.añadir_nodos(coords)
+
+    def añadir_barras(self, conectividad, E=210e9, A=0.01, I=1e-6, q=0.0, rho=0.0):
+        """
+        Crea varias barras a la vez, validando todo el lote antes de insertar nada.
+        Args:
+            conectividad (np.ndarray): IDs de nodo inicial y final de cada barra (k, 2).
+            E, A, I (float | np.ndarray): Propiedades, escalares o arrays (k,).
+            q (float | np.ndarray): Carga uniforme de cada barra, escalar o array (k,).
+            rho (float | np.ndarray): Densidad de cada barra, escalar o array (k,).
+        Returns:
+            np.ndarray: IDs de las barras creadas (k,).
+        Raises:
+            KeyError: Si algún nodo no existe.
+            ValueError: Si alguna barra une un nodo consigo mismo o tiene longitud nula, si
+                hay barras repetidas (en el lote o respecto a las existentes, en cualquier
+                sentido) o si las propiedades no tienen k valores.
+        """
+        conectividad = np.asarray(conectividad, dtype=np.int64)
+        if conectividad.ndim != 2 or conectividad.shape[1] != 2:
+            raise ValueError("Error: La conectividad debe ser un array (k, 2) de IDs de nodo.")
+        k = len(conectividad)
+        try:
+            E, A, I, q, rho = (np.broadcast_to(np.asarray(v, dtype=float), (k,)) for v in (E, A, I, q, rho))
+        except ValueError:
+            raise ValueError("Error: Las propiedades deben ser escalares o arrays con una fila por barra.") from None
+
+        filas_nodos = self._filas_de_nodos_existentes(conectividad)
+        almacen = self.almacen
+
+        mismo_nodo = filas_nodos[:, 0] == filas_nodos[:, 1]
+        if mismo_nodo.any():
+            raise ValueError(f"Error: Las barras {np.flatnonzero(mismo_nodo)[:10].tolist()} del lote "
+                             "unen un nodo consigo mismo.")
+        xy = almacen.coords[filas_nodos, :2]
+        longitud_nula = np.all(xy[:, 0] == xy[:, 1], axis=1)
+        if longitud_nula.any():
+            raise ValueError(f"Error: Las barras {np.flatnonzero(longitud_nula)[:10].tolist()} del lote "
+                             "tienen longitud nula.")
+
+        # Barras repetidas: par de nodos sin orden, dentro del lote y frente a las existentes
+        n = len(almacen.id_nodo)
+        claves = np.sort(filas_nodos, axis=1) @ np.array([n, 1])
+        _, primera, repeticiones = np.unique(claves, return_index=True, return_counts=True)
+        if (repeticiones > 1).any():
+            repetidas = np.setdiff1d(np.arange(k), primera)
+            raise ValueError(f"Error: Las barras {repetidas[:10].tolist()} del lote están repetidas.")
+        existentes = np.sort(almacen.conectividad[almacen.filas_barras_activas()], axis=1) @ np.array([n, 1])
+        ya_existen = np.isin(claves, existentes)
+        if ya_existen.any():
+            raise ValueError(f"Error: Las barras {np.flatnonzero(ya_existen)[:10].tolist()} del lote "
+                             "ya existen en el modelo.")
+
+        return almacen.añadir_barras(filas_nodos, E, A, I, q, rho)
+
+    def restringir_nodos(self, ids_nodos, restricciones=(True, True, True)):
+        """
+        Restringe DOFs de varios nodos a la vez (sin liberar los que ya lo estuvieran).
+        Args:
+            ids_nodos (np.ndarray): IDs de los nodos (k,).
+            restricciones (np.ndarray): DOFs a restringir [x, y, giro], común (3,) o por
+                nodo (k, 3), como booleanos.
+        Raises:
+            KeyError: Si algún nodo no existe.
+        """
+        filas = self._filas_de_nodos_existentes(np.atleast_1d(ids_nodos))
+        mascara = np.broadcast_to(np.asarray(restricciones, dtype=bool), (len(filas), 3))
+        self.almacen.restringir_filas(filas, mascara)
+        log.info("Restricciones aplicadas a %s nodos.", len(filas))
+
+    def asignar_cargas_uniformes(self, ids_barras, q):
+        """
+        Asigna la carga uniforme de varias barras a la vez.
+        Args:
+            ids_barras (np.ndarray): IDs de las barras (k,).
+            q (float | np.ndarray): Carga de cada barra, escalar o array (k,).
+        Raises:
+            KeyError: Si alguna barra no existe.
+        """
+        ids_barras = np.atleast_1d(np.asarray(ids_barras, dtype=np.int64))
+        filas = self.almacen.filas_de_barras(ids_barras)
+        if (filas < 0).any():
+            faltan = np.unique(ids_barras[filas < 0])
+            raise KeyError(f"Error: Las barras con ID {faltan[:10].tolist()} no existen.")
+        self.almacen.modificar_barras(filas, q=np.broadcast_to(np.asarray(q, dtype=float), filas.shape))
 
     def get_nodos(self):
         """Devuelve el diccionario de nodos del modelo."""
@@ -210,6 +390,10 @@ class GestorDeModelo:
         """Devuelve el conjunto de DOFs restringidos."""
         return self.restricciones
 
+    def get_desplazamientos_prescritos(self):
+        """Devuelve el diccionario {DOF: desplazamiento impuesto} de los DOFs restringidos con valor no nulo."""
+        return self.desplazamientos_prescritos
+
     def get_dof_map(self):
         """
         Devuelve un mapeo de ID de nodo a su índice base en el vector de DOFs globales.
@@ -217,8 +401,67 @@ class GestorDeModelo:
         Returns:
             dict: {id_nodo: index_en_dofs}
         """
-        sorted_node_ids = sorted(self.nodos.keys())
-        return {idn: i for i, idn in enumerate(sorted_node_ids)}
+        # Los IDs del almacén ya están en orden creciente; el mapa se reconstruye solo cuando
+        # cambia la topología. Para consultas sueltas, indice_dof() es O(1).
+        revision = self.revision_de('topologia')
+        if self._dof_map is None or self._dof_map[0] != revision:
+            ids = self.almacen.ids_nodos().tolist()
+            self._dof_map = (revision, dict(zip(ids, range(len(ids)))))
+        return self._dof_map[1]
+
+    def datos_barras(self, filas=None):
+        """
+        Lee directamente de los arrays del almacén las propiedades y la geometría de las
+        barras, para los cálculos por lotes (ensamblado, esfuerzos, visualización).
+        Args:
+            filas (np.ndarray, optional): Filas del almacén de las barras deseadas; por
+                defecto, todas las barras activas en orden de ID.
+        Returns:
+            dict: 'dofs' (n_barras, 6) con los índices de DOF globales, 'xy' (n_barras, 2, 2)
+                con las coordenadas de sus nodos, y 'E', 'A', 'I', 'q', 'rho', 'L', 'c', 's' como
+                arrays (n_barras,).
+        """
+        almacen = self.almacen
+        if filas is None:
+            filas = almacen.filas_barras_activas()
+        filas_nodos = almacen.conectividad[filas]
+        indices = almacen.indice_dof_de_fila()[filas_nodos]
+        xy = almacen.coords[filas_nodos, :2]
+
+        dofs = (3 * indices[:, [0, 0, 0, 1, 1, 1]] + np.array([0, 1, 2, 0, 1, 2])).astype(np.intp)
+
+        dx = xy[:, 1, 0] - xy[:, 0, 0]
+        dy = xy[:, 1, 1] - xy[:, 0, 1]
+        L = np.sqrt(dx**2 + dy**2)
+        # Misma convención que Barra.obtener_cos_sen para barras de longitud nula
+        L_seguro = np.where(L > 0, L, 1.0)
+        c = np.where(L > 0, dx / L_seguro, 1.0)
+        s = np.where(L > 0, dy / L_seguro, 0.0)
+
+        return {'dofs': dofs, 'xy': xy, 'E': almacen.E[filas], 'A': almacen.A[filas],
+                'I': almacen.I[filas], 'q': almacen.q[filas], 'rho': almacen.rho[filas],
+                'L': L, 'c': c, 's': s}
+
+    def indice_dof(self, id_nodo):
+        """
+        Devuelve el índice del nodo en el vector de DOFs globales en O(1).
+        Raises:
+            KeyError: Si el ID del nodo no existe.
+        """
+        if id_nodo not in self.nodos:
+            raise KeyError(f"Error: El nodo con ID {id_nodo} no existe.")
+        return self.almacen.indice_dof(id_nodo)
+
+    def barras_de_nodo(self, id_nodo):
+        """
+        Devuelve los IDs de las barras que llegan a un nodo, en O(grado del nodo).
+        Raises:
+            KeyError: Si el ID del nodo no existe.
+        """
+        if id_nodo not in self.nodos:
+            raise KeyError(f"Error: El nodo con ID {id_nodo} no existe.")
+        filas = self.almacen.filas_barras_de_nodo(self.almacen.fila_nodo(id_nodo))
+        return self.almacen.id_barra[filas].tolist()
 
     def __repr__(self):
         resumen_nodos = "\n".join(f"  {idn}: {n}" for idn, n in self.nodos.items())
@@ -0,0 +1,143 @@
+# Instrumentacion.py
+import contextlib
+import logging
+import time
+import tracemalloc
+
+import numpy as np
+
+# Los registradores del paquete cuelgan de "porticos": configurándolo se controlan todos
+log = logging.getLogger("porticos.instrumentacion")
+
+
+class RegistroFase:
+    __slots__ = ("nombre", "tiempo", "memoria_pico", "tamaños")
+
+    def __init__(self, nombre, tamaños=None):
+        """
+        Medidas de una ejecución de una fase del cálculo.
+        Args:
+            nombre (str): Nombre de la fase ('ensamblado', 'restricciones', 'factorizacion',
+                'resolucion', 'postproceso').
+            tamaños (dict, optional): Tamaños del problema (n_dof, nnz, condicion...).
+        """
+        self.nombre = nombre
+        self.tiempo = 0.0            # Tiempo de reloj [s]
+        self.memoria_pico = None     # Memoria máxima reservada durante la fase [bytes]
+        self.tamaños = dict(tamaños or {})
+
+    def a_dict(self):
+        return {"nombre": self.nombre, "tiempo": self.tiempo, "memoria_pico": self.memoria_pico,
+                **self.tamaños}
+
+    def __repr__(self):
+        memoria = "" if self.memoria_pico is None else f", memoria_pico={self.memoria_pico / 2**20:.2f} MiB"
+        return f"RegistroFase({self.nombre}: {self.tiempo:.6f} s{memoria}, {self.tamaños})"
+
+
+class Instrumentacion:
+    def __init__(self, callback=None, medir_memoria=True, estimar_condicion=False):
+        """
+        Recoge, por fase del cálculo, el tiempo de reloj, la memoria pico (con tracemalloc)
+        y los tamaños del problema. Cada fase terminada se añade a 'fases', se emite por el
+        registrador 'porticos.instrumentacion' (nivel DEBUG) y se pasa a 'callback'.
+        Las fases pueden anidarse: la memoria pico de una fase incluye la de sus subfases.
+        Args:
+            callback (callable, optional): Función llamada con cada RegistroFase terminado.
+            medir_memoria (bool): Si es True, se mide la memoria pico con tracemalloc (que
+                ralentiza las reservas de memoria mientras está activo).
+            estimar_condicion (bool): Si es True, se estima el número de condición (norma 1)
+                de K_ff en cada factorización; cuesta unas pocas resoluciones y requiere SciPy.
+        """
+        self.callback = callback
+        self.medir_memoria = medir_memoria
+        self.estimar_condicion = estimar_condicion
+        self.fases = []
+        self._pila = []  # [memoria al empezar, pico absoluto] de las fases abiertas
+        self._tracemalloc_propio = False
+
+    @contextlib.contextmanager
+    def medir(self, nombre, **tamaños):
+        """
+        Mide el bloque de código como una fase. Los tamaños pueden completarse dentro del
+        bloque a través del RegistroFase devuelto.
+        """
+        fase = RegistroFase(nombre, tamaños)
+        if self.medir_memoria:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._tracemalloc_propio = True
+            actual, pico = tracemalloc.get_traced_memory()
+            if self._pila:
+                self._pila[-1][1] = max(self._pila[-1][1], pico)
+            tracemalloc.reset_peak()
+            self._pila.append([actual, actual])
+
+        inicio = time.perf_counter()
+        try:
+            yield fase
+        finally:
+            fase.tiempo = time.perf_counter() - inicio
+            if self.medir_memoria:
+                inicio_memoria, pico_abs = self._pila.pop()
+                pico_abs = max(pico_abs, tracemalloc.get_traced_memory()[1])
+                fase.memoria_pico = pico_abs - inicio_memoria
+                if self._pila:
+                    self._pila[-1][1] = max(self._pila[-1][1], pico_abs)
+                elif self._tracemalloc_propio:
+                    tracemalloc.stop()
+                    self._tracemalloc_propio = False
+            self.fases.append(fase)
+            log.debug("%r", fase)
+            if self.callback is not None:
+                self.callback(fase)
+
+    def resumen(self):
+        """
+        Agrega las fases registradas por nombre.
+        Returns:
+            dict: {nombre: {'llamadas', 'tiempo_total', 'memoria_pico'}} en orden de aparición.
+        """
+        resumen = {}
+        for fase in self.fases:
+            r = resumen.setdefault(fase.nombre, {"llamadas": 0, "tiempo_total": 0.0, "memoria_pico": None})
+            r["llamadas"] += 1
+            r["tiempo_total"] += fase.tiempo
+            if fase.memoria_pico is not None:
+                r["memoria_pico"] = max(r["memoria_pico"] or 0, fase.memoria_pico)
+        return resumen
+
+    def a_lista(self):
+        """Devuelve las fases registradas como una lista de diccionarios (p. ej. para JSON)."""
+        return [fase.a_dict() for fase in self.fases]
+
+    def reiniciar(self):
+        self.fases = []
+
+    def __repr__(self):
+        return f"Instrumentacion({len(self.fases)} fases registradas)"
+
+
+def estimar_condicion(K_ff, factorizacion):
+    """
+    Estima el número de condición en norma 1, ||K_ff||_1 · ||K_ff⁻¹||_1, sin invertir la
+    matriz: ||K_ff⁻¹||_1 se estima (Higham) con unas pocas resoluciones con la
+    factorización ya calculada.
+    Args:
+        K_ff (np.ndarray | scipy.sparse matrix): Matriz reducida simétrica.
+        factorizacion (FactorizacionRigidez): Su factorización.
+    Returns:
+        float | None: Estimación del número de condición, o None sin SciPy.
+    """
+    try:
+        from scipy.sparse.linalg import LinearOperator, onenormest
+    except ImportError:
+        return None
+    n = K_ff.shape[0]
+    if n == 0:
+        return 0.0
+    norma = np.abs(K_ff).sum(axis=0).max()
+    # K_ff es simétrica, así que su inversa también: rmatvec = matvec
+    inversa = LinearOperator((n, n), matvec=factorizacion.resolver, rmatvec=factorizacion.resolver,
+                             matmat=factorizacion.resolver, dtype=float)
+    return float(norma * onenormest(inversa))
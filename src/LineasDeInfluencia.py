@@ -0,0 +1,175 @@
+# LineasDeInfluencia.py
+import numpy as np
+
+COMPONENTES_DESPLAZAMIENTO = {'ux': 0, 'uy': 1, 'rz': 2}
+COMPONENTES_REACCION = {'rx': 0, 'ry': 1, 'mz': 2}
+
+
+def _posiciones_camino(datos, filas, npts):
+    """
+    Posiciones de carga a lo largo de un camino de barras: fila de la barra, posición
+    relativa xi = a/L en su eje local y abscisa s acumulada a lo largo del camino. Cada
+    barra se recorre en el sentido que la une con la anterior; el nudo compartido por dos
+    barras consecutivas aparece una sola vez.
+    """
+    nodos = datos['dofs'][filas][:, [0, 3]] // 3
+    invertida = np.zeros(len(filas), dtype=bool)
+    if len(filas) > 1:
+        # Sentido de cada barra según el nudo que comparte con la anterior
+        invertida[0] = nodos[0, 0] in nodos[1]
+        for k in range(1, len(filas)):
+            final_previo = nodos[k - 1, 0] if invertida[k - 1] else nodos[k - 1, 1]
+            invertida[k] = nodos[k, 1] == final_previo
+
+    xi = np.linspace(0.0, 1.0, npts)
+    filas_pos, xi_pos, s_pos = [], [], []
+    s0 = 0.0
+    for k, (fila, inv) in enumerate(zip(filas, invertida)):
+        tramo = xi if k == 0 else xi[1:]
+        L = datos['L'][fila]
+        filas_pos.append(np.full(len(tramo), fila))
+        xi_pos.append(1.0 - tramo if inv else tramo)
+        s_pos.append(s0 + tramo * L)
+        s0 += L
+    return np.concatenate(filas_pos), np.concatenate(xi_pos), np.concatenate(s_pos)
+
+
+def linea_de_influencia(portico, camino, respuestas, npts=21, direccion=(0.0, -1.0), formato="densa"):
+    """
+    Líneas de influencia de varias respuestas para una carga puntual unidad que recorre
+    un camino de barras. Por el teorema de reciprocidad, cada respuesta r = gᵀu + hᵀf se
+    obtiene resolviendo una sola vez K_ff w = g_f (todas las respuestas a la vez, con la
+    factorización cacheada del pórtico); su valor para la carga en cualquier posición es
+    entonces el producto de w por las fuerzas nodales equivalentes de esa posición, sin
+    resolver un sistema por posición.
+    Los esfuerzos siguen el convenio de CalculadoraPorticoBarra.esfuerzos_internos_lote:
+    con la carga dentro de la barra de la respuesta se añade el término de la carga puntual
+    (N = Fx1 - Px·H(x-a), V = Fy1 - Py·H(x-a), M = Fy1·x - Py·<x-a>), cuya integral para
+    una carga uniforme coincide con la de ese método. No incluye desplazamientos prescritos.
+    Args:
+        portico (Portico): Pórtico con apoyos suficientes.
+        camino (list): IDs de las barras recorridas por la carga, en orden.
+        respuestas (list): Tuplas ('desplazamiento', id_nodo, 'ux'|'uy'|'rz'),
+            ('reaccion', id_nodo, 'rx'|'ry'|'mz') o ('N'|'V'|'M', id_barra, x/L).
+        npts (int): Posiciones de carga por barra (incluidos sus extremos).
+        direccion (tuple): Componentes globales (x, y) de la carga unidad.
+        formato (str): 'densa' o 'csr', como en Portico.factorizar.
+    Returns:
+        dict: 's' abscisa de cada posición a lo largo del camino (n_pos,), 'barras' y 'xi'
+            con la barra cargada y la posición relativa en ella, y 'valores' (n_resp, n_pos).
+    Raises:
+        KeyError: Si una barra o un nodo no existe.
+        ValueError: Si una respuesta no es válida (p. ej. la reacción de un DOF libre).
+        np.linalg.LinAlgError: Si K_ff es singular.
+    """
+    factorizacion = portico.factorizar(formato)
+    d = portico.datos_barras()
+    almacen = portico.gestor_modelo.almacen
+    dof_map = portico.gestor_modelo.get_dof_map()
+    n_dof = 3 * len(dof_map)
+
+    def dof_de(id_nodo, k):
+        if id_nodo not in dof_map:
+            raise KeyError(f"Error: El nodo con ID {id_nodo} no existe.")
+        return 3 * dof_map[id_nodo] + k
+
+    # g: respuesta en función de u; h: en función de las fuerzas nodales aplicadas
+    G = np.zeros((n_dof, len(respuestas)))
+    H = np.zeros((n_dof, len(respuestas)))
+    internas = []  # (índice de respuesta, tipo, fila de barra, xi)
+    restringido = almacen.dofs_restringidos()
+    K = None
+    for j, (tipo, id_elemento, componente) in enumerate(respuestas):
+        if tipo == 'desplazamiento':
+            G[dof_de(id_elemento, COMPONENTES_DESPLAZAMIENTO[componente]), j] = 1.0
+        elif tipo == 'reaccion':
+            dof = dof_de(id_elemento, COMPONENTES_REACCION[componente])
+            if not restringido[dof]:
+                raise ValueError(f"Error: El DOF {componente} del nodo {id_elemento} no está restringido.")
+            K = portico.matriz_rigidez_global(formato) if K is None else K
+            fila_K = K[dof]
+            G[:, j] = fila_K if isinstance(K, np.ndarray) else fila_K.toarray().ravel()
+            H[dof, j] = -1.0
+        elif tipo in ('N', 'V', 'M'):
+            fila = portico.filas_barras(id_elemento)[0]
+            # Coeficientes de la respuesta respecto a los 6 DOFs globales de la barra, con el
+            # mismo núcleo que los esfuerzos internos (un caso unidad por DOF)
+            esfuerzos = portico.calculadora_barra.esfuerzos_internos_lote(
+                np.eye(6), np.arange(6)[None], d['E'][[fila]], d['A'][[fila]], d['I'][[fila]],
+                d['L'][[fila]], d['c'][[fila]], d['s'][[fila]], np.zeros(1), estaciones=[componente])
+            np.add.at(G[:, j], d['dofs'][fila], esfuerzos[{'N': 1, 'V': 2, 'M': 3}[tipo]][:, 0, 0])
+            internas.append((j, tipo, fila, float(componente)))
+        else:
+            raise ValueError(f"Error: Tipo de respuesta '{tipo}' no válido.")
+
+    # Reciprocidad: w = K⁻¹ g (u_r = 0 en los DOFs restringidos)
+    libres, _ = portico.particionar_dofs()
+    W = H.copy()
+    W[libres] += factorizacion.resolver(G[libres])
+
+    # Fuerzas nodales equivalentes de la carga unidad en cada posición (funciones de Hermite)
+    filas, xi, s = _posiciones_camino(d, portico.filas_barras(camino), npts)
+    c, sn, L = d['c'][filas], d['s'][filas], d['L'][filas]
+    dx, dy = direccion
+    Px, Py = c * dx + sn * dy, -sn * dx + c * dy
+    Fx1, Fx2 = Px * (1 - xi), Px * xi
+    Fy1 = Py * (1 - 3 * xi**2 + 2 * xi**3)
+    Fy2 = Py * (3 * xi**2 - 2 * xi**3)
+    M1 = Py * L * xi * (1 - xi)**2
+    M2 = -Py * L * xi**2 * (1 - xi)
+    f_global = np.stack([c * Fx1 - sn * Fy1, sn * Fx1 + c * Fy1, M1,
+                         c * Fx2 - sn * Fy2, sn * Fx2 + c * Fy2, M2], axis=-1)
+    valores = np.einsum('pk,pkr->rp', f_global, W[d['dofs'][filas]])
+
+    # Término de la carga puntual dentro de la barra de cada esfuerzo pedido
+    for j, tipo, fila, xi_r in internas:
+        en_barra = filas == fila
+        x, a = xi_r * d['L'][fila], xi[en_barra] * d['L'][fila]
+        pasada = x > a
+        if tipo == 'N':
+            valores[j, en_barra] += Fx1[en_barra] - Px[en_barra] * pasada
+        elif tipo == 'V':
+            valores[j, en_barra] += Fy1[en_barra] - Py[en_barra] * pasada
+        else:
+            valores[j, en_barra] += Fy1[en_barra] * x - Py[en_barra] * np.maximum(x - a, 0.0)
+
+    return {'s': s, 'barras': d['ids'][filas], 'xi': xi, 'valores': valores}
+
+
+def cargas_moviles(linea, cargas, separaciones, paso=None):
+    """
+    Respuesta a un tren de cargas que recorre el camino de una línea de influencia,
+    evaluada para todas las posiciones del tren y todas las respuestas a la vez por
+    interpolación lineal de las líneas de influencia.
+    Args:
+        linea (dict): Resultado de linea_de_influencia.
+        cargas (np.ndarray): Valor de cada carga del tren (n_ejes,), en unidades de la
+            carga unidad de la línea (positivo en el sentido de 'direccion').
+        separaciones (np.ndarray): Distancia de cada carga a la cabeza del tren (n_ejes,),
+            medida hacia atrás a lo largo del camino (la primera suele ser 0).
+        paso (float, optional): Paso de avance de la cabeza; por defecto, el de la línea.
+    Returns:
+        dict: 's' posición de la cabeza (n_s,), 'valores' (n_resp, n_s), y 'max', 'min',
+            's_max', 's_min' por respuesta. Las cargas fuera del camino no contribuyen.
+    """
+    s_linea, valores_linea = linea['s'], linea['valores']
+    cargas = np.asarray(cargas, dtype=float)
+    separaciones = np.asarray(separaciones, dtype=float)
+    longitud = s_linea[-1]
+    if paso is None:
+        cabeza = np.union1d(s_linea, s_linea[:, None] + separaciones[None, :])
+        cabeza = cabeza[cabeza <= longitud + separaciones.max()]
+    else:
+        cabeza = np.arange(0.0, longitud + separaciones.max() + paso / 2, paso)
+
+    posiciones = cabeza[:, None] - separaciones[None, :]  # (n_s, n_ejes)
+    # Una carga en un extremo del camino cuenta aunque el redondeo la deje justo fuera
+    tolerancia = 1e-9 * longitud
+    posiciones = np.where(np.abs(posiciones) <= tolerancia, 0.0, posiciones)
+    posiciones = np.where(np.abs(posiciones - longitud) <= tolerancia, longitud, posiciones)
+    valores = np.stack([
+        np.interp(posiciones, s_linea, fila, left=0.0, right=0.0) @ cargas for fila in valores_linea])
+    k_max, k_min = np.argmax(valores, axis=1), np.argmin(valores, axis=1)
+    return {'s': cabeza, 'valores': valores,
+            'max': valores.max(axis=1), 'min': valores.min(axis=1),
+            's_max': cabeza[k_max], 's_min': cabeza[k_min]}
@@ -1,118 +1,727 @@
 # Portico.py (Actualizado para usar VisualizadorPortico)
+import contextlib
+import logging
+
 import numpy as np
 import math
-import matplotlib.pyplot as plt # Ya no lo necesita directamente para graficar, pero lo dejo por si acaso
 
 from GestorDeModelo import GestorDeModelo
 from CalculadoraPorticoBarra import CalculadoraPorticoBarra
-from VisualizadorPortico import VisualizadorPortico # ¡Importar la nueva clase!
+from Factorizacion import FactorizacionRigidez
+from Instrumentacion import Instrumentacion, estimar_condicion
+from Renumeracion import permutacion_rcm, permutacion_dofs, ancho_banda_y_perfil
+# La capa de visualización (VisualizadorPortico, matplotlib) se importa solo al usarla por
+# primera vez: un Portico que solo calcula no depende más que de NumPy (y de SciPy en los
+# formatos que la usan), lo que abarata el arranque de procesos de cálculo de corta vida.
+
+log = logging.getLogger("porticos.calculo")
 
 
 class Portico:
     def __init__(self):
         self.gestor_modelo = GestorDeModelo()
         self.calculadora_barra = CalculadoraPorticoBarra()
-        # ¡Nueva instancia del visualizador!
-        self.visualizador = VisualizadorPortico(self.gestor_modelo, self.calculadora_barra)
-
-    def matriz_rigidez_global(self):
-        nodos = self.gestor_modelo.get_nodos()
-        barras = self.gestor_modelo.get_barras()
-        id_to_index = self.gestor_modelo.get_dof_map()
-
-        n_nodos = len(nodos)
-        n_dof = 3 * n_nodos
-        K = np.zeros((n_dof, n_dof))
-
-        for id_barra, barra in barras.items():
-            id1 = barra.nodo1.id
-            id2 = barra.nodo2.id
-
-            i1 = id_to_index[id1]
-            i2 = id_to_index[id2]
-
-            dofs = [3*i1, 3*i1+1, 3*i1+2, 3*i2, 3*i2+1, 3*i2+2]
-
-            k_global_barra = self.calculadora_barra.rigidez_local_global(barra)
-
-            for i in range(6):
-                for j in range(6):
-                    K[dofs[i], dofs[j]] += k_global_barra[i, j]
-
+        self._visualizador = None  # se crea al primer uso (ver la propiedad 'visualizador')
+        # Ensamblado cacheado (mapa de DOFs, datos y matrices por barra, K, f_eq), sincronizado
+        # con la revisión del modelo: solo se recalculan las barras modificadas desde entonces.
+        self._ensamblado = None
+        # Sistema reducido factorizado, válido mientras no cambie la rigidez ni las restricciones
+        self._sistema = None
+        # Si es True, el sistema reducido se renumera con Cuthill-McKee inversa antes de
+        # factorizar (los resultados se devuelven siempre en la numeración original).
+        self.renumerar = False
+        # Instrumentación opcional por fases (ver activar_instrumentacion); None = desactivada
+        self.instrumentacion = None
+
+    @property
+    def visualizador(self):
+        """VisualizadorPortico del pórtico; matplotlib se importa la primera vez que se pide."""
+        if self._visualizador is None:
+            from VisualizadorPortico import VisualizadorPortico
+            self._visualizador = VisualizadorPortico(self.gestor_modelo, self.calculadora_barra)
+        return self._visualizador
+
+    def activar_instrumentacion(self, callback=None, medir_memoria=True, estimar_condicion=False):
+        """
+        Activa la medida, por fase del cálculo ('ensamblado', 'restricciones',
+        'factorizacion', 'resolucion', 'postproceso', 'reacciones'), del tiempo de reloj,
+        la memoria pico y los tamaños (n_dof, nnz, n_libres, condición estimada de K_ff...).
+        Args:
+            callback (callable, optional): Se llama con cada RegistroFase terminado.
+            medir_memoria (bool): Medir la memoria pico con tracemalloc.
+            estimar_condicion (bool): Estimar la condición de K_ff al factorizar.
+        Returns:
+            Instrumentacion: Objeto con las fases registradas (fases, resumen(), a_lista()).
+        """
+        self.instrumentacion = Instrumentacion(callback, medir_memoria, estimar_condicion)
+        return self.instrumentacion
+
+    def desactivar_instrumentacion(self):
+        """Desactiva la instrumentación y devuelve el objeto con lo registrado hasta ahora."""
+        instrumentacion, self.instrumentacion = self.instrumentacion, None
+        return instrumentacion
+
+    def _fase(self, nombre, **tamaños):
+        """Contexto de medida de una fase; no hace nada si la instrumentación está desactivada."""
+        if self.instrumentacion is None:
+            return contextlib.nullcontext()
+        return self.instrumentacion.medir(nombre, **tamaños)
+
+    def _datos_barras(self, filas):
+        """Datos de las barras de las filas 'filas' del almacén (ver GestorDeModelo.datos_barras)."""
+        return self.gestor_modelo.datos_barras(filas)
+
+    def _calcular_barras(self, datos):
+        """Evalúa los núcleos por lotes: matrices de rigidez y fuerzas equivalentes globales."""
+        k_barras = self.calculadora_barra.rigidez_global_lote(
+            datos['E'], datos['A'], datos['I'], datos['L'], datos['c'], datos['s'])
+        feq_barras = self.calculadora_barra.fuerzas_equivalentes_globales_lote(
+            datos['q'], datos['L'], datos['c'], datos['s'])
+        return k_barras, feq_barras
+
+    def _actualizar_ensamblado(self):
+        """
+        Sincroniza el ensamblado cacheado con el modelo y lo devuelve.
+        - Cambio de topología (nodos o barras añadidos/borrados, conectividad): se rehace todo.
+        - Cambio de propiedades o cargas de algunas barras: solo se recalculan esas barras,
+          su variación de rigidez se suma directamente en K (y en la factorización cacheada)
+          y f_eq se vuelve a dispersar.
+        - Cambio de restricciones: el ensamblado sigue siendo válido.
+        - Cambio de densidades o secciones: se descartan las matrices de masa ensambladas.
+        """
+        gestor = self.gestor_modelo
+        revision = gestor.get_revision()
+        e = self._ensamblado
+        if e is not None and e['revision'] == revision:
+            return e
+
+        if e is None or gestor.revision_de('topologia') > e['revision']:
+            filas_almacen = gestor.almacen.filas_barras_activas()
+            datos = self._datos_barras(filas_almacen)
+            k_barras, feq_barras = self._calcular_barras(datos)
+            e = {
+                'n_dof': 3 * gestor.almacen.n_nodos(), 'filas_almacen': filas_almacen,
+                'datos': datos, 'k_barras': k_barras, 'feq_barras': feq_barras,
+                'K': {}, 'M': {}, 'f_eq': None,
+            }
+        else:
+            modificadas = gestor.almacen.filas_barras_modificadas(e['revision'])
+            if len(modificadas):
+                # Sin cambios de topología, la posición de cada barra en el ensamblado no varía
+                filas = np.searchsorted(e['filas_almacen'], modificadas)
+                nuevos = self._datos_barras(modificadas)
+                for clave, valores in nuevos.items():
+                    e['datos'][clave][filas] = valores
+                k_previas = e['k_barras'][filas]
+                e['k_barras'][filas], e['feq_barras'][filas] = self._calcular_barras(nuevos)
+                if gestor.revision_de('propiedades') > e['revision']:
+                    self._actualizar_rigidez(e, filas, e['k_barras'][filas] - k_previas)
+                if max(gestor.revision_de('propiedades'), gestor.revision_de('masas')) > e['revision']:
+                    e['M'] = {}
+                e['f_eq'] = None
+
+        e['revision'] = revision
+        self._ensamblado = e
+        return e
+
+    def _actualizar_rigidez(self, e, filas, delta):
+        """
+        Suma en las K cacheadas la variación de rigidez (k_nueva - k_anterior) de las barras
+        'filas' y corrige la factorización cacheada con una actualización de bajo rango
+        (Woodbury) en lugar de refactorizar. Si la corrección no es posible (rango excesivo
+        o cambios de topología/restricciones pendientes), la factorización se descarta.
+        """
+        dofs = e['datos']['dofs'][filas]
+        if 'densa' in e['K']:
+            np.add.at(e['K']['densa'], (dofs[:, :, None], dofs[:, None, :]), delta)
+        if 'csr' in e['K']:
+            np.add.at(e['K']['csr'].data, e['posicion_csr'][filas].ravel(), delta.ravel())
+
+        sistema = self._sistema
+        if sistema is None:
+            return
+        gestor = self.gestor_modelo
+        vigente = max(gestor.revision_de('topologia'), gestor.revision_de('restricciones')) <= sistema['revision']
+        if not (vigente and sistema['formato'] in e['K']
+                and sistema['factorizacion'].actualizar(sistema['pos_libre'][dofs], delta)):
+            self._sistema = None
+            return
+
+        K = e['K'][sistema['formato']]
+        libres, restringidos = sistema['libres'], sistema['restringidos']
+        if isinstance(K, np.ndarray):
+            sistema['K_fr'] = K[np.ix_(libres, restringidos)]
+        else:
+            sistema['K_fr'] = K[libres][:, restringidos]
+        sistema['revision'] = gestor.revision_rigidez()
+
+    def matriz_rigidez_global(self, formato="densa"):
+        """
+        Ensambla la matriz de rigidez global del pórtico.
+        Las contribuciones de todas las barras se acumulan en una sola pasada vectorizada
+        a partir de tripletes COO (fila, columna, valor). La matriz se cachea hasta el
+        siguiente cambio de rigidez del modelo, por lo que no debe modificarse in situ.
+        Args:
+            formato (str): 'densa' para un np.ndarray (n_dof, n_dof) o 'csr' para una
+                scipy.sparse.csr_matrix (requiere SciPy).
+        Returns:
+            np.ndarray | scipy.sparse.csr_matrix: Matriz de rigidez global.
+        Raises:
+            ValueError: Si el formato no es válido.
+        """
+        if formato not in ("densa", "csr"):
+            raise ValueError("Formato no válido. Use 'densa' o 'csr'.")
+
+        e = self._actualizar_ensamblado()
+        if formato in e['K']:
+            return e['K'][formato]
+
+        n_dof = e['n_dof']
+        dofs = e['datos']['dofs']
+        with self._fase("ensamblado", formato=formato, n_dof=n_dof, n_barras=len(dofs)) as fase:
+            K = self._ensamblar(e, formato)
+            if fase is not None:
+                fase.tamaños['nnz'] = K.nnz if formato == "csr" else int(np.count_nonzero(K))
+
+        e['K'][formato] = K
         return K
 
-    def vector_fuerzas_equivalentes(self):
-        nodos = self.gestor_modelo.get_nodos()
-        barras = self.gestor_modelo.get_barras()
-        id_to_index = self.gestor_modelo.get_dof_map()
-
-        n_nodos = len(nodos)
-        f_eq = np.zeros(3 * n_nodos)
-
-        for barra in barras.values():
-            feq = self.calculadora_barra.fuerzas_equivalentes_globales(barra)
-
-            id1 = barra.nodo1.id
-            id2 = barra.nodo2.id
-
-            i1 = id_to_index[id1]
-            i2 = id_to_index[id2]
+    def _ensamblar(self, e, formato, matrices=None):
+        """
+        Ensambla K a partir de las matrices de barra cacheadas (ver matriz_rigidez_global),
+        u otra matriz global a partir de las matrices de barra (n_barras, 6, 6) dadas.
+        """
+        n_dof = e['n_dof']
+        dofs = e['datos']['dofs']
+
+        # Tripletes COO: cada barra aporta un bloque 6x6
+        filas = np.repeat(dofs, 6, axis=1).ravel()
+        columnas = np.tile(dofs, (1, 6)).ravel()
+        valores = (e['k_barras'] if matrices is None else matrices).ravel()
+
+        if formato == "csr":
+            from scipy.sparse import csr_matrix
+            K_csr = e['K'].get('csr')
+            if matrices is not None and K_csr is not None:
+                # Mismo patrón que K: basta sumar cada triplete en su posición de K.data
+                datos_csr = np.bincount(e['posicion_csr'].ravel(), weights=valores, minlength=K_csr.nnz)
+                return csr_matrix((datos_csr, K_csr.indices, K_csr.indptr), shape=K_csr.shape)
+            # Conversión COO → CSR sumando las entradas duplicadas de nodos compartidos.
+            # Se guarda la posición en K.data de cada triplete para poder actualizar después
+            # la aportación de una barra in situ (ver _actualizar_rigidez).
+            claves, posicion = np.unique(filas * n_dof + columnas, return_inverse=True)
+            datos_csr = np.bincount(posicion, weights=valores, minlength=len(claves))
+            indptr = np.zeros(n_dof + 1, dtype=np.intp)
+            np.cumsum(np.bincount(claves // n_dof, minlength=n_dof), out=indptr[1:])
+            K = csr_matrix((datos_csr, claves % n_dof, indptr), shape=(n_dof, n_dof))
+            if matrices is None:
+                e['posicion_csr'] = posicion.reshape(-1, 36)
+        else:
+            K = np.bincount(filas * n_dof + columnas, weights=valores, minlength=n_dof * n_dof)
+            K = K.reshape(n_dof, n_dof)
+        return K
 
-            dofs = [3*i1, 3*i1+1, 3*i1+2, 3*i2, 3*i2+1, 3*i2+2]
-            for i, dof in enumerate(dofs):
-                f_eq[dof] += feq[i]
+    def matriz_masa_global(self, formato="csr", concentrada=False):
+        """
+        Ensambla la matriz de masa global con el mismo patrón que K, a partir de la
+        densidad (rho) y el área de las barras. Se cachea hasta el siguiente cambio de
+        topología, secciones o densidades, por lo que no debe modificarse in situ.
+        Args:
+            formato (str): 'csr' (scipy.sparse.csr_matrix) o 'densa'.
+            concentrada (bool): Masa concentrada en los nudos en lugar de consistente.
+        Returns:
+            scipy.sparse.csr_matrix | np.ndarray: Matriz de masa global (n_dof, n_dof).
+        Raises:
+            ValueError: Si el formato no es válido.
+        """
+        if formato not in ("densa", "csr"):
+            raise ValueError("Formato no válido. Use 'densa' o 'csr'.")
+        e = self._actualizar_ensamblado()
+        clave = (formato, concentrada)
+        if clave not in e['M']:
+            d = e['datos']
+            m_barras = self.calculadora_barra.masa_global_lote(d['rho'], d['A'], d['L'], d['c'], d['s'],
+                                                               concentrada)
+            with self._fase("ensamblado", matriz="masa", formato=formato, n_dof=e['n_dof']):
+                e['M'][clave] = self._ensamblar(e, formato, m_barras)
+        return e['M'][clave]
 
-        return f_eq
+    def vector_fuerzas_equivalentes(self):
+        e = self._actualizar_ensamblado()
+        if e['f_eq'] is None:
+            # Suma por dispersión de las fuerzas de todas las barras en una sola pasada
+            e['f_eq'] = np.bincount(e['datos']['dofs'].ravel(), weights=e['feq_barras'].ravel(),
+                                    minlength=e['n_dof'])
+        return e['f_eq'].copy()
+
+    def esfuerzos_internos(self, u_global, npts=50, solo_extremos=False, estaciones=None):
+        """
+        Esfuerzos internos N, V y M de todas las barras del modelo en una sola pasada.
+        Las filas siguen el orden de gestor_modelo.get_barras() (IDs crecientes).
+        Args:
+            u_global (np.ndarray): Desplazamientos (n_dof,) o (n_dof, n_casos), p. ej. de
+                analizar() o resolver_casos().
+            npts (int): Número de puntos por barra.
+            solo_extremos (bool): Evaluar solo en los extremos y en el extremo relativo de M.
+            estaciones (np.ndarray, optional): Posiciones relativas x/L en lugar de npts.
+        Returns:
+            tuple: (x, N, V, M), ver CalculadoraPorticoBarra.esfuerzos_internos_lote.
+        """
+        d = self._actualizar_ensamblado()['datos']
+        with self._fase("postproceso", n_barras=len(d['dofs']), npts=3 if solo_extremos else npts):
+            return self.calculadora_barra.esfuerzos_internos_lote(
+                u_global, d['dofs'], d['E'], d['A'], d['I'], d['L'], d['c'], d['s'], d['q'],
+                npts=npts, solo_extremos=solo_extremos, estaciones=estaciones)
+
+    def esfuerzos_por_bloques(self, U, barras=None, npts=11, estaciones=None, memoria_bloque=64 * 2**20):
+        """
+        Generador de esfuerzos internos por bloques de barras, con memoria acotada sea cual
+        sea el tamaño del modelo: en cada paso solo se leen de U las filas de los DOFs del
+        bloque (U puede ser un np.memmap, p. ej. de ArchivoModelo.cargar_resultados).
+        Args:
+            U (np.ndarray): Desplazamientos (n_dof,) o (n_dof, n_casos).
+            barras (np.ndarray, optional): IDs de las barras a evaluar; por defecto, todas.
+            npts (int): Número de estaciones equiespaciadas por barra.
+            estaciones (np.ndarray, optional): Posiciones relativas x/L en lugar de npts.
+            memoria_bloque (int): Memoria aproximada [bytes] de los resultados de cada bloque.
+        Yields:
+            dict: 'ids_barras' (b,) y 'x', 'N', 'V', 'M' con forma (b, npts) para un caso o
+                (n_casos, b, npts) para varios.
+        Raises:
+            KeyError: Si alguna barra pedida no existe.
+        """
+        d = self.datos_barras()
+        ids = d['ids']
+        filas = np.arange(len(ids)) if barras is None else self.filas_barras(barras)
+
+        n_casos = U.shape[1] if U.ndim == 2 else 1
+        n_estaciones = npts if estaciones is None else len(estaciones)
+        # x, N, V, M por barra y caso, más los desplazamientos de sus extremos
+        bytes_barra = 8 * n_casos * (4 * n_estaciones + 6)
+        tamaño = max(1, int(memoria_bloque // bytes_barra))
+        for inicio in range(0, len(filas), tamaño):
+            f = filas[inicio:inicio + tamaño]
+            dofs = d['dofs'][f]
+            # Se leen solo las filas de U del bloque y se renumeran localmente
+            dofs_bloque, dofs_locales = np.unique(dofs, return_inverse=True)
+            x, N, V, M = self.calculadora_barra.esfuerzos_internos_lote(
+                np.asarray(U[dofs_bloque]), dofs_locales.reshape(dofs.shape), d['E'][f], d['A'][f], d['I'][f],
+                d['L'][f], d['c'][f], d['s'][f], d['q'][f], npts=npts, estaciones=estaciones)
+            yield {'ids_barras': ids[f], 'x': x, 'N': N, 'V': V, 'M': M}
 
     def aplicar_restricciones(self, K, f=None):
         restricciones = self.gestor_modelo.get_restricciones()
-        K_mod = K.copy()
         n = K.shape[0]
+        with self._fase("restricciones", metodo="anulacion", n_dof=n, n_restringidos=len(restricciones)):
+            K_mod = K.copy()
 
-        if f is None:
-            f = np.zeros(n)
+            if f is None:
+                f = np.zeros(n)
 
-        f_mod = f.copy()
+            f_mod = f.copy()
 
-        for dof in sorted(list(restricciones)):
-            K_mod[dof, :] = 0
-            K_mod[:, dof] = 0
-            K_mod[dof, dof] = 1
-            f_mod[dof] = 0
+            for dof in sorted(list(restricciones)):
+                K_mod[dof, :] = 0
+                K_mod[:, dof] = 0
+                K_mod[dof, dof] = 1
+                f_mod[dof] = 0
 
         return K_mod, f_mod
 
-    def analizar(self, fuerzas_nodales_aplicadas=None):
-        K_global = self.matriz_rigidez_global()
+    def particionar_dofs(self, n_dof=None):
+        """
+        Separa los DOFs globales en libres y restringidos.
+        Args:
+            n_dof (int, optional): Número total de DOFs. Por defecto 3 por nodo.
+        Returns:
+            tuple: (libres, restringidos) como arrays de índices ordenados.
+        """
+        restringido = self.gestor_modelo.almacen.dofs_restringidos()
+        if n_dof is not None and n_dof != len(restringido):
+            raise ValueError("El número de DOFs no coincide con el modelo.")
+        return np.flatnonzero(~restringido), np.flatnonzero(restringido)
+
+    def _sistema_reducido(self, K):
+        """
+        Extrae los bloques K_ff y K_fr de K (sin copiar K entera) y el vector de
+        desplazamientos con los valores prescritos ya colocados en los DOFs restringidos.
+        """
+        n_dof = K.shape[0]
+        libres, restringidos = self.particionar_dofs(n_dof)
+
+        u_prescrito = self.gestor_modelo.almacen.desplazamientos_prescritos()
+
+        with self._fase("restricciones", metodo="reducido", n_dof=n_dof, n_libres=len(libres),
+                        n_restringidos=len(restringidos)):
+            if isinstance(K, np.ndarray):
+                K_ff = K[np.ix_(libres, libres)]
+                K_fr = K[np.ix_(libres, restringidos)]
+            else:
+                K_f = K[libres]
+                K_ff = K_f[:, libres]
+                K_fr = K_f[:, restringidos]
+        return K_ff, K_fr, libres, restringidos, u_prescrito
+
+    def resolver_reducido(self, K, f):
+        """
+        Resuelve K u = f eliminando los DOFs restringidos: solo se factoriza K_ff y los
+        desplazamientos prescritos u_r entran en el término independiente como f_f - K_fr u_r.
+        K no se copia ni se modifica.
+        Args:
+            K (np.ndarray | scipy.sparse.csr_matrix): Matriz de rigidez global sin restringir.
+            f (np.ndarray): Vector de fuerzas global (n_dof,).
+        Returns:
+            np.ndarray: Vector de desplazamientos globales u_global (n_dof,).
+        Raises:
+            np.linalg.LinAlgError: Si K_ff es singular.
+        """
+        K_ff, K_fr, libres, restringidos, u_global = self._sistema_reducido(K)
+        f_f = f[libres] - K_fr @ u_global[restringidos]
+        u_global[libres] = FactorizacionRigidez(K_ff).resolver(f_f)
+        return u_global
+
+    def sistema_reducido(self, F=None, incluir_cargas_barras=True, formato="densa"):
+        """
+        Sistema reducido a los DOFs libres, K_ff u_f = F_f, con el ensamblado sincronizado
+        con el modelo. F_f = F_f - K_fr u_r incluye ya los desplazamientos prescritos. Las
+        matrices salen de las cacheadas y no deben modificarse in situ.
+        Args:
+            F (np.ndarray, optional): Fuerzas nodales globales (n_dof,) o (n_dof, n_casos).
+            incluir_cargas_barras (bool): Sumar las fuerzas equivalentes de las cargas de barra.
+            formato (str): 'densa' o 'csr', como en matriz_rigidez_global.
+        Returns:
+            dict: 'K_ff', 'K_fr', 'F_f' (con las filas de F en los DOFs libres), 'libres',
+                'restringidos', 'u_prescrito' (n_dof,) y 'pos_libre' (n_dof,) con la posición
+                de cada DOF en K_ff (-1 si está restringido).
+        Raises:
+            ValueError: Si F no tiene n_dof filas.
+        """
+        K = self.matriz_rigidez_global(formato)
+        K_ff, K_fr, libres, restringidos, u_prescrito = self._sistema_reducido(K)
+        n_dof = K.shape[0]
+        F = np.zeros(n_dof) if F is None else np.asarray(F, dtype=float)
+        if F.shape[0] != n_dof:
+            raise ValueError("La matriz de fuerzas debe tener tantas filas como DOFs globales.")
+        F_f = F[libres]
+        if incluir_cargas_barras:
+            F_f = (F_f.T + self.vector_fuerzas_equivalentes()[libres]).T
+        F_f = (F_f.T - K_fr @ u_prescrito[restringidos]).T
+        pos_libre = np.full(n_dof, -1, dtype=np.intp)
+        pos_libre[libres] = np.arange(len(libres))
+        return {'K_ff': K_ff, 'K_fr': K_fr, 'F_f': F_f, 'libres': libres, 'restringidos': restringidos,
+                'u_prescrito': u_prescrito, 'pos_libre': pos_libre}
+
+    def datos_barras(self, ids_barras=None):
+        """
+        Datos de las barras tal como se ensamblan (ver GestorDeModelo.datos_barras), con el
+        ensamblado sincronizado con el modelo: 'ids', 'dofs' (n, 6), 'xy', 'E', 'A', 'I',
+        'q', 'rho', 'L', 'c' y 's', una fila por barra en orden de ID. Sin ids_barras, los
+        arrays son los cacheados y no deben modificarse in situ.
+        Args:
+            ids_barras (np.ndarray, optional): IDs de las barras, en el orden deseado.
+        Returns:
+            dict: Arrays de datos de las barras.
+        Raises:
+            KeyError: Si alguna barra no existe.
+        """
+        e = self._actualizar_ensamblado()
+        datos = dict(e['datos'], ids=self.gestor_modelo.almacen.id_barra[e['filas_almacen']])
+        if ids_barras is None:
+            return datos
+        filas = self.filas_barras(ids_barras)
+        return {clave: valor[filas] for clave, valor in datos.items()}
+
+    def filas_barras(self, ids_barras):
+        """
+        Posición de cada barra en los arrays de datos_barras() (y en las pilas de matrices
+        de barra que se pasan a ensamblar_barras).
+        Raises:
+            KeyError: Si alguna barra no existe.
+        """
+        e = self._actualizar_ensamblado()
+        ids_barras = np.atleast_1d(np.asarray(ids_barras, dtype=np.int64))
+        filas_almacen = self.gestor_modelo.almacen.filas_de_barras(ids_barras)
+        if (filas_almacen < 0).any():
+            raise KeyError(f"Error: Las barras con ID {ids_barras[filas_almacen < 0][:10].tolist()} no existen.")
+        return np.searchsorted(e['filas_almacen'], filas_almacen)
+
+    def ensamblar_barras(self, matrices, formato="csr"):
+        """
+        Ensambla una matriz global a partir de matrices de barra (p. ej. de rigidez
+        geométrica o de masa), con las barras en el orden de datos_barras(). En formato
+        'csr' se usa el mismo patrón de no nulos que K.
+        Args:
+            matrices (np.ndarray): Pila de matrices globales de barra (n_barras, 6, 6).
+            formato (str): 'densa' o 'csr'.
+        Returns:
+            np.ndarray | scipy.sparse.csr_matrix: Matriz global (n_dof, n_dof).
+        Raises:
+            ValueError: Si el formato no es válido o no hay una matriz por barra.
+        """
+        if formato not in ("densa", "csr"):
+            raise ValueError("Formato no válido. Use 'densa' o 'csr'.")
+        e = self._actualizar_ensamblado()
+        matrices = np.asarray(matrices, dtype=float)
+        if matrices.shape != e['k_barras'].shape:
+            raise ValueError("Debe haber una matriz 6x6 por barra del modelo.")
+        return self._ensamblar(e, formato, matrices)
+
+    def _permutacion_libres(self, pos_libre):
+        """
+        Renumeración de Cuthill-McKee inversa del grafo nodal, expresada como orden
+        nuevo → índice en K_ff de los DOFs libres.
+        """
+        e = self._actualizar_ensamblado()
+        nodos_barras = e['datos']['dofs'][:, [0, 3]] // 3
+        orden_dofs = permutacion_dofs(permutacion_rcm(e['n_dof'] // 3, nodos_barras))
+        indices = pos_libre[orden_dofs]
+        return indices[indices >= 0]
+
+    def informe_renumeracion(self):
+        """
+        Compara el semiancho de banda y el perfil del sistema reducido K_ff con la numeración
+        por ID de nodo y con la renumeración de Cuthill-McKee inversa.
+        Returns:
+            dict: 'ancho_banda_antes', 'ancho_banda_despues', 'perfil_antes', 'perfil_despues'.
+        """
+        e = self._actualizar_ensamblado()
+        libres, _ = self.particionar_dofs(e['n_dof'])
+        pos_libre = np.full(e['n_dof'], -1, dtype=np.intp)
+        pos_libre[libres] = np.arange(len(libres))
+
+        dofs = pos_libre[e['datos']['dofs']]
+        filas = np.repeat(dofs, 6, axis=1).ravel()
+        columnas = np.tile(dofs, (1, 6)).ravel()
+        validas = (filas >= 0) & (columnas >= 0)
+        filas, columnas = filas[validas], columnas[validas]
+
+        n = len(libres)
+        antes = ancho_banda_y_perfil(filas, columnas, n)
+        despues = ancho_banda_y_perfil(filas, columnas, n, self._permutacion_libres(pos_libre))
+        return {'ancho_banda_antes': antes[0], 'ancho_banda_despues': despues[0],
+                'perfil_antes': antes[1], 'perfil_despues': despues[1]}
+
+    def factorizar(self, formato="densa"):
+        """
+        Ensambla K y factoriza el sistema reducido K_ff una sola vez por estado del modelo.
+        La factorización se reutiliza mientras el GestorDeModelo no registre cambios de
+        topología o restricciones; los cambios de propiedades de barras se incorporan como
+        actualizaciones de bajo rango y los de cargas no la afectan.
+        Args:
+            formato (str): 'densa' (Cholesky) o 'csr' (LU dispersa). Con self.renumerar,
+                el sistema se renumera antes (Cholesky en banda si el ancho lo permite).
+        Returns:
+            FactorizacionRigidez: Factorización de K_ff.
+        Raises:
+            np.linalg.LinAlgError: Si K_ff es singular.
+        """
+        # Sincronizar primero el ensamblado: los cambios de propiedades pendientes se
+        # incorporan así a la factorización cacheada (Woodbury) antes de comprobar si vale
+        self._actualizar_ensamblado()
+        revision = self.gestor_modelo.revision_rigidez()
+        if self._sistema is not None and self._sistema['revision'] == revision \
+                and self._sistema['formato'] == formato and self._sistema['renumerar'] == self.renumerar:
+            return self._sistema['factorizacion']
+
+        K = self.matriz_rigidez_global(formato)
+        K_ff, K_fr, libres, restringidos, u_prescrito = self._sistema_reducido(K)
+
+        pos_libre = np.full(K.shape[0], -1, dtype=np.intp)  # DOF global → índice en K_ff
+        pos_libre[libres] = np.arange(len(libres))
+        permutacion = self._permutacion_libres(pos_libre) if self.renumerar else None
+        with self._fase("factorizacion", formato=formato, n_libres=len(libres)) as fase:
+            factorizacion = FactorizacionRigidez(K_ff, permutacion)
+            if fase is not None:
+                fase.tamaños['tipo'] = factorizacion.tipo
+        if fase is not None and self.instrumentacion.estimar_condicion:
+            fase.tamaños['condicion'] = estimar_condicion(K_ff, factorizacion)
+
+        self._sistema = {
+            'renumerar': self.renumerar,
+            'revision': revision, 'formato': formato, 'K_fr': K_fr,
+            'libres': libres, 'restringidos': restringidos, 'pos_libre': pos_libre,
+            'u_prescrito': u_prescrito, 'factorizacion': factorizacion,
+        }
+        return factorizacion
+
+    def resolver_casos(self, F=None, incluir_cargas_barras=True, formato="densa"):
+        """
+        Resuelve varios casos de carga con una única factorización de K_ff.
+        Args:
+            F (np.ndarray, optional): Fuerzas nodales globales, una columna por caso
+                (n_dof, n_casos). Un vector (n_dof,) se trata como un único caso.
+            incluir_cargas_barras (bool): Si es True, suma a cada caso las fuerzas
+                equivalentes de las cargas distribuidas de las barras.
+            formato (str): 'densa' o 'csr'.
+        Returns:
+            np.ndarray: Desplazamientos globales (n_dof, n_casos).
+        Raises:
+            ValueError: Si F no tiene n_dof filas.
+            np.linalg.LinAlgError: Si K_ff es singular.
+        """
+        factorizacion = self.factorizar(formato)
+        sistema = self._sistema
+        n_dof = sistema['u_prescrito'].shape[0]
+
+        if F is None:
+            F = np.zeros((n_dof, 1))
+        F = np.asarray(F, dtype=float)
+        if F.ndim == 1:
+            F = F[:, None]
+        if F.shape[0] != n_dof:
+            raise ValueError("La matriz de fuerzas debe tener tantas filas como DOFs globales.")
+        if incluir_cargas_barras:
+            F = F + self.vector_fuerzas_equivalentes()[:, None]
+
+        libres = sistema['libres']
+        restringidos = sistema['restringidos']
+        u_r = sistema['u_prescrito'][restringidos]
+
+        with self._fase("resolucion", n_libres=len(libres), n_casos=F.shape[1]):
+            U = np.repeat(sistema['u_prescrito'][:, None], F.shape[1], axis=1)
+            F_f = F[libres] - (sistema['K_fr'] @ u_r)[:, None]
+            U[libres] = factorizacion.resolver(F_f)
+        return U
+
+    def analizar(self, fuerzas_nodales_aplicadas=None, metodo="reducido", formato="densa"):
+        """
+        Ensambla y resuelve el pórtico.
+        Args:
+            fuerzas_nodales_aplicadas (np.ndarray, optional): Fuerzas nodales globales (n_dof,).
+            metodo (str): 'reducido' resuelve solo el sistema de DOFs libres y admite
+                desplazamientos prescritos; 'anulacion' anula filas y columnas restringidas
+                de una copia de K (solo formato 'densa' y apoyos sin desplazamiento impuesto).
+            formato (str): 'densa' o 'csr', como en matriz_rigidez_global.
+        Returns:
+            np.ndarray: Vector de desplazamientos globales u_global (n_dof,); ceros si la
+                matriz de rigidez es singular (el error se registra en "porticos.calculo").
+        """
+        if metodo not in ("reducido", "anulacion"):
+            raise ValueError("Método no válido. Use 'reducido' o 'anulacion'.")
+        if metodo == "anulacion":
+            if formato != "densa":
+                raise ValueError("El método 'anulacion' solo admite el formato 'densa'.")
+            if any(self.gestor_modelo.get_desplazamientos_prescritos().values()):
+                raise ValueError("El método 'anulacion' no admite desplazamientos prescritos no nulos.")
+
         f_equivalentes = self.vector_fuerzas_equivalentes()
 
         f_total = f_equivalentes
         if fuerzas_nodales_aplicadas is not None:
             if fuerzas_nodales_aplicadas.shape != f_total.shape:
                 raise ValueError("El vector de fuerzas_nodales_aplicadas debe tener el mismo tamaño que el vector de DOFs global.")
-            f_total += fuerzas_nodales_aplicadas
-
-        K_mod, f_mod = self.aplicar_restricciones(K_global, f_total)
+            f_total = f_total + fuerzas_nodales_aplicadas
 
         try:
-            u_global = np.linalg.solve(K_mod, f_mod)
+            if metodo == "reducido":
+                # Reutiliza la factorización cacheada si el modelo no ha cambiado
+                u_global = self.resolver_casos(f_total, incluir_cargas_barras=False, formato=formato)[:, 0]
+            else:
+                K_mod, f_mod = self.aplicar_restricciones(self.matriz_rigidez_global(formato), f_total)
+                with self._fase("resolucion", metodo="anulacion", n_dof=len(f_mod), n_casos=1):
+                    u_global = np.linalg.solve(K_mod, f_mod)
         except np.linalg.LinAlgError:
-            print("Error: La matriz de rigidez es singular. Revise apoyos o conectividad.")
-            u_global = np.zeros(K_mod.shape[0])
+            log.error("Error: La matriz de rigidez es singular. Revise apoyos o conectividad.")
+            u_global = np.zeros(f_total.shape[0])
 
         return u_global
 
+    def reacciones(self, U, F=None, incluir_cargas_barras=True, guardar=True):
+        """
+        Calcula las reacciones R = K u - f solo en las filas de los DOFs restringidos, con la
+        K ensamblada y cacheada (sin restricciones aplicadas); no se ensambla nada nuevo si
+        K ya está en caché en algún formato.
+        Args:
+            U (np.ndarray): Desplazamientos (n_dof,) o (n_dof, n_casos).
+            F (np.ndarray, optional): Fuerzas nodales aplicadas, (n_dof,) o (n_dof, n_casos).
+            incluir_cargas_barras (bool): Descontar las fuerzas equivalentes de las cargas de
+                las barras (como en resolver_casos).
+            guardar (bool): Con un único caso, escribir rx, ry y mz en los nodos.
+        Returns:
+            dict: 'nodos' con los IDs de los nodos con algún DOF restringido y 'rx', 'ry' y
+                'mz' con sus reacciones, de forma (k,) o (k, n_casos); las componentes de
+                DOFs libres valen 0.
+        Raises:
+            ValueError: Si U o F no tienen n_dof filas.
+        """
+        e = self._actualizar_ensamblado()
+        almacen = self.gestor_modelo.almacen
+        n_dof = e['n_dof']
+        U = np.asarray(U, dtype=float)
+        un_caso = U.ndim == 1
+        U = U[:, None] if un_caso else U
+        if U.shape[0] != n_dof or (F is not None and np.shape(F)[0] != n_dof):
+            raise ValueError("U y F deben tener tantas filas como DOFs globales.")
+
+        restringido = almacen.dofs_restringidos()
+        r = np.flatnonzero(restringido)
+        K = self.matriz_rigidez_global("csr" if "csr" in e['K'] else "densa")
+        with self._fase("reacciones", n_restringidos=len(r), n_casos=U.shape[1]):
+            R_r = K[r] @ U
+            if F is not None:
+                F = np.asarray(F, dtype=float)
+                R_r -= F[r, None] if F.ndim == 1 else F[r]
+            if incluir_cargas_barras:
+                R_r -= self.vector_fuerzas_equivalentes()[r, None]
+            R = np.zeros((n_dof, U.shape[1]))
+            R[r] = R_r
+            R = R.reshape(-1, 3, U.shape[1])
+
+        apoyos = np.flatnonzero(restringido.reshape(-1, 3).any(axis=1))
+        if un_caso:
+            R = R[..., 0]
+            if guardar:
+                filas_nodos = almacen.filas_nodos_activos()
+                reacciones = almacen.reservar_reacciones()
+                reacciones[filas_nodos[:, None], [0, 1, 5]] = R
+        return {'nodos': almacen.ids_nodos()[apoyos], 'rx': R[apoyos, 0], 'ry': R[apoyos, 1],
+                'mz': R[apoyos, 2]}
+
+    def guardar_modelo(self, ruta):
+        """Guarda el modelo en un archivo (ver ArchivoModelo.guardar_modelo)."""
+        from ArchivoModelo import guardar_modelo
+        guardar_modelo(self.gestor_modelo, ruta)
+
+    def cargar_modelo(self, ruta):
+        """
+        Carga un modelo guardado en el gestor de este pórtico, que debe estar vacío
+        (ver ArchivoModelo.cargar_modelo).
+        """
+        from ArchivoModelo import cargar_modelo
+        cargar_modelo(ruta, self.gestor_modelo)
+
     # Los métodos de visualización han sido movidos a VisualizadorPortico
     # Puedes crear métodos "wrapper" si lo deseas, o llamar directamente desde el script principal
-    def mostrar_forma_deformada(self, u_global, factor=500):
-        self.visualizador.visualizar_estructura_deformada(u_global, factor)
-
-    def mostrar_diagramas_simples(self, u_global, tipo='V', npts=50):
-        self.visualizador.graficar_diagramas(u_global, tipo, npts)
-
-    def mostrar_diagramas_superpuestos(self, u_global, tipo='M', escala=0.001, factor=100, npts=100):
-        self.visualizador.visualizar_con_diagramas_superpuestos(u_global, tipo, escala, factor, npts)
-
+    def mostrar_forma_deformada(self, u_global, factor=500, ruta=None):
+        self.visualizador.visualizar_estructura_deformada(u_global, factor, ruta=ruta)
+
+    def mostrar_diagramas_simples(self, u_global, tipo='V', npts=50, ruta=None):
+        self.visualizador.graficar_diagramas(u_global, tipo, npts, ruta=ruta)
+
+    def mostrar_diagramas_superpuestos(self, u_global, tipo='M', escala=0.001, factor=100, npts=100, ruta=None):
+        self.visualizador.visualizar_con_diagramas_superpuestos(u_global, tipo, escala, factor, npts, ruta=ruta)
+
+    def mostrar_visor_interactivo(self, U, **kwargs):
+        """
+        Abre el visor interactivo (deslizadores de factor, escala y caso de carga) para los
+        desplazamientos U (n_dof,) o (n_dof, n_casos); ver VisorInteractivo.
+        Returns:
+            VisorInteractivo: El visor (hay que conservar la referencia mientras esté abierto).
+        """
+        from VisorInteractivo import VisorInteractivo
+        visor = VisorInteractivo(self.gestor_modelo, self.calculadora_barra, U, **kwargs)
+        visor.mostrar()
+        return visor
+
+    def exportar_figuras(self, U, directorio, **kwargs):
+        """
+        Exporta sin pantalla la deformada y los diagramas de cada caso de carga, repartiendo
+        las figuras entre varios procesos (ver RenderizadoLote.exportar_casos).
+        Returns:
+            list: Rutas escritas.
+        """
+        from RenderizadoLote import exportar_casos
+        return exportar_casos(self.gestor_modelo, U, directorio, **kwargs)
 
     def __repr__(self):
         return f"Portico con:\n{self.gestor_modelo}"
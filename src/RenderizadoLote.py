@@ -0,0 +1,94 @@
+# RenderizadoLote.py
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from CalculadoraPorticoBarra import CalculadoraPorticoBarra
+from VisualizadorPortico import VisualizadorPortico
+
+# Visualizador de cada proceso trabajador, creado una sola vez al arrancar el proceso
+_visualizador_trabajador = None
+
+
+def _inicializar_trabajador(gestor_modelo):
+    """
+    Recibe el modelo (una vez por proceso) y prepara el visualizador. No se cambia el
+    backend de matplotlib: VisualizadorPortico.exportar dibuja con Figure y FigureCanvasAgg,
+    y este inicializador también se ejecuta en el proceso actual (max_procesos=1).
+    """
+    global _visualizador_trabajador
+    _visualizador_trabajador = VisualizadorPortico(gestor_modelo, CalculadoraPorticoBarra())
+
+
+def _exportar_trabajo(trabajo):
+    """Dibuja y guarda una figura en el proceso trabajador."""
+    figura, u_global, ruta, opciones = trabajo
+    return _visualizador_trabajador.exportar(figura, u_global, ruta, **opciones)
+
+
+def exportar_lote(gestor_modelo, trabajos, max_procesos=None):
+    """
+    Genera y guarda un lote de figuras repartiéndolas entre varios procesos. El modelo se
+    envía a cada proceso una sola vez (al inicializarlo); cada trabajo solo transporta su
+    vector de desplazamientos, la ruta y las opciones de dibujo.
+    Args:
+        gestor_modelo (GestorDeModelo): Modelo cuya geometría se dibuja.
+        trabajos (iterable): Tuplas (figura, u_global, ruta, opciones) con figura en
+            VisualizadorPortico.FIGURAS y opciones un diccionario de argumentos de dibujo.
+        max_procesos (int, optional): Número de procesos; con 1 todo se dibuja en el proceso
+            actual. Por defecto, el de os.cpu_count().
+    Returns:
+        list: Rutas escritas, en el orden de los trabajos.
+    """
+    trabajos = list(trabajos)
+    if not trabajos:
+        return []
+    n_procesos = min(max_procesos or os.cpu_count() or 1, len(trabajos))
+
+    if n_procesos == 1:
+        _inicializar_trabajador(gestor_modelo)
+        return [_exportar_trabajo(trabajo) for trabajo in trabajos]
+
+    # Trozos de varios trabajos por envío para amortizar la comunicación entre procesos
+    trozo = max(1, len(trabajos) // (4 * n_procesos))
+    with ProcessPoolExecutor(max_workers=n_procesos, initializer=_inicializar_trabajador,
+                             initargs=(gestor_modelo,)) as ejecutor:
+        return list(ejecutor.map(_exportar_trabajo, trabajos, chunksize=trozo))
+
+
+def exportar_casos(gestor_modelo, U, directorio, figuras=("deformada", "N", "V", "M"), formato="png",
+                   nombres_casos=None, opciones=None, max_procesos=None):
+    """
+    Exporta, para cada caso de carga, la forma deformada y los diagramas superpuestos
+    pedidos, con exportar_lote. Los ficheros se llaman '<caso>_<figura>.<formato>'.
+    Args:
+        gestor_modelo (GestorDeModelo): Modelo cuya geometría se dibuja.
+        U (np.ndarray): Desplazamientos (n_dof,) o (n_dof, n_casos).
+        directorio (str | os.PathLike): Carpeta de salida (se crea si no existe).
+        figuras (iterable): 'deformada' y/o tipos de diagrama 'N', 'V', 'M'.
+        formato (str): Extensión de los ficheros: 'png', 'svg', 'pdf'...
+        nombres_casos (list, optional): Nombre de cada caso; por defecto 'caso<k>'.
+        opciones (dict, optional): Argumentos de dibujo por figura, p. ej.
+            {'deformada': {'factor': 200}, 'M': {'escala': 1e-5}}.
+        max_procesos (int, optional): Ver exportar_lote.
+    Returns:
+        list: Rutas escritas.
+    """
+    U = np.asarray(U, dtype=float)
+    if U.ndim == 1:
+        U = U[:, None]
+    if nombres_casos is None:
+        nombres_casos = [f"caso{k}" for k in range(U.shape[1])]
+    opciones = opciones or {}
+    os.makedirs(directorio, exist_ok=True)
+
+    trabajos = []
+    for k, nombre in enumerate(nombres_casos):
+        for figura in figuras:
+            ruta = os.path.join(directorio, f"{nombre}_{figura}.{formato}")
+            if figura == "deformada":
+                trabajos.append(("deformada", U[:, k], ruta, dict(opciones.get(figura, {}))))
+            else:
+                trabajos.append(("superpuestos", U[:, k], ruta, {"tipo": figura, **opciones.get(figura, {})}))
+    return exportar_lote(gestor_modelo, trabajos, max_procesos=max_procesos)
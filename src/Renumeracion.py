@@ -0,0 +1,58 @@
+# Renumeracion.py
+import numpy as np
+
+
+def permutacion_rcm(n_nodos, conectividad):
+    """
+    Calcula una renumeración de nodos de Cuthill-McKee inversa (RCM) sobre el grafo de
+    adyacencia nodal, que reduce el ancho de banda y el relleno de la factorización.
+    Requiere SciPy (scipy.sparse.csgraph).
+    Args:
+        n_nodos (int): Número de nodos (índices 0..n_nodos-1).
+        conectividad (np.ndarray): Índices de nodo inicial y final de cada barra (n_barras, 2).
+    Returns:
+        np.ndarray: Orden nuevo → índice de nodo original (n_nodos,).
+    """
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import reverse_cuthill_mckee
+
+    conectividad = np.asarray(conectividad, dtype=np.intp).reshape(-1, 2)
+    filas = np.concatenate([conectividad[:, 0], conectividad[:, 1]])
+    columnas = np.concatenate([conectividad[:, 1], conectividad[:, 0]])
+    grafo = coo_matrix((np.ones(len(filas)), (filas, columnas)), shape=(n_nodos, n_nodos)).tocsr()
+    return np.asarray(reverse_cuthill_mckee(grafo, symmetric_mode=True), dtype=np.intp)
+
+
+def permutacion_dofs(orden_nodos):
+    """Expande un orden de nodos (nuevo → original) al orden de sus 3 DOFs por nodo."""
+    orden_nodos = np.asarray(orden_nodos, dtype=np.intp)
+    return (3 * orden_nodos[:, None] + np.arange(3)).ravel()
+
+
+def ancho_banda_y_perfil(filas, columnas, n, permutacion=None):
+    """
+    Calcula el semiancho de banda y el perfil (envolvente) del patrón simétrico de una
+    matriz a partir de las posiciones de sus entradas no nulas.
+    Args:
+        filas, columnas (np.ndarray): Posiciones de las entradas no nulas.
+        n (int): Orden de la matriz.
+        permutacion (np.ndarray, optional): Orden nuevo → índice original; si se da, el
+            patrón se evalúa tras renumerar.
+    Returns:
+        tuple: (ancho_banda, perfil), con ancho_banda = max |i - j| y perfil la suma, por
+            fila, de la distancia de la diagonal a la primera entrada no nula.
+    """
+    filas = np.asarray(filas, dtype=np.intp)
+    columnas = np.asarray(columnas, dtype=np.intp)
+    if permutacion is not None:
+        posicion = np.empty(n, dtype=np.intp)
+        posicion[permutacion] = np.arange(n)
+        filas, columnas = posicion[filas], posicion[columnas]
+    if n == 0 or len(filas) == 0:
+        return 0, 0
+
+    ancho_banda = int(np.max(np.abs(filas - columnas)))
+    primera = np.arange(n)  # primera columna no nula de cada fila (la diagonal como mínimo)
+    np.minimum.at(primera, np.maximum(filas, columnas), np.minimum(filas, columnas))
+    perfil = int(np.sum(np.arange(n) - primera))
+    return ancho_banda, perfil
@@ -0,0 +1,191 @@
+# VisorInteractivo.py
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from matplotlib.widgets import Slider
+
+from VisualizadorPortico import VisualizadorPortico
+
+
+class VisorInteractivo:
+    def __init__(self, gestor_modelo, calculadora_barra, U, tipo='M', factor=100, escala=0.001, npts=50,
+                 nombres_casos=None):
+        """
+        Visor interactivo de la deformada y del diagrama superpuesto (N, V o M) con
+        deslizadores para el factor de deformación, la escala del diagrama y el caso de carga.
+        Todo lo que depende del caso se precalcula aquí una sola vez: la deformada es lineal
+        en 'factor' y el diagrama lineal en 'escala', así que mover un deslizador solo
+        combina arrays ya calculados. Los artistas se crean una vez, se actualizan con
+        set_segments y se redibujan con blitting.
+        Args:
+            gestor_modelo (GestorDeModelo): Modelo a dibujar.
+            calculadora_barra (CalculadoraPorticoBarra): Núcleos de cálculo por barra.
+            U (np.ndarray): Desplazamientos (n_dof,) o (n_dof, n_casos).
+            tipo (str): Diagrama superpuesto: 'M', 'V' o 'N'.
+            factor (float): Factor de amplificación inicial de la deformada.
+            escala (float): Escala inicial del diagrama.
+            npts (int): Puntos por barra.
+            nombres_casos (list, optional): Nombre de cada caso; por defecto 'Caso <k>'.
+        """
+        self.gestor_modelo = gestor_modelo
+        self.calculadora_barra = calculadora_barra
+        self.tipo = tipo
+        self.factor = factor
+        self.escala = escala
+        self.caso = 0
+
+        U = np.asarray(U, dtype=float)
+        if U.ndim == 1:
+            U = U[:, None]
+        self.n_casos = U.shape[1]
+        self.nombres_casos = nombres_casos or [f"Caso {k}" for k in range(self.n_casos)]
+        self._precalcular(U, npts)
+
+        self.figura = None
+        self._fondo = None
+        self._animados = []
+        self._deslizadores = []
+
+    def _precalcular(self, U, npts):
+        """Precalcula, para todos los casos, la deformada y los valores del diagrama."""
+        visualizador = VisualizadorPortico(self.gestor_modelo, self.calculadora_barra)
+        datos = self.gestor_modelo.datos_barras()
+        self._datos = datos
+        self._activa = datos['L'] > 0
+
+        x, N, V, M = self.calculadora_barra.esfuerzos_internos_lote(
+            U, datos['dofs'], datos['E'], datos['A'], datos['I'], datos['L'],
+            datos['c'], datos['s'], datos['q'], npts=npts)
+        u_barras = np.moveaxis(U[datos['dofs']], -1, 0)  # (n_casos, n_barras, 6)
+        u_local = self.calculadora_barra.desplazamientos_locales_lote(u_barras, datos['c'], datos['s'])
+
+        # curva(factor) = base + factor * incremento (n_casos, n_barras, npts, 2)
+        self._curva_base = visualizador._curvas_deformadas(datos, u_local[:1], 0.0, x[:1])[0]
+        self._incremento_curva = visualizador._curvas_deformadas(datos, u_local, 1.0, x) - self._curva_base
+        self._valores = visualizador._valores_diagrama(self.tipo, N, V, M)
+
+        # Cuerda de cada barra: original + factor * diferencia de desplazamientos de sus nodos
+        self._cuerda_base = datos['xy'][:, 1] - datos['xy'][:, 0]
+        self._incremento_cuerda = u_barras[..., [3, 4]] - u_barras[..., [0, 1]]
+
+    def _segmentos(self):
+        """Segmentos de la deformada y del diagrama para el caso, factor y escala actuales."""
+        k = self.caso
+        curvas = self._curva_base + self.factor * self._incremento_curva[k]
+
+        cuerda = self._cuerda_base + self.factor * self._incremento_cuerda[k]
+        longitud = np.hypot(cuerda[:, 0], cuerda[:, 1])
+        valida = self._activa & (longitud > 0)
+        normal = np.stack([-cuerda[:, 1], cuerda[:, 0]], axis=-1) / np.where(longitud > 0, longitud, 1.0)[:, None]
+        diagrama = curvas + self.escala * self._valores[k][..., None] * normal[:, None, :]
+        return curvas[self._activa], diagrama[valida]
+
+    def crear_figura(self):
+        """
+        Crea la figura con todos sus artistas y deslizadores (una sola vez).
+        Returns:
+            matplotlib.figure.Figure: La figura del visor.
+        """
+        self.figura = plt.figure(figsize=(10, 7))
+        ax = self.figura.add_axes([0.08, 0.25, 0.88, 0.68])
+        self.ax = ax
+        datos = self._datos
+        almacen = self.gestor_modelo.almacen
+
+        # Capas estáticas
+        ax.add_collection(LineCollection(datos['xy'], colors='k', linestyles='--', linewidths=1.5,
+                                         label='Original', zorder=1))
+        coords = almacen.coords[almacen.filas_nodos_activos()]
+        ax.plot(coords[:, 0], coords[:, 1], 'ko', markersize=4, linestyle='none')
+
+        # Capas animadas: solo cambian sus datos
+        curvas, diagrama = self._segmentos()
+        self._deformada = LineCollection(curvas, colors='green', linewidths=2.5, label='Deformado',
+                                         zorder=2, animated=True)
+        self._diagrama = LineCollection(diagrama, colors='blue' if self.tipo == 'M' else 'red',
+                                        linewidths=2, alpha=0.8, zorder=3, animated=True)
+        self._texto_caso = ax.text(0.02, 0.97, self.nombres_casos[self.caso], transform=ax.transAxes,
+                                   va='top', animated=True)
+        self._animados = [self._deformada, self._diagrama, self._texto_caso]
+        for coleccion in self._animados[:2]:
+            ax.add_collection(coleccion)
+        self._ajustar_limites()
+
+        nombres = {'N': 'Axil', 'V': 'Cortante', 'M': 'Momento flector'}
+        ax.set_aspect('equal')
+        ax.set_title(f"Pórtico deformado con diagrama de {nombres[self.tipo]}")
+        ax.set_xlabel('X [m]')
+        ax.set_ylabel('Y [m]')
+        ax.grid(True)
+        ax.legend(loc='best')
+
+        # Deslizadores: no piden redibujar la figura entera (drawon=False); se hace con blitting
+        self._deslizador_factor = Slider(self.figura.add_axes([0.15, 0.13, 0.7, 0.03]), 'Factor',
+                                         0.0, 5 * self.factor, valinit=self.factor)
+        self._deslizador_escala = Slider(self.figura.add_axes([0.15, 0.08, 0.7, 0.03]), 'Escala',
+                                         0.0, 5 * self.escala, valinit=self.escala)
+        self._deslizadores = [self._deslizador_factor, self._deslizador_escala]
+        if self.n_casos > 1:
+            self._deslizador_caso = Slider(self.figura.add_axes([0.15, 0.03, 0.7, 0.03]), 'Caso',
+                                           0, self.n_casos - 1, valinit=self.caso, valstep=1)
+            self._deslizadores.append(self._deslizador_caso)
+        for deslizador in self._deslizadores:
+            deslizador.drawon = False
+            deslizador.on_changed(self._actualizar)
+
+        self.figura.canvas.mpl_connect('draw_event', self._al_dibujar)
+        return self.figura
+
+    def _ajustar_limites(self):
+        """Fija los límites para que quepan todos los casos con el factor y la escala iniciales."""
+        caso = self.caso
+        puntos = [self._datos['xy'].reshape(-1, 2)]
+        for self.caso in range(self.n_casos):
+            curvas, diagrama = self._segmentos()
+            puntos += [curvas.reshape(-1, 2), diagrama.reshape(-1, 2)]
+        self.caso = caso
+        puntos = np.concatenate(puntos)
+        minimo, maximo = puntos.min(axis=0), puntos.max(axis=0)
+        margen = 0.05 * np.maximum(maximo - minimo, 1e-9)
+        self.ax.set_xlim(minimo[0] - margen[0], maximo[0] + margen[0])
+        self.ax.set_ylim(minimo[1] - margen[1], maximo[1] + margen[1])
+
+    def _actualizar(self, _valor=None):
+        """Lee los deslizadores, actualiza los datos de los artistas y redibuja con blitting."""
+        self.factor = self._deslizador_factor.val
+        self.escala = self._deslizador_escala.val
+        if self.n_casos > 1:
+            self.caso = int(self._deslizador_caso.val)
+
+        curvas, diagrama = self._segmentos()
+        self._deformada.set_segments(curvas)
+        self._diagrama.set_segments(diagrama)
+        self._texto_caso.set_text(self.nombres_casos[self.caso])
+        self._redibujar()
+
+    def _al_dibujar(self, _evento):
+        """Tras un dibujado completo (inicio, zoom, cambio de tamaño), guarda el fondo."""
+        self._fondo = self.figura.canvas.copy_from_bbox(self.figura.bbox)
+        self._dibujar_animados()
+
+    def _dibujar_animados(self):
+        for artista in self._animados:
+            self.ax.draw_artist(artista)
+
+    def _redibujar(self):
+        """Restaura el fondo guardado y dibuja encima solo los artistas que cambian."""
+        canvas = self.figura.canvas
+        if self._fondo is None:
+            canvas.draw_idle()
+            return
+        canvas.restore_region(self._fondo)
+        self._dibujar_animados()
+        for deslizador in self._deslizadores:
+            self.figura.draw_artist(deslizador.ax)
+        canvas.blit(self.figura.bbox)
+
+    def mostrar(self):
+        """Crea la figura (si no existe) y la muestra."""
+        if self.figura is None:
+            self.crear_figura()
+        plt.show()
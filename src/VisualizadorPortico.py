@@ -1,12 +1,17 @@
 # visualizador_portico.py
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
 import math
 
 # Esta clase no importa directamente GestorDeModelo o CalculadoraPorticoBarra,
 # sino que recibe instancias de estas clases en su constructor.
 
 class VisualizadorPortico:
+    # Por encima de este número de barras, los diagramas simples no muestran una leyenda por barra
+    MAX_BARRAS_LEYENDA = 12
+
     def __init__(self, gestor_modelo, calculadora_barra):
         """
         Constructor de la clase VisualizadorPortico.
@@ -17,238 +22,248 @@ class VisualizadorPortico:
         self.gestor_modelo = gestor_modelo
         self.calculadora_barra = calculadora_barra
 
-    def visualizar_estructura_deformada(self, u_global, factor=500):
+    # ------------------------------------------------------------------
+    # Geometría por lotes (todas las barras a la vez)
+    # ------------------------------------------------------------------
+
+    def _desplazamientos_locales(self, datos, u_global):
+        """Desplazamientos locales de los extremos de todas las barras (n_barras, 6)."""
+        u_barras = np.asarray(u_global, dtype=float)[datos['dofs']]
+        return self.calculadora_barra.desplazamientos_locales_lote(u_barras, datos['c'], datos['s'])
+
+    def _curvas_deformadas(self, datos, u_local, factor, x_local):
         """
-        Visualiza la estructura original y deformada (2D con rotación).
+        Puntos de la forma deformada de todas las barras, interpolando el desplazamiento
+        transversal local con las funciones de forma cúbicas de Hermite.
         Args:
-            u_global (np.ndarray): Vector de desplazamientos globales.
-            factor (float): Factor de amplificación para los desplazamientos (para hacerlos visibles).
+            datos (dict): Datos de las barras (GestorDeModelo.datos_barras).
+            u_local (np.ndarray): Desplazamientos locales de los extremos (..., n_barras, 6),
+                con un eje inicial opcional de casos de carga.
+            factor (float): Factor de amplificación de los desplazamientos.
+            x_local (np.ndarray): Abscisas locales de los puntos (..., n_barras, npts).
+        Returns:
+            np.ndarray: Coordenadas globales de los puntos (..., n_barras, npts, 2).
         """
-        fig, ax = plt.subplots(figsize=(8, 6))
-
-        nodos = self.gestor_modelo.get_nodos()
-        barras = self.gestor_modelo.get_barras()
-        id_to_index = self.gestor_modelo.get_dof_map()
+        L = datos['L'][:, None]
+        t = x_local / np.where(L > 0, L, 1.0)
+        N1 = 1 - 3 * t**2 + 2 * t**3
+        N2 = L * (t - 2 * t**2 + t**3)
+        N3 = 3 * t**2 - 2 * t**3
+        N4 = L * (t**3 - t**2)
+        uy = (N1 * u_local[..., 1:2] + N2 * u_local[..., 2:3]
+              + N3 * u_local[..., 4:5] + N4 * u_local[..., 5:6])
+
+        c, s = datos['c'][:, None], datos['s'][:, None]
+        x0, y0 = datos['xy'][:, 0, 0:1], datos['xy'][:, 0, 1:2]
+        return np.stack([x0 + x_local * c - factor * uy * s,
+                         y0 + x_local * s + factor * uy * c], axis=-1)
+
+    def _normales_deformadas(self, datos, u_global, factor):
+        """
+        Normal unitaria a la cuerda deformada de cada barra (n_barras, 2) y máscara de las
+        barras en que está definida (cuerda deformada de longitud no nula).
+        """
+        u_global = np.asarray(u_global, dtype=float)
+        desplazados = datos['xy'] + factor * np.stack(
+            [u_global[datos['dofs'][:, [0, 1]]], u_global[datos['dofs'][:, [3, 4]]]], axis=1)
+        d = desplazados[:, 1] - desplazados[:, 0]
+        L_def = np.hypot(d[:, 0], d[:, 1])
+        valida = L_def > 0
+        normal = np.stack([-d[:, 1], d[:, 0]], axis=-1) / np.where(valida, L_def, 1.0)[:, None]
+        return normal, valida
+
+    @staticmethod
+    def _valores_diagrama(tipo, N, V, M):
+        """Selecciona los valores del diagrama pedido ('N', 'V' o 'M')."""
+        if tipo == 'V':
+            return V
+        if tipo == 'M':
+            return M
+        if tipo == 'N':
+            return N
+        raise ValueError("Tipo de diagrama no válido. Use 'N' para axil, 'V' para cortante o 'M' para momento.")
+
+    @staticmethod
+    def _configurar_leyenda(ax, **kwargs):
+        """Leyenda sin entradas repetidas."""
+        handles, labels = ax.get_legend_handles_labels()
+        by_label = dict(zip(labels, handles))
+        ax.legend(by_label.values(), by_label.keys(), **kwargs)
 
-        for id_barra, barra in barras.items():
-            id1 = barra.nodo1.id
-            id2 = barra.nodo2.id
+    # ------------------------------------------------------------------
+    # Dibujo sobre unos ejes dados (cada capa es una sola colección)
+    # ------------------------------------------------------------------
 
-            i1 = id_to_index[id1]
-            i2 = id_to_index[id2]
+    def _dibujar_estructura_deformada(self, ax, u_global, factor=500):
+        """Dibuja en 'ax' la estructura original y la deformada (barras rectas entre nodos)."""
+        datos = self.gestor_modelo.datos_barras()
+        u_global = np.asarray(u_global, dtype=float)
+        desplazamientos = np.stack([u_global[datos['dofs'][:, [0, 1]]],
+                                    u_global[datos['dofs'][:, [3, 4]]]], axis=1)
 
-            # Desplazamientos globales de los nodos de la barra
-            ux1, uy1 = u_global[3*i1], u_global[3*i1+1]
-            ux2, uy2 = u_global[3*i2], u_global[3*i2+1]
+        ax.add_collection(LineCollection(datos['xy'], colors='k', linestyles='--', linewidths=1,
+                                         label='Original'))
+        ax.add_collection(LineCollection(datos['xy'] + factor * desplazamientos, colors='b',
+                                         linewidths=2, label='Deformada'))
+        ax.autoscale_view()
 
-            # Coordenadas originales
-            x1, y1 = barra.nodo1.x, barra.nodo1.y
-            x2, y2 = barra.nodo2.x, barra.nodo2.y
+        # Configuración del gráfico
+        ax.set_aspect('equal')
+        ax.set_xlabel('X [m]')
+        ax.set_ylabel('Y [m]')
+        ax.set_title('Estructura: original vs. deformada')
+        ax.grid(True)
+        self._configurar_leyenda(ax)
 
-            # Dibujar barra original (línea punteada)
-            ax.plot([x1, x2], [y1, y2], 'k--', lw=1,
-                    label='Original' if id_barra == sorted(list(barras.keys()))[0] else "")
+    def _dibujar_diagramas(self, ax, u_global, tipo='V', npts=50):
+        """Dibuja en 'ax' el diagrama de axil (N), cortante (V) o momento (M) de todas las barras."""
+        datos = self.gestor_modelo.datos_barras()
+        x, N, V, M = self.calculadora_barra.esfuerzos_internos_lote(
+            u_global, datos['dofs'], datos['E'], datos['A'], datos['I'], datos['L'],
+            datos['c'], datos['s'], datos['q'], npts=npts)
+        valores = self._valores_diagrama(tipo, N, V, M)
 
-            # Coordenadas deformadas
-            xd1 = x1 + ux1 * factor
-            yd1 = y1 + uy1 * factor
-            xd2 = x2 + ux2 * factor
-            yd2 = y2 + uy2 * factor
+        colores = plt.rcParams['axes.prop_cycle'].by_key()['color']
+        colores_barras = [colores[k % len(colores)] for k in range(len(x))]
+        ax.add_collection(LineCollection(np.stack([x, valores], axis=-1), colors=colores_barras))
+        ax.autoscale_view()
 
-            # Dibujar barra deformada (línea sólida)
-            ax.plot([xd1, xd2], [yd1, yd2], 'b-', lw=2,
-                    label='Deformada' if id_barra == sorted(list(barras.keys()))[0] else "")
+        # Configuración del gráfico
+        titulos = {'N': 'Diagrama de Axil N(x)', 'V': 'Diagrama de Cortante V(x)',
+                   'M': 'Diagrama de Momento Flector M(x)'}
+        ax.axhline(0, color='black', lw=0.5)
+        ax.set_title(titulos[tipo])
+        ax.set_xlabel('x local de la barra [m]')
+        ax.set_ylabel('M [Nm]' if tipo == 'M' else f'{tipo} [N]')
+        ax.grid(True)
+        if 0 < len(x) <= self.MAX_BARRAS_LEYENDA:
+            ids_nodos = self.gestor_modelo.almacen.id_nodo[
+                self.gestor_modelo.almacen.conectividad[self.gestor_modelo.almacen.filas_barras_activas()]]
+            ax.legend([Line2D([], [], color=color) for color in colores_barras],
+                      [f'Barra {id1}-{id2}' for id1, id2 in ids_nodos.tolist()])
+
+    def _dibujar_diagramas_superpuestos(self, ax, u_global, tipo='M', escala=0.001, factor=100, npts=100):
+        """Dibuja en 'ax' la estructura original, la deformada y el diagrama superpuesto."""
+        datos = self.gestor_modelo.datos_barras()
+        almacen = self.gestor_modelo.almacen
+        activa = datos['L'] > 0
+
+        # Estructura original (línea punteada) y nodos
+        ax.add_collection(LineCollection(datos['xy'], colors='k', linestyles='--', linewidths=1.5,
+                                         label='Original', zorder=1))
+        coords = almacen.coords[almacen.filas_nodos_activos()]
+        ax.plot(coords[:, 0], coords[:, 1], 'ko', markersize=4, linestyle='none')
+
+        # Estructura deformada (interpolada)
+        x_local, N, V, M = self.calculadora_barra.esfuerzos_internos_lote(
+            u_global, datos['dofs'], datos['E'], datos['A'], datos['I'], datos['L'],
+            datos['c'], datos['s'], datos['q'], npts=npts)
+        u_local = self._desplazamientos_locales(datos, u_global)
+        curvas = self._curvas_deformadas(datos, u_local, factor, x_local)
+        ax.add_collection(LineCollection(curvas[activa], colors='green', linewidths=2.5,
+                                         label='Deformado', zorder=2))
+
+        # Diagrama de momento/cortante perpendicular a la cuerda de la barra deformada
+        normal, valida = self._normales_deformadas(datos, u_global, factor)
+        valores = self._valores_diagrama(tipo, N, V, M)
+        diagrama = curvas + escala * valores[..., None] * normal[:, None, :]
+        ax.add_collection(LineCollection(diagrama[activa & valida], colors='blue' if tipo == 'M' else 'red',
+                                         linewidths=2, alpha=0.8, zorder=3))
+        ax.autoscale_view()
 
         # Configuración del gráfico
+        nombres = {'N': 'Axil', 'V': 'Cortante', 'M': 'Momento flector'}
         ax.set_aspect('equal')
+        ax.set_title(f"Pórtico deformado con diagrama de {nombres[tipo]}")
         ax.set_xlabel('X [m]')
         ax.set_ylabel('Y [m]')
-        ax.set_title('Estructura: original vs. deformada')
         ax.grid(True)
-        handles, labels = ax.get_legend_handles_labels()
-        by_label = dict(zip(labels, handles))
-        ax.legend(by_label.values(), by_label.keys())
+        self._configurar_leyenda(ax, loc='best')
+
+    # ------------------------------------------------------------------
+    # Figuras
+    # ------------------------------------------------------------------
+
+    # Figuras exportables: nombre → (método de dibujo, tamaño en pulgadas)
+    FIGURAS = {
+        'deformada': ('_dibujar_estructura_deformada', (8, 6)),
+        'diagramas': ('_dibujar_diagramas', (10, 4)),
+        'superpuestos': ('_dibujar_diagramas_superpuestos', (10, 6)),
+    }
+
+    def exportar(self, figura, u_global, ruta, dpi=150, **opciones):
+        """
+        Dibuja una figura sin pantalla (lienzo Agg, sin pasar por pyplot) y la guarda en
+        disco; el formato (PNG, SVG, PDF...) se deduce de la extensión de 'ruta'.
+        Args:
+            figura (str): 'deformada', 'diagramas' o 'superpuestos' (ver FIGURAS).
+            u_global (np.ndarray): Vector de desplazamientos globales.
+            ruta (str | os.PathLike): Fichero de salida.
+            dpi (int): Resolución de las imágenes rasterizadas.
+            **opciones: Argumentos del método de dibujo (tipo, factor, escala, npts).
+        Returns:
+            str | os.PathLike: La ruta escrita.
+        Raises:
+            ValueError: Si la figura no existe.
+        """
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        if figura not in self.FIGURAS:
+            raise ValueError(f"Figura no válida: {figura}. Use una de {sorted(self.FIGURAS)}.")
+        metodo, tamaño = self.FIGURAS[figura]
+        fig = Figure(figsize=tamaño)
+        FigureCanvasAgg(fig)
+        getattr(self, metodo)(fig.add_subplot(), u_global, **opciones)
+        fig.savefig(ruta, dpi=dpi)
+        return ruta
+
+    def visualizar_estructura_deformada(self, u_global, factor=500, ruta=None):
+        """
+        Visualiza la estructura original y deformada (2D con rotación).
+        Args:
+            u_global (np.ndarray): Vector de desplazamientos globales.
+            factor (float): Factor de amplificación para los desplazamientos (para hacerlos visibles).
+            ruta (str, optional): Si se da, la figura se guarda en ese fichero sin mostrarse.
+        """
+        if ruta is not None:
+            return self.exportar('deformada', u_global, ruta, factor=factor)
+        fig, ax = plt.subplots(figsize=self.FIGURAS['deformada'][1])
+        self._dibujar_estructura_deformada(ax, u_global, factor)
         plt.show()
 
-    def graficar_diagramas(self, u_global, tipo='V', npts=50):
+    def graficar_diagramas(self, u_global, tipo='V', npts=50, ruta=None):
         """
-        Dibuja el diagrama de cortante (V) o momento flector (M) para todas las barras.
+        Dibuja el diagrama de cortante (V), momento flector (M) o axil (N) para todas las barras.
         Args:
             u_global (np.ndarray): Vector de desplazamientos globales.
-            tipo (str): 'V' para cortante, 'M' para momento flector.
+            tipo (str): 'V' para cortante, 'M' para momento flector, 'N' para axil.
             npts (int): Número de puntos para interpolar a lo largo de cada barra.
+            ruta (str, optional): Si se da, la figura se guarda en ese fichero sin mostrarse.
         """
-        fig, ax = plt.subplots(figsize=(10, 4))
-
-        nodos = self.gestor_modelo.get_nodos()
-        barras = self.gestor_modelo.get_barras()
-        id_to_index = self.gestor_modelo.get_dof_map()
-
-        for id_barra, barra in barras.items():
-            id1 = barra.nodo1.id
-            id2 = barra.nodo2.id
-
-            # Delegar el cálculo de esfuerzos internos a CalculadoraPorticoBarra
-            x, V, M = self.calculadora_barra.esfuerzos_internos(barra, u_global, id_to_index[id1], id_to_index[id2], npts=npts)
-
-            if tipo == 'V':
-                ax.plot(x, V, label=f'Barra {id1}-{id2}')
-            elif tipo == 'M':
-                ax.plot(x, M, label=f'Barra {id1}-{id2}')
-            else:
-                raise ValueError("Tipo de diagrama no válido. Use 'V' para cortante o 'M' para momento.")
-
-        # Configuración del gráfico
-        ax.axhline(0, color='black', lw=0.5)
-        ax.set_title('Diagrama de Cortante V(x)' if tipo == 'V' else 'Diagrama de Momento Flector M(x)')
-        ax.set_xlabel('x local de la barra [m]')
-        ax.set_ylabel('V [N]' if tipo == 'V' else 'M [Nm]')
-        ax.grid(True)
-        ax.legend()
+        if ruta is not None:
+            return self.exportar('diagramas', u_global, ruta, tipo=tipo, npts=npts)
+        fig, ax = plt.subplots(figsize=self.FIGURAS['diagramas'][1])
+        self._dibujar_diagramas(ax, u_global, tipo, npts)
         plt.show()
 
-    def visualizar_con_diagramas_superpuestos(self, u_global, tipo='M', escala=0.001, factor=100, npts=100):
+    def visualizar_con_diagramas_superpuestos(self, u_global, tipo='M', escala=0.001, factor=100, npts=100,
+                                              ruta=None):
         """
-        Dibuja el pórtico original, la forma deformada y el diagrama interno (M o V) superpuesto.
+        Dibuja el pórtico original, la forma deformada y el diagrama interno (M, V o N) superpuesto.
         Los diagramas se dibujan perpendicularmente a la forma deformada de la barra.
 
         Args:
             u_global (np.ndarray): Vector de desplazamientos globales.
-            tipo (str): 'M' para momento flector, 'V' para cortante.
+            tipo (str): 'M' para momento flector, 'V' para cortante, 'N' para axil.
             escala (float): Factor de escala para el diagrama de esfuerzos (ajustar para visibilidad).
             factor (float): Factor de amplificación para la forma deformada.
             npts (int): Número de puntos para interpolar a lo largo de cada barra.
+            ruta (str, optional): Si se da, la figura se guarda en ese fichero sin mostrarse.
         """
-        fig, ax = plt.subplots(figsize=(10, 6))
-
-        nodos = self.gestor_modelo.get_nodos()
-        barras = self.gestor_modelo.get_barras()
-        id_to_index = self.gestor_modelo.get_dof_map()
-
-        # Dibujar estructura original (línea punteada)
-        for id_barra, barra in barras.items():
-            x0, y0 = barra.nodo1.x, barra.nodo1.y
-            x1, y1 = barra.nodo2.x, barra.nodo2.y
-            ax.plot([x0, x1], [y0, y1], 'k--', lw=1.5,
-                    label='Original' if id_barra == sorted(list(barras.keys()))[0] else "", zorder=1)
-
-        # Dibujar nodos originales
-        for nodo in nodos.values():
-            ax.plot(nodo.x, nodo.y, 'ko', markersize=4)
-
-        # Dibujar estructura deformada (interpolada)
-        for id_barra, barra in barras.items():
-            id1 = barra.nodo1.id
-            id2 = barra.nodo2.id
-
-            i1 = id_to_index[id1]
-            i2 = id_to_index[id2]
-
-            u_elem = np.concatenate([
-                u_global[3*i1:3*i1+3],
-                u_global[3*i2:3*i2+3]
-            ])  # ux1, uy1, r1, ux2, uy2, r2
-
-            x0, y0 = barra.nodo1.x, barra.nodo1.y
-            x1, y1 = barra.nodo2.x, barra.nodo2.y
-            dx, dy = x1 - x0, y1 - y0
-            L_original = np.sqrt(dx**2 + dy**2)
-            if L_original == 0:
-                continue
-            cosθ, sinθ = dx / L_original, dy / L_original
-
-            # Transformar desplazamientos a coordenadas locales de la barra
-            u_local = self.calculadora_barra._matriz_transformacion_T6(barra) @ u_elem
-
-            xs_deformed, ys_deformed = [], []
-            for xi_local_original in np.linspace(0, L_original, npts):
-                # Funciones de forma cúbicas de Hermite para interpolación de uy local
-                N1 = 1 - 3*(xi_local_original/L_original)**2 + 2*(xi_local_original/L_original)**3
-                N2 = xi_local_original - 2*(xi_local_original**2)/L_original + (xi_local_original**3)/(L_original**2)
-                N3 = 3*(xi_local_original/L_original)**2 - 2*(xi_local_original/L_original)**3
-                N4 = - (xi_local_original**2)/L_original + (xi_local_original**3)/(L_original**2)
-
-                uy_interp_local = (N1 * u_local[1] +  # uy1
-                                   N2 * u_local[2] +  # rz1 * L
-                                   N3 * u_local[4] +  # uy2
-                                   N4 * u_local[5])   # rz2 * L
-
-                # Coordenadas globales del punto en la barra DEFORMADA
-                # Se utiliza el ángulo original de la barra para mapear la posición,
-                # y luego se aplica el desplazamiento local amplificado.
-                xg_deformed_point = x0 + xi_local_original * cosθ - factor * uy_interp_local * sinθ
-                yg_deformed_point = y0 + xi_local_original * sinθ + factor * uy_interp_local * cosθ
-
-                xs_deformed.append(xg_deformed_point)
-                ys_deformed.append(yg_deformed_point)
-
-            ax.plot(xs_deformed, ys_deformed, color='green', lw=2.5, zorder=2,
-                    label='Deformado' if id_barra == sorted(list(barras.keys()))[0] else "")
-
-        # Dibujar diagramas de momento/cortante sobre la estructura deformada
-        for id_barra, barra in barras.items():
-            id1 = barra.nodo1.id
-            id2 = barra.nodo2.id
-
-            # Delegar el cálculo de esfuerzos internos a CalculadoraPorticoBarra
-            # 'x' aquí son las coordenadas locales a lo largo de la barra original
-            x_local_bar, V, M = self.calculadora_barra.esfuerzos_internos(barra, u_global, id_to_index[id1], id_to_index[id2], npts=npts)
-
-            # Calcular el vector normal a la barra DEFORMADA
-            u1_deformed_x = barra.nodo1.x + factor * u_global[3*id_to_index[id1]]
-            u1_deformed_y = barra.nodo1.y + factor * u_global[3*id_to_index[id1]+1]
-            u2_deformed_x = barra.nodo2.x + factor * u_global[3*id_to_index[id2]]
-            u2_deformed_y = barra.nodo2.y + factor * u_global[3*id_to_index[id2]+1]
-
-            dx_def = u2_deformed_x - u1_deformed_x
-            dy_def = u2_deformed_y - u1_deformed_y
-            L_deformed_segment = np.sqrt(dx_def**2 + dy_def**2) # Longitud del segmento deformado
-            if L_deformed_segment == 0:
-                continue
-            # La tangente y normal de la barra deformada (asumiendo recta entre nodos deformados)
-            tangente_def = np.array([dx_def, dy_def]) / L_deformed_segment
-            normal_def = np.array([-dy_def, dx_def]) / L_deformed_segment # Normal apunta "hacia arriba" desde la barra
-
-            valores = M if tipo == 'M' else V
-            color = 'blue' if tipo == 'M' else 'red'
-
-            # Dibujar el diagrama
-            px_ant, py_ant = None, None
-            for i in range(npts):
-                xi_original_local = x_local_bar[i]
-                val = valores[i]
-
-                # Obtener el punto correspondiente en la curva deformada de la barra
-                # Reutilizar el cálculo de la posición deformed_point_x/y
-                # Esto es crucial para que el diagrama se pegue a la forma deformada
-                N1_pt = 1 - 3*(xi_original_local/L_original)**2 + 2*(xi_original_local/L_original)**3
-                N2_pt = xi_original_local - 2*(xi_original_local**2)/L_original + (xi_original_local**3)/(L_original**2)
-                N3_pt = 3*(xi_original_local/L_original)**2 - 2*(xi_original_local/L_original)**3
-                N4_pt = - (xi_original_local**2)/L_original + (xi_original_local**3)/(L_original**2)
-
-                uy_interp_local_pt = (N1_pt * u_local[1] +
-                                      N2_pt * u_local[2] +
-                                      N3_pt * u_local[4] +
-                                      N4_pt * u_local[5])
-
-                xg_deformed_point = x0 + xi_original_local * cosθ - factor * uy_interp_local_pt * sinθ
-                yg_deformed_point = y0 + xi_original_local * sinθ + factor * uy_interp_local_pt * cosθ
-
-                # Calcular el punto final del vector del diagrama
-                px = xg_deformed_point + escala * val * normal_def[0]
-                py = yg_deformed_point + escala * val * normal_def[1]
-
-                if i > 0:
-                    ax.plot([px_ant, px], [py_ant, py], color=color, lw=2, alpha=0.8, zorder=3)
-                px_ant, py_ant = px, py
-
-        # Configuración del gráfico
-        ax.set_aspect('equal')
-        ax.set_title(f"Pórtico deformado con diagrama de {'Momento flector' if tipo == 'M' else 'Cortante'}")
-        ax.set_xlabel('X [m]')
-        ax.set_ylabel('Y [m]')
-        ax.grid(True)
-        handles, labels = ax.get_legend_handles_labels()
-        by_label = dict(zip(labels, handles))
-        ax.legend(by_label.values(), by_label.keys(), loc='best')
+        if ruta is not None:
+            return self.exportar('superpuestos', u_global, ruta, tipo=tipo, escala=escala,
+                                 factor=factor, npts=npts)
+        fig, ax = plt.subplots(figsize=self.FIGURAS['superpuestos'][1])
+        self._dibujar_diagramas_superpuestos(ax, u_global, tipo, escala, factor, npts)
         plt.show()
@@ -0,0 +1,137 @@
+# benchmark_portico.py
+# Mide cómo escala Portico con el tamaño del modelo: tiempos de construcción, ensamblado,
+# aplicación de restricciones (extracción del sistema reducido), factorización, resolución
+# y postproceso, para pórticos regulares, celosías y pórticos aleatorios de 10² a 10⁵ DOFs.
+# El informe se escribe en JSON para poder compararlo entre versiones:
+#     python benchmark_portico.py --salida informe.json
+#     python benchmark_portico.py --dofs 100 1000 --modelos portico --repeticiones 5
+import argparse
+import datetime
+import json
+import platform
+import time
+
+import numpy as np
+
+from Portico import Portico
+from Factorizacion import FactorizacionRigidez
+import GeneradorModelos
+
+# Por encima de este número de DOFs se usa la matriz dispersa (la densa no cabría en memoria)
+MAX_DOFS_DENSA = 3000
+
+
+def generar(modelo, n_dof, semilla=0):
+    """
+    Crea un Portico del tipo pedido con aproximadamente n_dof grados de libertad.
+    Args:
+        modelo (str): 'portico', 'celosia' o 'aleatorio'.
+        n_dof (int): Número de DOFs aproximado (3 por nodo).
+        semilla (int): Semilla de los modelos aleatorios.
+    Returns:
+        Portico: El pórtico generado.
+    """
+    portico = Portico()
+    n_nodos = max(4, n_dof // 3)
+    if modelo == "portico":
+        lado = max(1, int(round(np.sqrt(n_nodos))) - 1)
+        GeneradorModelos.portico_regular(portico.gestor_modelo, lado, lado, q=-2e4)
+    elif modelo == "celosia":
+        GeneradorModelos.celosia(portico.gestor_modelo, max(2, n_nodos // 2 - 1), q=-1e4)
+    elif modelo == "aleatorio":
+        GeneradorModelos.portico_aleatorio(portico.gestor_modelo, n_nodos, semilla=semilla, q=-1e4)
+    else:
+        raise ValueError(f"Modelo no válido: {modelo}. Use 'portico', 'celosia' o 'aleatorio'.")
+    return portico
+
+
+def medir(modelo, n_dof, formato=None, npts=11):
+    """
+    Construye y resuelve un modelo midiendo cada fase por separado.
+    Returns:
+        dict: Tamaños del modelo y tiempos de cada fase en segundos.
+    """
+    tiempos = {}
+    t = time.perf_counter()
+    portico = generar(modelo, n_dof)
+    tiempos["construccion"] = time.perf_counter() - t
+
+    n = 3 * len(portico.gestor_modelo.nodos)
+    formato = formato or ("densa" if n <= MAX_DOFS_DENSA else "csr")
+
+    t = time.perf_counter()
+    K = portico.matriz_rigidez_global(formato)
+    f = portico.vector_fuerzas_equivalentes()
+    tiempos["ensamblado"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    sistema = portico.sistema_reducido(f, incluir_cargas_barras=False, formato=formato)
+    libres, u = sistema['libres'], sistema['u_prescrito']
+    tiempos["restricciones"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    factorizacion = FactorizacionRigidez(sistema['K_ff'])
+    tiempos["factorizacion"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    u[libres] = factorizacion.resolver(sistema['F_f'])
+    tiempos["resolucion"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    portico.esfuerzos_internos(u, npts=npts)
+    tiempos["postproceso"] = time.perf_counter() - t
+
+    nnz = K.nnz if formato == "csr" else int(np.count_nonzero(K))
+    return {"modelo": modelo, "n_dof_objetivo": n_dof, "n_dof": n, "n_libres": len(libres),
+            "n_barras": len(portico.gestor_modelo.barras), "nnz": nnz, "formato": formato,
+            "factorizacion": factorizacion.tipo, "tiempos": tiempos}
+
+
+def ejecutar(dofs=(100, 1000, 10000, 100000), modelos=("portico", "celosia", "aleatorio"), repeticiones=3):
+    """
+    Ejecuta el banco de pruebas. Cada medida se repite y se conserva, por fase, el menor
+    tiempo (el menos afectado por otras cargas de la máquina).
+    Returns:
+        dict: Informe con el entorno y una entrada por modelo y tamaño.
+    """
+    resultados = []
+    for modelo in modelos:
+        for n_dof in dofs:
+            medidas = [medir(modelo, n_dof) for _ in range(repeticiones)]
+            resultado = medidas[0]
+            resultado["tiempos"] = {fase: min(m["tiempos"][fase] for m in medidas) for fase in resultado["tiempos"]}
+            resultado["tiempos"]["total"] = sum(resultado["tiempos"].values())
+            resultados.append(resultado)
+
+    try:
+        import scipy
+        version_scipy = scipy.__version__
+    except ImportError:
+        version_scipy = None
+    return {
+        "fecha": datetime.datetime.now().isoformat(timespec="seconds"),
+        "entorno": {"python": platform.python_version(), "numpy": np.__version__, "scipy": version_scipy,
+                    "plataforma": platform.platform(), "procesador": platform.processor()},
+        "repeticiones": repeticiones,
+        "resultados": resultados,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Banco de pruebas de escalado de Portico.")
+    parser.add_argument("--dofs", type=int, nargs="+", default=[100, 1000, 10000, 100000],
+                        help="Tamaños objetivo en DOFs.")
+    parser.add_argument("--modelos", nargs="+", default=["portico", "celosia", "aleatorio"],
+                        choices=["portico", "celosia", "aleatorio"])
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--salida", default="benchmark_portico.json", help="Fichero JSON del informe.")
+    args = parser.parse_args()
+
+    informe = ejecutar(args.dofs, args.modelos, args.repeticiones)
+    with open(args.salida, "w", encoding="utf-8") as fichero:
+        json.dump(informe, fichero, indent=2)
+
+    for r in informe["resultados"]:
+        fases = "  ".join(f"{fase}={t:.4f}s" for fase, t in r["tiempos"].items())
+        print(f"{r['modelo']:>10} n_dof={r['n_dof']:>7}  {fases}")
+    print(f"Informe escrito en {args.salida}")
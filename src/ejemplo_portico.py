@@ -1,6 +1,10 @@
 # main_example.py (Actualizado para usar VisualizadorPortico)
 from Portico import Portico
 import numpy as np
+import logging
+
+# Mostrar los mensajes del modelo (nodos restringidos, barras editadas...)
+logging.basicConfig(level=logging.INFO, format="%(message)s")
 
 # -----------------------------------------------------------------------------
 # 1. Crear una instancia del Pórtico
@@ -71,6 +75,11 @@ for id_n, idx_in_dof in dof_map.items():
     print(f"  uy = {desplazamientos_globales[3*idx_in_dof+1]:.6e} m")
     print(f"  rz = {desplazamientos_globales[3*idx_in_dof+2]:.6e} rad")
 
+print("\n--- Reacciones en los apoyos ---")
+reacciones = mi_portico.reacciones(desplazamientos_globales)  # también las guarda en los nodos
+for id_n, rx, ry, mz in zip(reacciones['nodos'], reacciones['rx'], reacciones['ry'], reacciones['mz']):
+    print(f"Nodo {id_n}: rx = {rx:.3f} N, ry = {ry:.3f} N, mz = {mz:.3f} N·m")
+
 
 # -----------------------------------------------------------------------------
 # 5. Visualizar Resultados usando la clase VisualizadorPortico
@@ -0,0 +1,44 @@
+# conftest.py
+import os
+import sys
+
+import pytest
+
+# Los módulos viven planos en src/ y se importan por su nombre (from Portico import Portico)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from Portico import Portico  # noqa: E402
+
+
+def crear_portico_ejemplo():
+    """Pórtico de dos pilares empotrados, dintel cargado y voladizo con apoyo deslizante."""
+    portico = Portico()
+    g = portico.gestor_modelo
+    n0 = g.crear_nodo(0, 0, 0)
+    n1 = g.crear_nodo(4, 0, 0)
+    n2 = g.crear_nodo(4, 3, 0)
+    n3 = g.crear_nodo(0, 3, 0)
+    n4 = g.crear_nodo(8, 3, 0)
+    g.añadir_barra(n0, n3, E=210e9, A=0.005, I=1e-5)
+    g.añadir_barra(n1, n2, E=210e9, A=0.005, I=1e-5)
+    b2 = g.añadir_barra(n3, n2, E=210e9, A=0.008, I=2e-5)
+    b3 = g.añadir_barra(n2, n4, E=210e9, A=0.008, I=2e-5)
+    g.barras[b2].asignar_carga_uniforme(-20000)
+    g.barras[b3].asignar_carga_uniforme(-5000)
+    g.restringir_nodo(n0, True, True, True)
+    g.restringir_nodo(n1, True, True, True)
+    g.restringir_nodo(n4, False, True, False)
+    return portico
+
+
+def crear_portico_con_masa(rho=7850.0):
+    """Pórtico de crear_portico_ejemplo con densidad rho en todas las barras."""
+    portico = crear_portico_ejemplo()
+    for id_barra in list(portico.gestor_modelo.get_barras()):
+        portico.gestor_modelo.editar_barra(id_barra, rho=rho)
+    return portico
+
+
+@pytest.fixture
+def portico_ejemplo():
+    return crear_portico_ejemplo()
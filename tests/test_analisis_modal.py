@@ -0,0 +1,62 @@
+# test_analisis_modal.py
+import numpy as np
+import pytest
+from scipy.linalg import eigh
+
+import AnalisisModal
+from AnalisisModal import modos_propios
+from conftest import crear_portico_con_masa
+from GeneradorModelos import portico_regular
+from Portico import Portico
+
+RHO = 7850.0
+
+
+def _portico_regular():
+    portico = Portico()
+    portico_regular(portico.gestor_modelo, 3, 4)
+    for id_barra in list(portico.gestor_modelo.get_barras()):
+        portico.gestor_modelo.editar_barra(id_barra, rho=RHO)
+    return portico
+
+
+@pytest.mark.parametrize("concentrada", [False, True])
+def test_eigsh_shift_invert_igual_a_eigh_denso(monkeypatch, concentrada):
+    portico = _portico_regular()
+    libres, _ = portico.particionar_dofs()
+    K_ff = portico.matriz_rigidez_global("densa")[np.ix_(libres, libres)]
+    M_ff = portico.matriz_masa_global("densa", concentrada)[np.ix_(libres, libres)]
+    # Problema inverso M φ = (1/ω²) K φ, válido también con masa concentrada (singular)
+    mu = eigh(M_ff, K_ff, eigvals_only=True)
+    omega_denso = np.sort(1.0 / np.sqrt(mu[mu > mu.max() * 1e-12]))[:6]
+
+    monkeypatch.setattr(AnalisisModal, "MAX_DOFS_DENSO", 0)  # forzar eigsh
+    modos = modos_propios(portico, 6, concentrada)
+    np.testing.assert_allclose(modos['omega'], omega_denso, rtol=1e-8)
+
+    # Modos normalizados respecto a la masa y ortogonales respecto a K
+    phi = modos['modos'][libres]
+    np.testing.assert_allclose(phi.T @ M_ff @ phi, np.eye(6), atol=1e-8)
+    np.testing.assert_allclose(phi.T @ K_ff @ phi, np.diag(modos['omega']**2), rtol=1e-8, atol=1e-6)
+
+
+@pytest.mark.parametrize("concentrada", [False, True])
+def test_masa_total_igual_a_rho_a_l(concentrada):
+    portico = crear_portico_con_masa(RHO)
+    d = portico.datos_barras()
+    masa = np.sum(RHO * d['A'] * d['L'])
+
+    M = portico.matriz_masa_global("densa", concentrada)
+    for k in (0, 1):  # arrastre en X y en Y
+        r = np.zeros(M.shape[0])
+        r[k::3] = 1.0
+        np.testing.assert_allclose(r @ M @ r, masa, rtol=1e-12)
+    m_barras = portico.calculadora_barra.masa_global_lote(d['rho'], d['A'], d['L'], d['c'], d['s'], concentrada)
+    np.testing.assert_allclose(m_barras[:, [0, 3]][:, :, [0, 3]].sum(axis=(1, 2)), RHO * d['A'] * d['L'], rtol=1e-12)
+
+
+def test_masa_efectiva_de_todos_los_modos_suma_uno():
+    portico = crear_portico_con_masa(RHO)
+    n_libres = len(portico.particionar_dofs()[0])
+    modos = modos_propios(portico, n_libres)
+    np.testing.assert_allclose(modos['masa_efectiva'].sum(axis=0), 1.0, rtol=1e-9)
@@ -0,0 +1,58 @@
+# test_analisis_pdelta.py
+import numpy as np
+import pytest
+
+from AnalisisPDelta import analisis_p_delta
+from Portico import Portico
+
+E, I, ALTURA = 210e9, 1e-5, 3.0
+CARGA_CRITICA = np.pi**2 * E * I / (2 * ALTURA)**2  # ménsula: longitud de pandeo 2L
+
+
+def _mensula(P, H=1000.0, n_barras=4):
+    """Pilar en ménsula de n_barras con carga vertical P (compresión) y horizontal H en cabeza."""
+    portico = Portico()
+    g = portico.gestor_modelo
+    nodos = [g.crear_nodo(0, ALTURA * k / n_barras, 0) for k in range(n_barras + 1)]
+    for n1, n2 in zip(nodos, nodos[1:]):
+        g.añadir_barra(n1, n2, E=E, A=0.01, I=I)
+    g.restringir_nodo(nodos[0], True, True, True)
+    F = np.zeros(3 * len(nodos))
+    F[-3], F[-2] = H, -P
+    return portico, F
+
+
+@pytest.mark.parametrize("newton_modificado", [True, False])
+def test_p_delta_igual_a_resolver_con_la_rigidez_geometrica_final(newton_modificado):
+    portico, F = _mensula(0.6 * CARGA_CRITICA)
+    r = analisis_p_delta(portico, F, newton_modificado=newton_modificado, tolerancia=1e-12)
+    assert r['convergido']
+
+    # Resolución directa de (K + Kg(N)) u = f con el axil final
+    d = portico.datos_barras()
+    kg = portico.calculadora_barra.rigidez_geometrica_lote(r['N'], d['L'], d['c'], d['s'])
+    K_T = portico.matriz_rigidez_global("densa").copy()
+    np.add.at(K_T, (d['dofs'][:, :, None], d['dofs'][:, None, :]), kg)
+    libres, _ = portico.particionar_dofs()
+    u = np.zeros(len(F))
+    u[libres] = np.linalg.solve(K_T[np.ix_(libres, libres)], F[libres])
+    np.testing.assert_allclose(r['u'], u, rtol=1e-9, atol=1e-12 * np.abs(u).max())
+
+    # Amplificación del desplazamiento lateral próxima a 1 / (1 - P/Pcr)
+    u_lineal = portico.analizar(F)
+    assert 2.0 < r['u'][-3] / u_lineal[-3] < 2.6
+
+
+def test_newton_modificado_igual_a_newton_completo():
+    portico, F = _mensula(0.8 * CARGA_CRITICA)
+    modificado = analisis_p_delta(portico, F, tolerancia=1e-12)
+    completo = analisis_p_delta(portico, F, newton_modificado=False, tolerancia=1e-12)
+    np.testing.assert_allclose(modificado['u'], completo['u'], rtol=1e-9)
+
+
+@pytest.mark.parametrize("fraccion", [1.1, 2.0])
+@pytest.mark.parametrize("newton_modificado", [True, False])
+def test_p_delta_por_encima_de_la_carga_critica(fraccion, newton_modificado):
+    portico, F = _mensula(fraccion * CARGA_CRITICA)
+    with pytest.raises(np.linalg.LinAlgError):
+        analisis_p_delta(portico, F, newton_modificado=newton_modificado)
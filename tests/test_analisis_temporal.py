@@ -0,0 +1,84 @@
+# test_analisis_temporal.py
+import numpy as np
+import pytest
+
+from AnalisisTemporal import historia_temporal
+from conftest import crear_portico_con_masa
+from Portico import Portico
+
+
+def _oscilador(E=210e9, A=0.01, L=2.0, rho=7850.0):
+    """Barra horizontal con un solo DOF libre (u_x del nudo 1): k = EA/L, m = rho·A·L/2 concentrada."""
+    portico = Portico()
+    g = portico.gestor_modelo
+    n0 = g.crear_nodo(0, 0, 0)
+    n1 = g.crear_nodo(L, 0, 0)
+    g.añadir_barra(n0, n1, E=E, A=A, I=1e-6, rho=rho)
+    g.restringir_nodo(n0, True, True, True)
+    g.restringir_nodo(n1, False, True, True)
+    return portico, E * A / L, rho * A * L / 2
+
+
+def test_oscilador_igual_a_solucion_cerrada_con_aceleracion_constante():
+    portico, k, m = _oscilador()
+    omega, xi, ag0 = np.sqrt(k / m), 0.05, 2.0
+    dt = 2 * np.pi / omega / 1000
+    ag = np.full(3000, ag0)  # tres periodos
+    r = historia_temporal(portico, ag, dt, amortiguamiento=xi, omegas_rayleigh=(omega, omega), concentrada=True)
+
+    # u'' + 2ξω u' + ω² u = -ag0 desde el reposo
+    t = r['t']
+    omega_d = omega * np.sqrt(1 - xi**2)
+    envolvente = np.exp(-xi * omega * t)
+    u = -ag0 / omega**2 * (1 - envolvente * (np.cos(omega_d * t) + xi / np.sqrt(1 - xi**2) * np.sin(omega_d * t)))
+    np.testing.assert_allclose(r['u'][:, 3], u, atol=1e-3 * ag0 / omega**2)
+    np.testing.assert_allclose(r['rayleigh'], (xi * omega, xi / omega))
+
+
+def _newmark_aceleracion_media(K, M, C, f, ag, dt):
+    """Newmark (β = 1/4, γ = 1/2) de libro sobre matrices densas, con f la fuerza por unidad de ag."""
+    u, v = np.zeros(len(f)), np.zeros(len(f))
+    a = np.linalg.solve(M, f * ag[0])
+    K_ef = K + 2 / dt * C + 4 / dt**2 * M
+    historia = [u]
+    for ag_n in ag[1:]:
+        p = f * ag_n + M @ (4 / dt**2 * u + 4 / dt * v + a) + C @ (2 / dt * u + v)
+        u_n = np.linalg.solve(K_ef, p)
+        v_n = 2 / dt * (u_n - u) - v
+        a = 4 / dt**2 * (u_n - u) - 4 / dt * v - a
+        u, v = u_n, v_n
+        historia.append(u)
+    return np.array(historia)
+
+
+def test_hht_con_alfa_nulo_igual_a_newmark_aceleracion_media():
+    portico = crear_portico_con_masa()
+    dt = 0.002
+    ag = 3.0 * np.sin(2 * np.pi * 4.0 * dt * np.arange(400))
+    r = historia_temporal(portico, ag, dt, alfa=0.0, omegas_rayleigh=(10.0, 100.0))
+
+    libres, _ = portico.particionar_dofs()
+    K = portico.matriz_rigidez_global("densa")[np.ix_(libres, libres)]
+    M = portico.matriz_masa_global("csr").toarray()[np.ix_(libres, libres)]
+    a0, a1 = r['rayleigh']
+    arrastre = np.zeros(3 * len(portico.gestor_modelo.get_dof_map()))
+    arrastre[0::3] = 1.0
+    U = _newmark_aceleracion_media(K, M, a0 * M + a1 * K, -M @ arrastre[libres], ag, dt)
+    np.testing.assert_allclose(r['u'][:, libres], U, rtol=1e-8, atol=1e-10 * np.abs(U).max())
+
+
+@pytest.mark.parametrize("concentrada", [False, True])
+def test_directa_igual_a_superposicion_modal_con_todos_los_modos(concentrada):
+    portico = crear_portico_con_masa()
+    dt = 0.002
+    ag = 3.0 * np.sin(2 * np.pi * 4.0 * dt * np.arange(400)) * (np.arange(400) > 0)
+    opciones = dict(amortiguamiento=0.05, alfa=-0.05, concentrada=concentrada, nodos=[2, 4], barras=[0, 2])
+    directa = historia_temporal(portico, ag, dt, **opciones)
+    n_libres = len(portico.particionar_dofs()[0])
+    modal = historia_temporal(portico, ag, dt, modal=True, n_modos=n_libres, **opciones)
+
+    escala = np.abs(directa['u']).max()
+    assert escala > 0
+    np.testing.assert_allclose(modal['u'], directa['u'], atol=1e-8 * escala)
+    for tipo in ("N", "V", "M"):
+        np.testing.assert_allclose(modal[tipo], directa[tipo], atol=1e-6 * np.abs(directa[tipo]).max())
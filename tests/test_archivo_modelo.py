@@ -0,0 +1,65 @@
+# test_archivo_modelo.py
+import numpy as np
+
+from ArchivoModelo import cargar_resultados, guardar_resultados, leer_archivo
+from conftest import crear_portico_con_masa
+from Portico import Portico
+
+
+def _portico_con_huecos():
+    """Pórtico de ejemplo con masa, un asiento y huecos en los IDs de nodos y barras."""
+    portico = crear_portico_con_masa()
+    g = portico.gestor_modelo
+    n5 = g.crear_nodo(9, 3, 0)
+    b4 = g.añadir_barra(4, n5, E=210e9, A=0.008, I=2e-5)
+    g.borrar_barra(b4)
+    g.borrar_nodo(n5)
+    g.prescribir_desplazamiento(1, uy=-0.005)
+    return portico
+
+
+def test_guardar_y_cargar_modelo_da_el_mismo_analisis(tmp_path):
+    original = _portico_con_huecos()
+    ruta = tmp_path / "modelo.bin"
+    original.guardar_modelo(ruta)
+
+    # Los arrays del archivo se pueden abrir como memmap sin leerlos enteros
+    tipo, _, arrays = leer_archivo(ruta, mmap=True)
+    assert tipo == "modelo"
+    assert isinstance(arrays["nodos_coords"], np.memmap)
+    np.testing.assert_array_equal(arrays["barras_id"], sorted(original.gestor_modelo.get_barras()))
+
+    cargado = Portico()
+    cargado.cargar_modelo(ruta)
+    np.testing.assert_array_equal(cargado.analizar(), original.analizar())
+    np.testing.assert_array_equal(cargado.matriz_masa_global("densa"), original.matriz_masa_global("densa"))
+
+
+def test_cargar_modelo_conserva_los_siguientes_ids(tmp_path):
+    original = _portico_con_huecos()
+    ruta = tmp_path / "modelo.bin"
+    original.guardar_modelo(ruta)
+    cargado = Portico()
+    cargado.cargar_modelo(ruta)
+
+    g = cargado.gestor_modelo
+    assert g.almacen.siguientes_ids() == original.gestor_modelo.almacen.siguientes_ids()
+    nuevo_nodo = g.crear_nodo(9, 3, 0)
+    nueva_barra = g.añadir_barra(4, nuevo_nodo, E=210e9, A=0.008, I=2e-5)
+    # Los IDs borrados antes de guardar (nodo 5, barra 4) no se reutilizan
+    assert (nuevo_nodo, nueva_barra) == (6, 5)
+    assert nuevo_nodo not in original.gestor_modelo.get_nodos()
+
+
+def test_resultados_guardados_se_abren_como_memmap(tmp_path):
+    portico = _portico_con_huecos()
+    n_dof = 3 * len(portico.gestor_modelo.get_dof_map())
+    U = portico.resolver_casos(np.random.default_rng(0).normal(size=(n_dof, 3)))
+    ruta = tmp_path / "resultados.bin"
+    guardar_resultados(ruta, {'U': U, 'ids_nodos': np.array(sorted(portico.gestor_modelo.get_nodos()))},
+                       meta={'casos': ['A', 'B', 'C']})
+
+    resultados, meta = cargar_resultados(ruta)
+    assert isinstance(resultados['U'], np.memmap)
+    np.testing.assert_array_equal(resultados['U'], U)
+    assert meta == {'casos': ['A', 'B', 'C']}
@@ -0,0 +1,52 @@
+# test_calculadora_lote.py
+import numpy as np
+
+from conftest import crear_portico_ejemplo
+
+
+def _datos_barras(portico):
+    d = portico.datos_barras()
+    return d, [portico.gestor_modelo.barras[i] for i in d['ids']]
+
+
+def test_rigidez_global_lote_igual_a_por_barra(portico_ejemplo):
+    d, barras = _datos_barras(portico_ejemplo)
+    calculadora = portico_ejemplo.calculadora_barra
+    k_lote = calculadora.rigidez_global_lote(d['E'], d['A'], d['I'], d['L'], d['c'], d['s'])
+    for k, barra in zip(k_lote, barras):
+        np.testing.assert_allclose(k, calculadora.rigidez_local_global(barra), rtol=1e-12, atol=1e-6)
+
+
+def test_fuerzas_equivalentes_globales_lote_igual_a_por_barra(portico_ejemplo):
+    d, barras = _datos_barras(portico_ejemplo)
+    calculadora = portico_ejemplo.calculadora_barra
+    feq_lote = calculadora.fuerzas_equivalentes_globales_lote(d['q'], d['L'], d['c'], d['s'])
+    for feq, barra in zip(feq_lote, barras):
+        np.testing.assert_allclose(feq, calculadora.fuerzas_equivalentes_globales(barra), rtol=1e-12, atol=1e-9)
+
+
+def test_esfuerzos_internos_lote_igual_a_por_barra(portico_ejemplo):
+    u = portico_ejemplo.analizar()
+    d, barras = _datos_barras(portico_ejemplo)
+    calculadora = portico_ejemplo.calculadora_barra
+    dof_map = portico_ejemplo.gestor_modelo.get_dof_map()
+    x, N, V, M = calculadora.esfuerzos_internos_lote(
+        u, d['dofs'], d['E'], d['A'], d['I'], d['L'], d['c'], d['s'], d['q'], npts=7)
+    for k, barra in enumerate(barras):
+        x_b, V_b, M_b = calculadora.esfuerzos_internos(barra, u, dof_map[barra.nodo1.id], dof_map[barra.nodo2.id], npts=7)
+        np.testing.assert_allclose(x[k], x_b, rtol=1e-12)
+        np.testing.assert_allclose(V[k], V_b, rtol=1e-9, atol=1e-6)
+        np.testing.assert_allclose(M[k], M_b, rtol=1e-9, atol=1e-6)
+
+
+def test_esfuerzos_internos_lote_varios_casos():
+    portico = crear_portico_ejemplo()
+    u = portico.analizar()
+    d, _ = _datos_barras(portico)
+    calculadora = portico.calculadora_barra
+    args = (d['dofs'], d['E'], d['A'], d['I'], d['L'], d['c'], d['s'])
+    _, N, V, M = calculadora.esfuerzos_internos_lote(np.column_stack([u, 2 * u]), *args, np.stack([d['q'], 2 * d['q']]))
+    _, N1, V1, M1 = calculadora.esfuerzos_internos_lote(u, *args, d['q'])
+    for lote, uno in ((N, N1), (V, V1), (M, M1)):
+        np.testing.assert_allclose(lote[0], uno)
+        np.testing.assert_allclose(lote[1], 2 * uno)
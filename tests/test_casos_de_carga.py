@@ -0,0 +1,73 @@
+# test_casos_de_carga.py
+import numpy as np
+import pytest
+
+from CasosDeCarga import CasosDeCarga
+from conftest import crear_portico_ejemplo
+
+NPTS = 5
+
+
+def _casos(portico, formato="densa"):
+    casos = CasosDeCarga(portico, npts=NPTS, formato=formato)
+    casos.añadir_caso('G', cargas_del_modelo=True)
+    casos.añadir_caso('Q', fuerzas_nodales={2: (0.0, -10000.0, 0.0), 4: (0.0, -4000.0, 1500.0)})
+    casos.añadir_caso('W', fuerzas_nodales={3: (8000.0, 0.0, 0.0)}, cargas_barras={0: 3000.0})
+    return casos
+
+
+@pytest.mark.parametrize("formato", ["densa", "csr"])
+def test_combinacion_igual_a_analizar_las_cargas_combinadas(formato):
+    casos = _casos(crear_portico_ejemplo(), formato)
+    casos.añadir_combinacion('ELU', {'G': 1.35, 'Q': 1.5, 'W': 0.9})
+    combinado = casos.combinar(['ELU'])
+
+    # Mismo modelo con las cargas ya combinadas
+    portico = crear_portico_ejemplo()
+    barras = portico.gestor_modelo.barras
+    barras[2].asignar_carga_uniforme(1.35 * -20000.0)
+    barras[3].asignar_carga_uniforme(1.35 * -5000.0)
+    barras[0].asignar_carga_uniforme(0.9 * 3000.0)
+    F = np.zeros(15)
+    F[7], F[13], F[14] = 1.5 * -10000.0, 1.5 * -4000.0, 1.5 * 1500.0
+    F[9] = 0.9 * 8000.0
+    u = portico.analizar(F, formato=formato)
+    np.testing.assert_allclose(combinado['U'][:, 0], u, rtol=1e-9, atol=1e-15)
+
+    reacciones = portico.reacciones(u, F, guardar=False)
+    for clave in ("rx", "ry", "mz"):
+        np.testing.assert_allclose(combinado['reacciones'][clave][:, 0], reacciones[clave], rtol=1e-9, atol=1e-6)
+
+    d = portico.datos_barras()
+    _, N, V, M = portico.calculadora_barra.esfuerzos_internos_lote(
+        u, d['dofs'], d['E'], d['A'], d['I'], d['L'], d['c'], d['s'], d['q'], npts=NPTS)
+    for tipo, valores in (("N", N), ("V", V), ("M", M)):
+        np.testing.assert_allclose(combinado[tipo][0], valores, rtol=1e-9, atol=1e-6)
+
+
+def test_envolventes_igual_a_recorrer_las_combinaciones():
+    casos = _casos(crear_portico_ejemplo())
+    coeficientes = np.random.default_rng(0).uniform(-1.5, 1.5, size=(40, 3))
+    nombres = [f"C{k}" for k in range(len(coeficientes))]
+    casos.añadir_combinaciones(nombres, coeficientes)
+    envolventes = casos.envolventes(bloque=7)  # varios bloques, el último incompleto
+
+    for tipo in ("N", "V", "M"):
+        valores = np.stack([casos.combinar([nombre])[tipo][0] for nombre in nombres])
+        np.testing.assert_allclose(envolventes[tipo]['max'], valores.max(axis=0), rtol=1e-12, atol=1e-9)
+        np.testing.assert_allclose(envolventes[tipo]['min'], valores.min(axis=0), rtol=1e-12, atol=1e-9)
+        elegidos = np.take_along_axis(valores, envolventes[tipo]['comb_max'][None], axis=0)[0]
+        np.testing.assert_allclose(elegidos, valores.max(axis=0), rtol=1e-12, atol=1e-9)
+        elegidos = np.take_along_axis(valores, envolventes[tipo]['comb_min'][None], axis=0)[0]
+        np.testing.assert_allclose(elegidos, valores.min(axis=0), rtol=1e-12, atol=1e-9)
+
+
+def test_resultados_se_recalculan_al_cambiar_el_modelo():
+    portico = crear_portico_ejemplo()
+    casos = _casos(portico)
+    casos.añadir_combinacion('G', {'G': 1.0})
+    u_antes = casos.combinar()['U'][:, 0]
+    portico.gestor_modelo.editar_barra(2, I=4e-5)
+    u_despues = casos.combinar()['U'][:, 0]
+    assert not np.allclose(u_antes, u_despues)
+    np.testing.assert_allclose(u_despues, portico.analizar(), rtol=1e-9, atol=1e-15)
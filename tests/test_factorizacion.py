@@ -0,0 +1,84 @@
+# test_factorizacion.py
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from conftest import crear_portico_ejemplo
+from Factorizacion import FactorizacionRigidez
+
+
+def _matriz_spd(n, semilla=0):
+    rng = np.random.default_rng(semilla)
+    B = rng.normal(size=(n, n))
+    return B @ B.T + n * np.eye(n)
+
+
+def _bloques_modificados():
+    indices = np.array([[0, 3, 5], [5, 7, -1]])
+    delta = np.zeros((2, 3, 3))
+    delta[0] = 0.5 * _matriz_spd(3, 1)
+    delta[1] = 0.2 * _matriz_spd(3, 2)
+    return indices, delta
+
+
+@pytest.mark.parametrize("dispersa", [False, True])
+def test_actualizacion_woodbury_igual_a_refactorizar(dispersa):
+    K = _matriz_spd(12)
+    indices, delta = _bloques_modificados()
+    K_nueva = K.copy()
+    for ind, d in zip(indices, delta):
+        libre = ind >= 0
+        K_nueva[np.ix_(ind[libre], ind[libre])] += d[np.ix_(libre, libre)]
+    formato = sp.csr_matrix if dispersa else np.asarray
+
+    factorizacion = FactorizacionRigidez(formato(K))
+    assert factorizacion.tipo == ("lu_dispersa" if dispersa else "cholesky")
+    assert factorizacion.actualizar(indices, delta)
+    assert factorizacion.rango_actualizaciones() == 5  # la posición -1 se ignora
+
+    B = np.random.default_rng(3).normal(size=(12, 4))
+    np.testing.assert_allclose(factorizacion.resolver(B), FactorizacionRigidez(formato(K_nueva)).resolver(B),
+                               rtol=1e-10)
+
+
+def test_actualizacion_por_encima_del_limite_no_modifica_la_factorizacion():
+    K = _matriz_spd(12)
+    factorizacion = FactorizacionRigidez(K)
+    factorizacion.LIMITE_RANGO = 4
+    indices, delta = _bloques_modificados()
+    assert not factorizacion.actualizar(indices, delta)
+    assert factorizacion.rango_actualizaciones() == 0
+    B = np.random.default_rng(4).normal(size=12)
+    np.testing.assert_allclose(factorizacion.resolver(B), np.linalg.solve(K, B), rtol=1e-10)
+
+
+@pytest.mark.parametrize("formato", ["densa", "csr"])
+def test_edicion_por_encima_del_limite_refactoriza(formato):
+    portico = crear_portico_ejemplo()
+    factorizacion = portico.factorizar(formato)
+    factorizacion.LIMITE_RANGO = 4  # una barra con nodos libres ya aporta más de 4 DOFs
+    portico.gestor_modelo.editar_barra(2, I=4e-5)
+
+    U = portico.resolver_casos(formato=formato)
+    nueva = portico.factorizar(formato)
+    assert nueva is not factorizacion
+    assert nueva.rango_actualizaciones() == 0
+
+    referencia = crear_portico_ejemplo()
+    referencia.gestor_modelo.editar_barra(2, I=4e-5)
+    np.testing.assert_allclose(U, referencia.resolver_casos(formato=formato), rtol=1e-9, atol=1e-15)
+
+
+def test_editar_barra_y_resolver_casos_conserva_la_factorizacion():
+    for formato in ("densa", "csr"):
+        portico = crear_portico_ejemplo()
+        factorizacion = portico.factorizar(formato)
+        portico.gestor_modelo.editar_barra(2, I=4e-5)
+
+        U = portico.resolver_casos(formato=formato)
+        assert portico.factorizar(formato) is factorizacion
+        assert factorizacion.rango_actualizaciones() > 0
+
+        referencia = crear_portico_ejemplo()
+        referencia.gestor_modelo.editar_barra(2, I=4e-5)
+        np.testing.assert_allclose(U, referencia.resolver_casos(formato=formato), rtol=1e-9, atol=1e-15)
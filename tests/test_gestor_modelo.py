@@ -0,0 +1,142 @@
+# test_gestor_modelo.py
+import numpy as np
+import pytest
+
+from conftest import crear_portico_ejemplo
+from Portico import Portico
+
+
+def _estado(gestor):
+    almacen = gestor.almacen
+    return (sorted(gestor.get_nodos()), sorted(gestor.get_barras()), almacen.siguientes_ids(),
+            almacen.dofs_restringidos().tolist())
+
+
+@pytest.mark.parametrize("conectividad, error", [
+    ([[0, 2], [3, 99]], KeyError),        # nodo inexistente
+    ([[0, 2], [4, 4]], ValueError),       # barra de un nodo consigo mismo
+    ([[0, 2], [1, 2], [2, 0]], ValueError),  # repetida dentro del lote, en sentido contrario
+    ([[0, 2], [2, 3]], ValueError),       # ya existe (barra 3 → 2) en sentido contrario
+])
+def test_añadir_barras_valida_todo_el_lote_sin_insertar_nada(portico_ejemplo, conectividad, error):
+    gestor = portico_ejemplo.gestor_modelo
+    antes = _estado(gestor)
+    with pytest.raises(error):
+        gestor.añadir_barras(conectividad)
+    assert _estado(gestor) == antes
+
+
+def test_añadir_barras_rechaza_longitud_nula(portico_ejemplo):
+    gestor = portico_ejemplo.gestor_modelo
+    (repetido,) = gestor.crear_nodos([[8.0, 3.0]])  # mismas coordenadas que el nodo 4
+    antes = _estado(gestor)
+    with pytest.raises(ValueError, match="longitud nula"):
+        gestor.añadir_barras([[0, 2], [4, repetido]])
+    assert _estado(gestor) == antes
+
+
+@pytest.mark.parametrize("coords", [np.zeros((3, 4)), np.zeros(3), [[0.0, np.nan]]])
+def test_crear_nodos_rechaza_coordenadas_no_validas(portico_ejemplo, coords):
+    antes = _estado(portico_ejemplo.gestor_modelo)
+    with pytest.raises(ValueError):
+        portico_ejemplo.gestor_modelo.crear_nodos(coords)
+    assert _estado(portico_ejemplo.gestor_modelo) == antes
+
+
+def test_añadir_barras_por_lotes_igual_que_una_a_una():
+    lote, una_a_una = crear_portico_ejemplo(), crear_portico_ejemplo()
+    ids = lote.gestor_modelo.crear_nodos([[2.0, 6.0], [6.0, 6.0]])
+    lote.gestor_modelo.añadir_barras([[3, ids[0]], [ids[0], ids[1]], [ids[1], 4]], A=0.005, I=1e-5,
+                                     q=[0.0, -1000.0, 0.0])
+    g = una_a_una.gestor_modelo
+    n5, n6 = g.crear_nodo(2, 6, 0), g.crear_nodo(6, 6, 0)
+    g.añadir_barra(3, n5, A=0.005, I=1e-5)
+    b = g.añadir_barra(n5, n6, A=0.005, I=1e-5)
+    g.añadir_barra(n6, 4, A=0.005, I=1e-5)
+    g.barras[b].asignar_carga_uniforme(-1000.0)
+    np.testing.assert_allclose(lote.analizar(), una_a_una.analizar(), rtol=1e-12, atol=1e-18)
+
+
+def test_transaccion_fallida_deja_el_modelo_como_estaba(portico_ejemplo):
+    gestor = portico_ejemplo.gestor_modelo
+    u_antes = portico_ejemplo.analizar()
+    antes = _estado(gestor)
+    revision = gestor.get_revision()
+
+    with pytest.raises(KeyError):
+        with gestor.transaccion():
+            ids = gestor.crear_nodos([[2.0, 6.0], [6.0, 6.0]])
+            gestor.añadir_barras([[3, ids[0]], [ids[0], ids[1]]])
+            gestor.restringir_nodos(ids[1:])
+            gestor.borrar_barra(3)
+            portico_ejemplo.analizar()  # resultados cacheados con el modelo a medias
+            gestor.añadir_barras([[ids[1], 99]])
+
+    assert _estado(gestor) == antes
+    assert gestor.get_revision() > revision
+    assert [b.nodo1.id for b in gestor.barras.values()] == [0, 1, 3, 2]
+    np.testing.assert_array_equal(portico_ejemplo.analizar(), u_antes)
+
+
+def test_transaccion_anidada_fallida_conserva_los_cambios_de_la_externa(portico_ejemplo):
+    gestor = portico_ejemplo.gestor_modelo
+    with gestor.transaccion():
+        (n5,) = gestor.crear_nodos([[2.0, 6.0]])
+        with pytest.raises(ValueError):
+            with gestor.transaccion():
+                gestor.añadir_barras([[3, n5]])
+                gestor.añadir_barras([[n5, n5]])
+        gestor.añadir_barras([[3, n5], [n5, 2]])
+    assert n5 in gestor.get_nodos()
+    # La barra de la transacción interna se deshizo junto con el contador de IDs
+    assert sorted(gestor.barras_de_nodo(n5)) == [4, 5]
+
+
+def _portico_con_nodo_previo():
+    """Pórtico de ejemplo precedido por un nodo auxiliar (ID 0) con una barra y un apoyo."""
+    portico = Portico()
+    g = portico.gestor_modelo
+    auxiliar = g.crear_nodo(-2, 0, 0)
+    n = [g.crear_nodo(x, y, 0) for x, y in ((0, 0), (4, 0), (4, 3), (0, 3), (8, 3))]
+    g.añadir_barra(auxiliar, n[3], E=210e9, A=0.005, I=1e-5)
+    g.añadir_barra(n[0], n[3], E=210e9, A=0.005, I=1e-5)
+    g.añadir_barra(n[1], n[2], E=210e9, A=0.005, I=1e-5)
+    b2 = g.añadir_barra(n[3], n[2], E=210e9, A=0.008, I=2e-5)
+    b3 = g.añadir_barra(n[2], n[4], E=210e9, A=0.008, I=2e-5)
+    g.barras[b2].asignar_carga_uniforme(-20000)
+    g.barras[b3].asignar_carga_uniforme(-5000)
+    g.restringir_nodo(auxiliar, True, True, False)
+    g.restringir_nodo(n[0], True, True, True)
+    g.restringir_nodo(n[1], True, True, True)
+    g.restringir_nodo(n[4], False, True, False)
+    g.prescribir_desplazamiento(n[1], uy=-0.005)
+    return portico, n
+
+
+@pytest.mark.parametrize("compactar", [False, True])
+def test_indices_y_restricciones_tras_borrar_un_nodo_anterior(compactar):
+    portico, n = _portico_con_nodo_previo()
+    g = portico.gestor_modelo
+    portico.analizar()  # índices y ensamblado cacheados antes del borrado
+    g.borrar_nodo(0)
+    if compactar:
+        g.almacen.compactar()
+
+    # Índice de DOF: posición del nodo entre los que quedan, en orden de ID
+    for k, id_nodo in enumerate(n):
+        assert g.indice_dof(id_nodo) == k
+        assert g.get_dof_map()[id_nodo] == k
+    with pytest.raises(KeyError):
+        g.indice_dof(0)
+
+    # Las restricciones siguen en sus nodos, no en los DOFs que ocupaban antes
+    restringido = g.almacen.dofs_restringidos().reshape(-1, 3)
+    assert restringido.tolist() == [[True] * 3, [True] * 3, [False] * 3, [False] * 3, [False, True, False]]
+    assert g.desplazamientos_prescritos == {3 * 1 + 1: -0.005}
+    assert sorted(g.barras_de_nodo(n[3])) == [1, 3]
+    assert sorted(g.barras_de_nodo(n[2])) == [2, 3, 4]
+
+    # Mismo análisis que el pórtico construido sin el nodo auxiliar
+    referencia = crear_portico_ejemplo()
+    referencia.gestor_modelo.prescribir_desplazamiento(1, uy=-0.005)
+    np.testing.assert_allclose(portico.analizar(), referencia.analizar(), rtol=1e-12, atol=1e-18)
@@ -0,0 +1,110 @@
+# test_lineas_de_influencia.py
+import numpy as np
+import pytest
+
+from conftest import crear_portico_ejemplo
+from LineasDeInfluencia import cargas_moviles, linea_de_influencia
+from Portico import Portico
+
+# Esfuerzos en barras distintas de la cargada (pilar 1 y barra 3), que el modelo partido
+# calcula con las mismas barras y los mismos desplazamientos de sus nudos
+RESPUESTAS = [('desplazamiento', 2, 'uy'), ('reaccion', 0, 'mz'), ('reaccion', 4, 'ry'),
+              ('N', 1, 0.5), ('V', 1, 0.5), ('M', 1, 0.5), ('M', 3, 0.25)]
+
+
+def _portico_con_carga_en_dintel(a):
+    """
+    Pórtico de conftest sin cargas de barra y con un nudo intermedio a la distancia a del
+    nudo 3 en el dintel (barras 2 y 3 en lugar de la barra 2), donde se aplica la carga.
+    """
+    portico = Portico()
+    g = portico.gestor_modelo
+    n = [g.crear_nodo(x, y, 0) for x, y in ((0, 0), (4, 0), (4, 3), (0, 3), (8, 3), (a, 3))]
+    g.añadir_barra(n[0], n[3], E=210e9, A=0.005, I=1e-5)
+    g.añadir_barra(n[1], n[2], E=210e9, A=0.005, I=1e-5)
+    g.añadir_barra(n[3], n[5], E=210e9, A=0.008, I=2e-5)
+    g.añadir_barra(n[5], n[2], E=210e9, A=0.008, I=2e-5)
+    g.añadir_barra(n[2], n[4], E=210e9, A=0.008, I=2e-5)
+    g.restringir_nodo(n[0], True, True, True)
+    g.restringir_nodo(n[1], True, True, True)
+    g.restringir_nodo(n[4], False, True, False)
+    return portico
+
+
+def _respuestas_fuerza_bruta(a):
+    """Respuestas de RESPUESTAS para una carga unidad hacia abajo a la distancia a."""
+    portico = _portico_con_carga_en_dintel(a)
+    dof_map = portico.gestor_modelo.get_dof_map()
+    F = np.zeros(3 * len(dof_map))
+    F[3 * dof_map[5] + 1] = -1.0
+    u = portico.analizar(F)
+    reacciones = portico.reacciones(u, F, guardar=False)
+    nodos = list(reacciones['nodos'])
+
+    # En el modelo partido, la barra 3 original (2 → 4) es la barra 4
+    N1, V1, M1 = _esfuerzos(portico, u, 1, 0.5)
+    M3 = _esfuerzos(portico, u, 4, 0.25)[2]
+    return np.array([u[3 * dof_map[2] + 1], reacciones['mz'][nodos.index(0)], reacciones['ry'][nodos.index(4)],
+                     N1, V1, M1, M3])
+
+
+def _esfuerzos(portico, u, id_barra, xi, q=0.0):
+    """N, V y M de una barra en x/L = xi con CalculadoraPorticoBarra.esfuerzos_internos_lote."""
+    d = portico.datos_barras([id_barra])
+    _, N, V, M = portico.calculadora_barra.esfuerzos_internos_lote(
+        u, d['dofs'], d['E'], d['A'], d['I'], d['L'], d['c'], d['s'], np.full(1, q), estaciones=[xi])
+    return N[0, 0], V[0, 0], M[0, 0]
+
+
+@pytest.mark.parametrize("formato", ["densa", "csr"])
+def test_linea_de_influencia_igual_a_carga_en_posiciones_interiores(portico_ejemplo, formato):
+    linea = linea_de_influencia(portico_ejemplo, [2, 3], RESPUESTAS, npts=11, formato=formato)
+    en_dintel = np.flatnonzero(linea['barras'] == 2)
+    for k in en_dintel[[1, 3, 6, 9]]:  # xi = 0.1, 0.3, 0.6, 0.9
+        a = 4.0 * linea['xi'][k]
+        np.testing.assert_allclose(linea['valores'][:, k], _respuestas_fuerza_bruta(a), rtol=1e-8, atol=1e-12)
+
+
+@pytest.mark.parametrize("tipo", ["N", "V", "M"])
+def test_esfuerzo_en_la_barra_cargada_integra_la_carga_uniforme(tipo):
+    # Dentro de la barra cargada, el esfuerzo sigue el convenio de esfuerzos_internos_lote:
+    # la integral de la línea por una carga uniforme da el esfuerzo de esa carga. Con 406
+    # posiciones, x/L = 0.3 cae en mitad de un intervalo y el salto de V no falsea el trapecio.
+    portico = crear_portico_ejemplo()
+    linea = linea_de_influencia(portico, [2], [(tipo, 2, 0.3)], npts=406, direccion=(0.0, 1.0))
+    valores, s = linea['valores'][0], linea['s']
+    integral = -20000.0 * np.sum((valores[1:] + valores[:-1]) / 2 * np.diff(s))  # regla del trapecio
+
+    portico.gestor_modelo.barras[3].asignar_carga_uniforme(0.0)
+    u = portico.analizar()
+    esperado = _esfuerzos(portico, u, 2, 0.3, q=-20000.0)["NVM".index(tipo)]
+    np.testing.assert_allclose(integral, esperado, rtol=1e-4, atol=1e-6 * 20000.0)
+
+
+def test_linea_de_influencia_en_nudos_igual_a_carga_nodal(portico_ejemplo):
+    linea = linea_de_influencia(portico_ejemplo, [2, 3], [('desplazamiento', 4, 'rz')], npts=5)
+    F = np.zeros(15)
+    F[3 * 2 + 1] = -1.0
+    u = crear_portico_ejemplo().resolver_casos(F, incluir_cargas_barras=False)[:, 0]
+    k = np.flatnonzero(np.isclose(linea['s'], 4.0))[0]
+    np.testing.assert_allclose(linea['valores'][0, k], u[14], rtol=1e-9)
+
+
+def test_envolvente_del_tren_igual_a_superposicion(portico_ejemplo):
+    linea = linea_de_influencia(portico_ejemplo, [2, 3], RESPUESTAS, npts=11)
+    cargas, separaciones = np.array([1.0, 0.5]), np.array([0.0, 1.2])
+    tren = cargas_moviles(linea, cargas, separaciones, paso=0.4)
+
+    # Superposición explícita: las posiciones del tren caen en las de la línea (paso 0.4)
+    valores = linea['valores']
+    n_pos = valores.shape[1]
+    esperado = np.zeros((len(RESPUESTAS), len(tren['s'])))
+    for i in range(len(tren['s'])):
+        for carga, separacion in zip(cargas, separaciones):
+            k = i - int(round(separacion / 0.4))
+            if 0 <= k < n_pos:
+                esperado[:, i] += carga * valores[:, k]
+    np.testing.assert_allclose(tren['valores'], esperado, rtol=1e-9, atol=1e-15)
+    np.testing.assert_allclose(tren['max'], esperado.max(axis=1))
+    np.testing.assert_allclose(tren['min'], esperado.min(axis=1))
+    np.testing.assert_allclose(tren['s_max'], tren['s'][esperado.argmax(axis=1)])
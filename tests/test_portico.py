@@ -0,0 +1,163 @@
+# test_portico.py
+import logging
+import sys
+
+import numpy as np
+import pytest
+
+from conftest import crear_portico_ejemplo
+from Factorizacion import FactorizacionRigidez
+from Portico import Portico
+
+
+@pytest.mark.parametrize("formato", ["densa", "csr"])
+def test_reducido_igual_a_anulacion(portico_ejemplo, formato):
+    n_dof = 3 * len(portico_ejemplo.gestor_modelo.get_dof_map())
+    F = np.zeros(n_dof)
+    F[9] = 15000.0  # fuerza horizontal en el nudo 3
+    u_reducido = portico_ejemplo.analizar(F, metodo="reducido", formato=formato)
+    u_anulacion = crear_portico_ejemplo().analizar(F, metodo="anulacion")
+    np.testing.assert_allclose(u_reducido, u_anulacion, rtol=1e-9, atol=1e-15)
+
+
+@pytest.mark.parametrize("formato", ["densa", "csr"])
+def test_reducido_con_desplazamientos_prescritos(formato):
+    portico = crear_portico_ejemplo()
+    portico.gestor_modelo.prescribir_desplazamiento(1, uy=-0.01)  # asiento del pilar derecho
+    u = portico.analizar(formato=formato)
+
+    # Solución directa: K_ff u_f = f_f - K_fr u_r
+    K = np.asarray(portico.matriz_rigidez_global("densa"))
+    f = portico.vector_fuerzas_equivalentes()
+    libres, restringidos = portico.particionar_dofs()
+    u_r = np.zeros(len(restringidos))
+    u_r[restringidos == 4] = -0.01
+    u_f = np.linalg.solve(K[np.ix_(libres, libres)], f[libres] - K[np.ix_(libres, restringidos)] @ u_r)
+
+    np.testing.assert_allclose(u[restringidos], u_r, atol=1e-15)
+    np.testing.assert_allclose(u[libres], u_f, rtol=1e-9, atol=1e-15)
+
+
+@pytest.mark.parametrize("formato", ["densa", "csr"])
+def test_sistema_reducido_igual_a_analizar(formato):
+    portico = crear_portico_ejemplo()
+    portico.gestor_modelo.prescribir_desplazamiento(1, uy=-0.01)
+    sistema = portico.sistema_reducido(formato=formato)
+    u = sistema['u_prescrito'].copy()
+    u[sistema['libres']] = FactorizacionRigidez(sistema['K_ff']).resolver(sistema['F_f'])
+    np.testing.assert_allclose(u, portico.analizar(formato=formato), rtol=1e-9, atol=1e-15)
+    assert (sistema['pos_libre'][sistema['restringidos']] == -1).all()
+    np.testing.assert_array_equal(sistema['pos_libre'][sistema['libres']], np.arange(len(sistema['libres'])))
+
+
+def test_ensamblar_barras_con_el_patron_de_k(portico_ejemplo):
+    K = portico_ejemplo.matriz_rigidez_global("csr")
+    d = portico_ejemplo.datos_barras()
+    k_barras = portico_ejemplo.calculadora_barra.rigidez_global_lote(d['E'], d['A'], d['I'], d['L'], d['c'], d['s'])
+    K_barras = portico_ejemplo.ensamblar_barras(k_barras, "csr")
+    np.testing.assert_array_equal(K_barras.indices, K.indices)
+    np.testing.assert_allclose(K_barras.toarray(), K.toarray(), rtol=1e-12)
+    np.testing.assert_allclose(portico_ejemplo.ensamblar_barras(k_barras, "densa"), K.toarray(), rtol=1e-12)
+
+
+def test_datos_barras_por_id(portico_ejemplo):
+    d = portico_ejemplo.datos_barras([3, 1])
+    np.testing.assert_array_equal(d['ids'], [3, 1])
+    todas = portico_ejemplo.datos_barras()
+    np.testing.assert_array_equal(d['dofs'], todas['dofs'][portico_ejemplo.filas_barras([3, 1])])
+    with pytest.raises(KeyError):
+        portico_ejemplo.datos_barras([99])
+
+
+@pytest.mark.parametrize("metodo", ["reducido", "anulacion"])
+def test_matriz_singular_se_registra_como_error(metodo, caplog):
+    portico = Portico()  # barra sin apoyos
+    g = portico.gestor_modelo
+    g.añadir_barra(g.crear_nodo(0, 0, 0), g.crear_nodo(4, 0, 0), E=210e9, A=0.005, I=1e-5)
+    with caplog.at_level(logging.ERROR, logger="porticos.calculo"):
+        u = portico.analizar(metodo=metodo)
+    assert not u.any()
+    assert "singular" in caplog.text
+
+
+def test_anulacion_rechaza_desplazamientos_prescritos():
+    portico = crear_portico_ejemplo()
+    portico.gestor_modelo.prescribir_desplazamiento(1, uy=-0.01)
+    with pytest.raises(ValueError):
+        portico.analizar(metodo="anulacion")
+
+
+@pytest.mark.parametrize("formato", ["densa", "csr"])
+def test_resolver_casos_igual_a_analizar_por_caso(portico_ejemplo, formato):
+    n_dof = 3 * len(portico_ejemplo.gestor_modelo.get_dof_map())
+    F = np.random.default_rng(0).normal(scale=1e4, size=(n_dof, 4))
+    U = portico_ejemplo.resolver_casos(F, formato=formato)
+    assert U.shape == (n_dof, 4)
+    for j in range(F.shape[1]):
+        np.testing.assert_allclose(U[:, j], crear_portico_ejemplo().analizar(F[:, j], formato=formato),
+                                   rtol=1e-9, atol=1e-15)
+
+
+def test_factorizacion_reutilizada_entre_resoluciones(portico_ejemplo, monkeypatch):
+    creadas = []
+
+    class FactorizacionContada(FactorizacionRigidez):
+        def __init__(self, *args, **kwargs):
+            creadas.append(self)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(sys.modules["Portico"], "FactorizacionRigidez", FactorizacionContada)
+    n_dof = 3 * len(portico_ejemplo.gestor_modelo.get_dof_map())
+    for _ in range(3):
+        portico_ejemplo.resolver_casos(np.ones((n_dof, 2)))
+        portico_ejemplo.analizar()
+    assert len(creadas) == 1
+    assert portico_ejemplo.factorizar("densa") is creadas[0]
+
+
+@pytest.mark.parametrize("cambio", [
+    lambda g: g.restringir_nodo(4, True, True, False),
+    lambda g: g.añadir_barra(3, 1, E=210e9, A=0.005, I=1e-5),
+    lambda g: g.borrar_barra(2),
+])
+def test_cambios_del_modelo_invalidan_la_factorizacion(portico_ejemplo, cambio):
+    factorizacion = portico_ejemplo.factorizar("densa")
+    cambio(portico_ejemplo.gestor_modelo)
+    assert portico_ejemplo.factorizar("densa") is not factorizacion
+
+
+def _resultante(portico, ids_nodos, fx, fy, mz):
+    """Resultante (X, Y, momento respecto al origen) de fuerzas aplicadas en nudos."""
+    nodos = portico.gestor_modelo.get_nodos()
+    x = np.array([nodos[i].x for i in ids_nodos])[:, None]
+    y = np.array([nodos[i].y for i in ids_nodos])[:, None]
+    return np.stack([fx.sum(axis=0), fy.sum(axis=0), (x * fy - y * fx + mz).sum(axis=0)])
+
+
+@pytest.mark.parametrize("asiento", [0.0, -0.01])
+def test_reacciones_en_equilibrio_con_las_cargas(asiento):
+    portico = crear_portico_ejemplo()
+    if asiento:
+        portico.gestor_modelo.prescribir_desplazamiento(1, uy=asiento, rz=0.002)
+    dof_map = portico.gestor_modelo.get_dof_map()
+    ids = sorted(dof_map, key=dof_map.get)  # en el orden de los DOFs
+    n_dof = 3 * len(ids)
+    F = np.zeros((n_dof, 2))
+    F[9, 0] = 15000.0  # fuerza horizontal en el nudo 3
+    F[6:9, 1] = (-3000.0, -8000.0, 2500.0)  # fuerzas y momento en el nudo 2
+    U = portico.resolver_casos(F)
+
+    reacciones = portico.reacciones(U, F, guardar=False)
+    R = _resultante(portico, reacciones['nodos'], reacciones['rx'], reacciones['ry'], reacciones['mz'])
+    cargas = (F + portico.vector_fuerzas_equivalentes()[:, None]).reshape(-1, 3, 2)
+    P = _resultante(portico, ids, cargas[:, 0], cargas[:, 1], cargas[:, 2])
+    np.testing.assert_allclose(R + P, 0.0, atol=1e-6 * np.abs(P).max())
+    assert np.abs(R).max() > 1e4
+
+
+def test_reacciones_de_un_caso_se_guardan_en_los_nodos(portico_ejemplo):
+    u = portico_ejemplo.analizar()
+    reacciones = portico_ejemplo.reacciones(u)
+    nodos = portico_ejemplo.gestor_modelo.get_nodos()
+    for k, id_nodo in enumerate(reacciones['nodos']):
+        assert nodos[id_nodo].ry == pytest.approx(reacciones['ry'][k])